@@ -10,10 +10,17 @@ st.set_page_config(
 from trends import (
     fetch_trend_data, calculate_growth_metrics, get_mock_data, fetch_related_queries,
     fetch_youtube_trend_data, get_mock_youtube_data, analyze_cross_signals, DATA_LIMITATIONS,
-    fetch_multi_signal_data, apply_moving_average, normalize_data, calculate_correlation,
-    generate_strategic_insights
+    apply_moving_average, normalize_data, calculate_correlation, calculate_lead_lag,
+    generate_strategic_insights, slice_timeframe
 )
 from keyword_list import KEYWORDS
+from trend_store import TrendStore
+from data_sources import create_data_source
+from features import build_features
+from trend_panel import TrendPanel
+from scheduler import RefreshScheduler
+import memo
+import telemetry
 import plotly.graph_objects as go
 from datetime import datetime
 
@@ -843,32 +850,118 @@ def load_mock_data_fast(timeframe='today 3-m'):
     metrics = calculate_growth_metrics(web_df)
     return web_df, metrics, youtube_df, True, True
 
-@st.cache_data(ttl=21600, show_spinner=False)  # 6시간 캐시
-def load_all_data(timeframe='today 3-m'):
-    """웹 + YouTube 데이터를 병렬로 로드. (df, metrics, youtube_df, web_is_mock, youtube_is_mock) 반환"""
-    # 병렬 로딩
-    result = fetch_multi_signal_data(KEYWORDS, timeframe)
+@st.cache_resource(show_spinner=False)
+def get_trend_store():
+    """세션·재시작 간 공유되는 로컬 시계열 저장소"""
+    return TrendStore()
 
-    web_df = result['web']
-    youtube_df = result['youtube']
+@st.cache_resource(show_spinner=False)
+def get_data_source():
+    """데이터 소스 (환경 변수 EDUTREND_DATA_SOURCE: pytrends · store · file:<경로>)"""
+    return create_data_source(store=get_trend_store())
 
-    web_is_mock = False
-    youtube_is_mock = False
+# 스냅샷 파일 소스는 파일에 들어 있는 키워드를 그대로 사용 (재실행마다 호출되므로 헤더만 읽고 파일이 바뀔 때까지 재사용)
+KEYWORDS = get_data_source().keywords() or KEYWORDS
 
-    if web_df.empty or len(web_df.columns) < len(KEYWORDS) * 0.5:
-        web_df = get_mock_data(KEYWORDS, timeframe)
-        web_is_mock = True
+# EDUTREND_METRICS_PORT가 설정되어 있으면 /metrics 엔드포인트 시작 (프로세스당 한 번)
+telemetry.start_http_server()
 
-    if youtube_df.empty or len(youtube_df.columns) < len(KEYWORDS) * 0.5:
-        youtube_df = get_mock_youtube_data(KEYWORDS)
-        youtube_is_mock = True
+def _fill_missing_keywords(df, provenance, mock_fn):
+    """
+    수집에 실패한 키워드만 Mock 데이터로 채웁니다. 실제로 수집된 키워드는 그대로 유지.
+    채운 키워드는 provenance에 'mock'으로 기록하고, (df, is_mock)을 반환합니다.
+    """
+    missing = [kw for kw in KEYWORDS if kw not in df.columns]
+    if len(missing) == len(KEYWORDS):
+        for kw in KEYWORDS:
+            provenance[kw] = 'mock'
+        return mock_fn(KEYWORDS), True
+
+    if missing:
+        df = df.join(mock_fn(missing, index=df.index))[KEYWORDS]
+        for kw in missing:
+            provenance[kw] = 'mock'
+    return df, False
+
+def build_dataset(timeframe, source):
+    """
+    데이터 소스에서 웹 + YouTube 데이터를 읽어 (web_df, youtube_df, web_is_mock, youtube_is_mock, provenance) 생성.
+    가장 긴 기간(BASE_TIMEFRAME)을 일별로 한 번만 수집하고, 짧은 기간은 load_all_data에서 잘라서 사용.
+    일부 청크가 실패하면 해당 키워드만 Mock으로 채우고, 출처는 provenance({'web': {...}, 'youtube': {...}})에 기록.
+    """
+    # 실시간 소스는 병렬 로딩 (저장소에 없는 날짜만 Google Trends에 요청)
+    result = source.load(KEYWORDS, timeframe)
+    provenance = result['provenance']
 
-    metrics = calculate_growth_metrics(web_df)
-    return web_df, metrics, youtube_df, web_is_mock, youtube_is_mock
+    web_df, web_is_mock = _fill_missing_keywords(
+        result['web'], provenance['web'], lambda kws, index=None: get_mock_data(kws, timeframe, index=index)
+    )
+    youtube_df, youtube_is_mock = _fill_missing_keywords(
+        result['youtube'], provenance['youtube'], get_mock_youtube_data
+    )
+
+    return web_df, youtube_df, web_is_mock, youtube_is_mock, provenance
+
+def is_dataset_complete(snapshot):
+    """모든 키워드를 이번 갱신 또는 최신 저장값으로 채웠는지 (실패·Mock 키워드가 없는지)"""
+    provenance = snapshot[4]
+    return all(
+        status in ('fresh', 'cached', 'snapshot')
+        for signal in provenance.values()
+        for status in signal.values()
+    )
 
+@st.cache_resource(show_spinner=False)
+def get_refresh_scheduler():
+    """기본 기간 데이터셋을 만료 전에 백그라운드에서 갱신하는 스케줄러 (프로세스 전역)"""
+    source = get_data_source()
+    scheduler = RefreshScheduler(lambda tf: build_dataset(tf, source), [BASE_TIMEFRAME],
+                                 is_complete=is_dataset_complete)
+    scheduler.start()
+    return scheduler
+
+def dataset_version():
+    """기본 데이터셋이 교체될 때마다 증가하는 버전 (파생 캐시의 키)"""
+    return get_refresh_scheduler().version(BASE_TIMEFRAME)
+
+@telemetry.count_cache('load_all_data')
+def load_all_data(timeframe='today 3-m'):
+    """기본 데이터셋에서 기간을 잘라 반환. (df, metrics, youtube_df, web_is_mock, youtube_is_mock)"""
+    get_refresh_scheduler().get(BASE_TIMEFRAME)  # 최초 1회는 수집 완료까지 대기
+    web_panel, metrics, youtube_panel, web_is_mock, youtube_is_mock, _ = _load_period(timeframe, dataset_version())
+    return web_panel.to_frame(), metrics, youtube_panel.to_frame(), web_is_mock, youtube_is_mock
+
+@telemetry.count_cache('load_features')
+def load_features(timeframe='today 3-m'):
+    """load_all_data와 같은 기간의 키워드 특성 테이블 (메트릭스 · 교차 신호 · 인사이트가 함께 사용)"""
+    get_refresh_scheduler().get(BASE_TIMEFRAME)
+    return _load_period(timeframe, dataset_version())[5]
+
+# 적중/미스는 호출한 쪽(load_all_data · load_features)의 캐시 지표로 집계
+@st.cache_data(ttl=21600, show_spinner=False)  # 6시간 캐시
+def _load_period(timeframe, version):
+    telemetry.record_cache_miss()
+    web_df, youtube_df, web_is_mock, youtube_is_mock, provenance = get_refresh_scheduler().get(BASE_TIMEFRAME)
+
+    # 실제 데이터만 기간에 맞춰 다시 정규화 (Mock으로 채운 키워드는 자르기만 함)
+    web_mock = [kw for kw, status in provenance['web'].items() if status == 'mock']
+    youtube_mock = [kw for kw, status in provenance['youtube'].items() if status == 'mock']
+    web_df = slice_timeframe(web_df, timeframe, KEYWORDS, renormalize=not web_is_mock, exclude=web_mock)
+    youtube_df = slice_timeframe(youtube_df, timeframe, KEYWORDS, renormalize=not youtube_is_mock,
+                                 exclude=youtube_mock)
+
+    # (데이터셋 버전, 기간)마다 특성을 한 번 계산해 모든 지표가 같은 값을 읽음
+    features = build_features(web_df, youtube_df)
+    metrics = calculate_growth_metrics(web_df, features=features)
+    # 캐시 적중마다 pickle에서 복원되므로 관심도 패널은 작은 타입(0-100 정수는 uint8)으로 보관
+    return (TrendPanel.from_frame(web_df), metrics, TrendPanel.from_frame(youtube_df),
+            web_is_mock, youtube_is_mock, features)
+
+@telemetry.count_cache('load_data')
 @st.cache_data(ttl=21600, show_spinner=False)  # 6시간 캐시
 def load_data(timeframe='today 3-m'):
     """웹 검색 트렌드 데이터 로드. (df, metrics, is_mock) 반환"""
+    telemetry.record_cache_miss()
     df = fetch_trend_data(KEYWORDS, timeframe)
     is_mock = False
     if df.empty:
@@ -877,13 +970,17 @@ def load_data(timeframe='today 3-m'):
     metrics = calculate_growth_metrics(df)
     return df, metrics, is_mock
 
+@telemetry.count_cache('load_related')
 @st.cache_data(ttl=21600, show_spinner=False)  # 6시간 캐시
 def load_related(keyword):
+    telemetry.record_cache_miss()
     return fetch_related_queries(keyword)
 
+@telemetry.count_cache('load_youtube_data')
 @st.cache_data(ttl=21600, show_spinner=False)  # 6시간 캐시
 def load_youtube_data(timeframe='today 3-m'):
     """YouTube 검색 트렌드 데이터 로드. (df, is_mock) 반환"""
+    telemetry.record_cache_miss()
     df = fetch_youtube_trend_data(KEYWORDS, timeframe)
     is_mock = False
     if df.empty:
@@ -891,11 +988,49 @@ def load_youtube_data(timeframe='today 3-m'):
         is_mock = True
     return df, is_mock
 
-@st.cache_data(ttl=21600, show_spinner=False)  # 6시간 캐시
 def load_cross_signals(timeframe='today 3-m'):
-    """웹 + YouTube 교차 신호 분석 데이터 로드"""
+    """웹 + YouTube 교차 신호 분석 데이터 로드 (스냅샷 버전 단위 캐시)"""
+    return _load_cross_signals(timeframe, dataset_version())
+
+def load_correlations(timeframe='today 3-m'):
+    """웹 ↔ YouTube 상관 계수 {키워드: 값 또는 None} (스냅샷 버전 단위 캐시, 모든 페이지가 같은 결과 사용)"""
+    return _load_correlations(timeframe, dataset_version())
+
+@telemetry.count_cache('load_correlations')
+@st.cache_data(ttl=21600, show_spinner=False)  # 6시간 캐시
+def _load_correlations(timeframe, version):
+    telemetry.record_cache_miss()
+    df, metrics, youtube_df, _, _ = load_all_data(timeframe)
+    return calculate_correlation(df, youtube_df, KEYWORDS)
+
+def load_lead_lags(timeframe='today 3-m'):
+    """웹 → YouTube 선행 시차 {키워드: {'lag', 'correlation'} 또는 None} (스냅샷 버전 단위 캐시)"""
+    return _load_lead_lags(timeframe, dataset_version())
+
+@telemetry.count_cache('load_lead_lags')
+@st.cache_data(ttl=21600, show_spinner=False)  # 6시간 캐시
+def _load_lead_lags(timeframe, version):
+    telemetry.record_cache_miss()
+    df, metrics, youtube_df, _, _ = load_all_data(timeframe)
+    return calculate_lead_lag(df, youtube_df, KEYWORDS)
+
+@memo.memoize('strategic_insights', maxsize=8)
+def compute_strategic_insights(df, youtube_df, metrics, correlations=None, lead_lags=None, features=None):
+    """전략적 인사이트 (입력 데이터 내용이 같으면 재실행 시 이전 결과 재사용)"""
+    return generate_strategic_insights(df, youtube_df, metrics, list(metrics['키워드']),
+                                       correlations=correlations, lead_lags=lead_lags, features=features)
+
+@memo.memoize('correlations', maxsize=8)
+def compute_correlations(df, youtube_df):
+    """웹 ↔ YouTube 상관 계수 (캐시 로더를 거치지 않는 데모 데이터용, 입력 내용 단위 재사용)"""
+    return calculate_correlation(df, youtube_df, KEYWORDS)
+
+@telemetry.count_cache('load_cross_signals')
+@st.cache_data(ttl=21600, show_spinner=False)  # 6시간 캐시
+def _load_cross_signals(timeframe, version):
+    telemetry.record_cache_miss()
     df, metrics, youtube_df, _, _ = load_all_data(timeframe)
-    cross_signals = analyze_cross_signals(metrics, youtube_df, KEYWORDS)
+    cross_signals = analyze_cross_signals(metrics, youtube_df, KEYWORDS, features=load_features(timeframe))
     return cross_signals
 
 timeframe_map = {
@@ -904,6 +1039,9 @@ timeframe_map = {
     "12개월": "today 12-m"
 }
 
+# 실제로 수집하는 기간 (가장 긴 기간). 나머지 기간은 이 데이터에서 잘라서 사용
+BASE_TIMEFRAME = "today 12-m"
+
 # --------------------------------------------------------------------------
 # 4. COMPONENTS
 # --------------------------------------------------------------------------
@@ -1009,6 +1147,9 @@ def render_header():
         st.markdown('<div class="header-btn">', unsafe_allow_html=True)
         if st.button("새로고침", key="header_refresh"):
             st.cache_data.clear()
+            memo.clear_all()
+            # 현재 스냅샷은 유지한 채 백그라운드에서 다시 수집
+            get_refresh_scheduler().request_refresh()
             st.rerun()
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -1029,6 +1170,20 @@ def format_growth_rate(growth):
     sign = "+" if growth > 0 else ""
     return f"{sign}{growth:.1f}%"
 
+def format_lead_lag(lag):
+    """선행 시차 표시 (양수: 웹이 선행, 음수: YouTube가 선행)"""
+    if lag > 0:
+        return f"Web이 {lag}일 선행"
+    if lag < 0:
+        return f"YouTube가 {-lag}일 선행"
+    return "동시 움직임"
+
+def get_web_leading_keywords(lead_lags, min_correlation=0.4):
+    """웹이 선행하는 키워드 [(키워드, {'lag', 'correlation'})] (시차 상관 내림차순)"""
+    leads = [(kw, info) for kw, info in lead_lags.items()
+             if info is not None and info['lag'] > 0 and info['correlation'] > min_correlation]
+    return sorted(leads, key=lambda x: x[1]['correlation'], reverse=True)
+
 def is_low_base_effect(growth):
     """Low Base Effect 여부 확인"""
     return growth >= 999
@@ -1207,11 +1362,12 @@ def create_trend_chart(df, keyword, color='#6366f1', title=None, show_ma=True, n
     return fig
 
 
-def generate_report_html(metrics, strategic_insights, cross_signals, period):
+@memo.memoize('report_html', maxsize=8)
+def generate_report_html(metrics, strategic_insights, cross_signals, period, report_date):
     """
     HTML 형식의 전략 리포트를 생성합니다.
+    report_date(생성일 문자열)도 메모이제이션 키에 포함되므로, 다른 시각에 만든 리포트의 생성일이 재사용되지 않습니다.
     """
-    report_date = datetime.now().strftime("%Y-%m-%d %H:%M")
     summary = strategic_insights['summary']
     priority_kws = strategic_insights['priority_keywords']
     market_stages = strategic_insights['market_stages']
@@ -1229,6 +1385,7 @@ def generate_report_html(metrics, strategic_insights, cross_signals, period):
 
     # 상관관계 분류
     high_corr = [(k, v) for k, v in correlations.items() if v is not None and v > 0.6]
+    web_leads = get_web_leading_keywords(strategic_insights.get('lead_lags', {}))
 
     html_content = f"""
     <!DOCTYPE html>
@@ -1368,6 +1525,15 @@ def generate_report_html(metrics, strategic_insights, cross_signals, period):
             </div>
         </div>
 
+        <div class="section">
+            <div class="section-title">⏱️ Web 선행 키워드 (YouTube 학습 수요보다 먼저 움직임)</div>
+            <div class="list-box">
+                <ul>
+                    {''.join([f'<li><strong>{kw}</strong>: {format_lead_lag(info["lag"])} (시차 상관 {info["correlation"]:.3f})</li>' for kw, info in web_leads[:10]]) if web_leads else '<li>선행 관계가 뚜렷한 키워드 없음</li>'}
+                </ul>
+            </div>
+        </div>
+
         <div class="section">
             <div class="section-title">📋 전체 키워드 분석 결과</div>
             <table style="width: 100%; border-collapse: collapse; font-size: 0.85rem;">
@@ -1430,12 +1596,16 @@ def create_multi_keyword_chart(df, keywords, title=None, show_ma=True, normalize
 
     colors = ['#6366f1', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6']
 
+    # 이동평균은 모든 키워드를 한 번에 계산
+    show_ma = show_ma and st.session_state.show_moving_average
+    if show_ma:
+        ma_df = apply_moving_average(chart_df, window=st.session_state.ma_window)
+
     for idx, keyword in enumerate(available):
         color = colors[idx % len(colors)]
 
-        if show_ma and st.session_state.show_moving_average:
+        if show_ma:
             # 이동평균만 표시
-            ma_df = apply_moving_average(chart_df[[keyword]], window=st.session_state.ma_window)
             fig.add_trace(go.Scatter(
                 x=ma_df.index,
                 y=ma_df[keyword],
@@ -1472,6 +1642,42 @@ def create_multi_keyword_chart(df, keywords, title=None, show_ma=True, normalize
     return fig
 
 
+def render_refresh_indicator():
+    """백그라운드 갱신 중일 때 현재 데이터가 직전 스냅샷임을 안내"""
+    scheduler = get_refresh_scheduler()
+    if not scheduler.is_refreshing(BASE_TIMEFRAME):
+        return
+
+    refreshed_at = scheduler.refreshed_at(BASE_TIMEFRAME)
+    since = f" · {refreshed_at.strftime('%m-%d %H:%M')} 기준 데이터 표시 중" if refreshed_at else ""
+    st.caption(f"🔄 최신 데이터로 갱신 중{since}")
+
+
+def render_provenance_notice():
+    """일부 키워드만 이전 데이터·Mock 데이터로 채워진 경우 키워드 수를 안내"""
+    scheduler = get_refresh_scheduler()
+    if scheduler.refreshed_at(BASE_TIMEFRAME) is None:
+        return  # 수집 실패로 load_mock_data_fast를 사용한 경우
+    provenance = scheduler.get(BASE_TIMEFRAME)[4]
+
+    notes = []
+    for label, signal in (("웹 검색", provenance['web']), ("YouTube", provenance['youtube'])):
+        stale = sum(1 for status in signal.values() if status == 'stale')
+        partial = sum(1 for status in signal.values() if status == 'partial')
+        mock = sum(1 for status in signal.values() if status == 'mock')
+        if mock == len(signal):
+            continue  # 전체 Mock은 데모 모드 배너에서 안내
+        if stale:
+            notes.append(f"{label} {stale}개 키워드는 이전 수집 데이터")
+        if partial:
+            notes.append(f"{label} {partial}개 키워드는 최근 구간만 수집됨")
+        if mock:
+            notes.append(f"{label} {mock}개 키워드는 시뮬레이션 데이터")
+
+    if notes:
+        st.caption(f"ℹ️ {' · '.join(notes)} (다음 갱신 때 다시 수집합니다)")
+
+
 def render_demo_mode_banner(web_is_mock=False, youtube_is_mock=False):
     """데모 모드 배너 표시"""
     if not web_is_mock and not youtube_is_mock:
@@ -1701,11 +1907,13 @@ def page_dashboard():
     try:
         # 캐시 히트 시 빠르게 로드
         df, metrics, youtube_df, web_is_mock, youtube_is_mock = load_all_data(timeframe_map[period])
+        correlations = load_correlations(timeframe_map[period])
         st.session_state.last_data_update = datetime.now()
     except Exception as e:
         # 에러 발생 시 (429 등) Mock 데이터 즉시 반환
         loading_placeholder.info("⏳ 데이터 수집 요청이 많아 데모 모드로 전환합니다.")
         df, metrics, youtube_df, web_is_mock, youtube_is_mock = load_mock_data_fast(timeframe_map[period])
+        correlations = compute_correlations(df, youtube_df)
         st.session_state.last_data_update = datetime.now()
         # 이미 Mock로 로드되었으므로 안내 메시지 표시 후 잠시 대기
         time.sleep(1)
@@ -1713,6 +1921,8 @@ def page_dashboard():
 
     # Demo mode banner if using mock data
     render_demo_mode_banner(web_is_mock, youtube_is_mock)
+    render_refresh_indicator()
+    render_provenance_notice()
 
     # 데이터 한계 안내 (접을 수 있는 형태로 상단에 표시)
     render_data_limitations_banner(collapsible=True)
@@ -1798,15 +2008,12 @@ def page_dashboard():
     st.markdown('<h3 class="section-heading">Web-YouTube 상관계수 TOP 5</h3>', unsafe_allow_html=True)
     st.markdown(f'<p class="section-desc">Web 검색 관심이 YouTube 학습 수요로 전환될 가능성이 높은 키워드입니다. 상관계수가 1에 가까울수록 두 플랫폼이 함께 움직입니다.</p>', unsafe_allow_html=True)
 
-    # 상관계수 계산
-    correlations = calculate_correlation(df, youtube_df, list(metrics['키워드']))
+    # 상관계수 (데이터 로드 시 함께 읽은 캐시 결과)
+    growth_by_keyword = metrics.drop_duplicates('키워드').set_index('키워드')['성장률(%)']
     corr_with_growth = []
     for kw, corr in correlations.items():
-        if corr is not None:
-            growth_row = metrics[metrics['키워드'] == kw]
-            if not growth_row.empty:
-                growth = growth_row.iloc[0]['성장률(%)']
-                corr_with_growth.append({'키워드': kw, '상관계수': corr, '성장률': growth})
+        if corr is not None and kw in growth_by_keyword.index:
+            corr_with_growth.append({'키워드': kw, '상관계수': corr, '성장률': growth_by_keyword[kw]})
 
     # 상관계수 기준 정렬 후 TOP 5
     top_corr = sorted(corr_with_growth, key=lambda x: x['상관계수'], reverse=True)[:5]
@@ -1974,6 +2181,8 @@ def page_detail():
 
     # Demo mode banner
     render_demo_mode_banner(web_is_mock, youtube_is_mock)
+    render_refresh_indicator()
+    render_provenance_notice()
 
     if kw not in df.columns:
         st.warning("데이터 없음")
@@ -2040,7 +2249,7 @@ def page_detail():
             st.info("YouTube 데이터 없음")
 
     # Web-YouTube 상관관계 표시
-    correlations = calculate_correlation(df, youtube_df, [kw])
+    correlations = load_correlations(timeframe)
     if kw in correlations and correlations[kw] is not None:
         corr_val = correlations[kw]
         corr_label = "강한 양의 상관" if corr_val > 0.7 else "보통 양의 상관" if corr_val > 0.4 else "약한 상관" if corr_val > 0.1 else "거의 무관"
@@ -2055,6 +2264,24 @@ def page_detail():
         </div>
         """, unsafe_allow_html=True)
 
+    # Web → YouTube 선행 시차 (시차 상관이 가장 높은 지점)
+    lead_lag = load_lead_lags(timeframe).get(kw)
+    if lead_lag is not None:
+        if lead_lag['lag'] > 0 and lead_lag['correlation'] > 0.4:
+            lag_hint = f"웹 검색 관심이 약 {lead_lag['lag']}일 뒤 YouTube 학습 수요로 이어지는 경향 → 그만큼 먼저 제작을 시작하세요."
+        elif lead_lag['lag'] < 0 and lead_lag['correlation'] > 0.4:
+            lag_hint = "YouTube 관심이 웹 검색보다 먼저 움직입니다. 학습 수요가 이미 형성된 주제입니다."
+        else:
+            lag_hint = "뚜렷한 선행 관계가 없습니다."
+        st.markdown(f"""
+        <div class="notice-box">
+            <strong>선행 시차:</strong>
+            <span style="font-weight: 700; margin-left: 0.5rem;">{format_lead_lag(lead_lag['lag'])}</span>
+            <span style="font-size: 0.85rem; color: #64748b; margin-left: 0.5rem;">(시차 상관 {lead_lag['correlation']:.3f})</span><br>
+            <span style="color:#737373;">{lag_hint}</span>
+        </div>
+        """, unsafe_allow_html=True)
+
     st.markdown('<p class="section-title">연관 키워드</p>', unsafe_allow_html=True)
     related = load_related(kw)
     chips = "".join([f"<span class='tag-chip'>{r}</span>" for r in related])
@@ -2113,6 +2340,8 @@ def page_compare():
 
     # Demo mode banner
     render_demo_mode_banner(web_is_mock, youtube_is_mock)
+    render_refresh_indicator()
+    render_provenance_notice()
 
     default = list(metrics['키워드'].unique())[:2]
     if st.session_state.shortlist:
@@ -2185,7 +2414,7 @@ def page_compare():
         # 상관계수 테이블 추가
         st.markdown("<br>", unsafe_allow_html=True)
         st.markdown("**Web ↔ YouTube 상관 계수**")
-        correlations = calculate_correlation(df, youtube_df, selected)
+        correlations = load_correlations(timeframe_map[period])
         corr_data = []
         for kw in selected:
             corr_val = correlations.get(kw)
@@ -2232,11 +2461,16 @@ def page_report():
         df, metrics, youtube_df, web_is_mock, youtube_is_mock = load_all_data(timeframe_map[period])
         cross_signals = load_cross_signals(timeframe_map[period])
         # 전략적 인사이트 생성
-        strategic_insights = generate_strategic_insights(df, youtube_df, metrics, list(metrics['키워드']))
+        strategic_insights = compute_strategic_insights(df, youtube_df, metrics,
+                                                        correlations=load_correlations(timeframe_map[period]),
+                                                        lead_lags=load_lead_lags(timeframe_map[period]),
+                                                        features=load_features(timeframe_map[period]))
         st.session_state.last_data_update = datetime.now()
 
     # Demo mode banner
     render_demo_mode_banner(web_is_mock, youtube_is_mock)
+    render_refresh_indicator()
+    render_provenance_notice()
 
     # ============================================
     # 1. 요약 메트릭 카드
@@ -2511,6 +2745,17 @@ def page_report():
         else:
             st.write("해당 없음")
 
+    # 선행 시차: 웹 관심이 YouTube보다 먼저 움직이는 키워드 (제작 착수 시점 판단용)
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("**⏱️ Web 선행 키워드** (시차 상관 >0.4)")
+    st.markdown("<p style='font-size: 0.85rem; color: #64748b;'>웹 검색 관심이 며칠 뒤 YouTube 학습 수요로 이어지는지 보여줍니다. 선행 일수만큼 먼저 제작을 시작할 수 있습니다.</p>", unsafe_allow_html=True)
+    web_leads = get_web_leading_keywords(strategic_insights['lead_lags'])
+    if web_leads:
+        for kw, info in web_leads[:5]:
+            st.markdown(f"- {kw}: **{format_lead_lag(info['lag'])}** (시차 상관 {info['correlation']:.3f})")
+    else:
+        st.write("해당 없음")
+
     st.markdown("<br>", unsafe_allow_html=True)
 
     # ============================================
@@ -2554,8 +2799,10 @@ def page_report():
     # ============================================
     st.markdown('<p class="section-title">다운로드</p>', unsafe_allow_html=True)
 
-    # HTML 리포트 생성
-    report_html = generate_report_html(metrics, strategic_insights, cross_signals, period)
+    # HTML 리포트 생성 (생성일과 파일명 날짜는 같은 시각 기준)
+    generated_at = datetime.now()
+    report_html = generate_report_html(metrics, strategic_insights, cross_signals, period,
+                                       report_date=generated_at.strftime("%Y-%m-%d %H:%M"))
 
     d1, d2, d3 = st.columns(3)
     with d1:
@@ -2576,7 +2823,7 @@ def page_report():
         st.download_button(
             "📄 리포트 다운로드 (HTML)",
             report_html.encode('utf-8'),
-            f"edutrend_report_{datetime.now().strftime('%Y%m%d')}.html",
+            f"edutrend_report_{generated_at.strftime('%Y%m%d')}.html",
             mime="text/html",
             width='stretch',
             help="HTML 파일을 다운로드 후 브라우저에서 열어 PDF로 인쇄할 수 있습니다"
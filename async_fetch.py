@@ -0,0 +1,175 @@
+# asyncio 기반 Google Trends 수집 엔진
+# fetch_trend_data와 같은 형태(날짜 인덱스, 키워드 컬럼)의 DataFrame을 반환하되,
+# 청크 요청을 동시에 진행하여 전체 소요 시간이 왕복 지연이 아닌 요청 속도 한도에 맞춰지도록 합니다.
+
+import asyncio
+import json
+
+import aiohttp
+import pandas as pd
+
+from rate_limit import CircuitOpenError
+from trends import get_rate_limiter, get_retry_policy
+
+BASE_TRENDS_URL = 'https://trends.google.com/trends'
+
+CHUNK_SIZE = 5          # 요청당 키워드 수 (fetch_trend_data와 동일)
+MAX_CONCURRENCY = 4     # 동시에 진행할 청크 수
+
+
+def _parse_timeline(payload, keywords):
+    """multiline 응답(timelineData)을 fetch_trend_data와 같은 DataFrame으로 변환"""
+    timeline = payload.get('default', {}).get('timelineData', [])
+    if not timeline:
+        return pd.DataFrame()
+
+    dates = pd.to_datetime([float(point['time']) for point in timeline], unit='s')
+    values = [point['value'] for point in timeline]
+    df = pd.DataFrame(values, index=dates, columns=keywords).astype(int)
+    df.index.name = 'date'
+    df = df.sort_index()
+
+    # 중복 컬럼 제거
+    return df.loc[:, ~df.columns.duplicated()]
+
+
+class AsyncTrendsClient:
+    """
+    Google Trends explore / multiline 엔드포인트를 직접 호출하는 비동기 클라이언트.
+    모든 요청은 PyTrends 경로와 같은 공용 토큰 버킷과 재시도 정책(서킷 브레이커)을 거칩니다.
+    """
+
+    def __init__(self, session, base_url=BASE_TRENDS_URL, hl='ko-KR', tz=540,
+                 limiter=None, max_concurrency=MAX_CONCURRENCY, retry_policy=None):
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.hl = hl
+        self.tz = tz
+        self.limiter = limiter or get_rate_limiter()
+        self.retry_policy = retry_policy or get_retry_policy()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _wait_for_token(self):
+        """
+        공용 토큰 버킷에서 토큰을 예약하고 차례가 될 때까지 대기.
+        reserve()는 스레드 락 · 파일 락(flock)을 잡는 블로킹 호출이므로 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+        """
+        wait = await asyncio.to_thread(self.limiter.reserve)
+        await asyncio.sleep(wait)
+
+    async def _request(self, method, path, params, trim_chars):
+        """토큰을 확보한 뒤 요청하고, 앞쪽 garbage 문자를 잘라 JSON으로 파싱"""
+        await self._wait_for_token()
+        async with self.session.request(method, f"{self.base_url}{path}", params=params) as response:
+            text = await response.text()
+            if response.status != 200:
+                raise aiohttp.ClientResponseError(
+                    response.request_info, response.history,
+                    status=response.status, message=text[:200], headers=response.headers
+                )
+            return json.loads(text[trim_chars:])
+
+    async def get_cookie(self):
+        """NID 쿠키 발급 (세션 쿠키 저장소에 보관됨)"""
+        await self._wait_for_token()
+        async with self.session.get(f"{self.base_url}/explore/", params={'geo': self.hl[-2:]}) as response:
+            await response.read()
+
+    async def interest_over_time(self, keywords, timeframe, geo='KR', gprop='', cat=0):
+        """키워드 최대 5개에 대한 관심도 추이를 DataFrame으로 반환"""
+        req = {
+            'comparisonItem': [{'keyword': kw, 'time': timeframe, 'geo': geo} for kw in keywords],
+            'category': cat,
+            'property': gprop,
+        }
+        explore = await self._request(
+            'POST', '/api/explore',
+            {'hl': self.hl, 'tz': self.tz, 'req': json.dumps(req)},
+            trim_chars=4,
+        )
+        widget = next((w for w in explore['widgets'] if w['id'] == 'TIMESERIES'), None)
+        if widget is None:
+            return pd.DataFrame()
+
+        payload = await self._request(
+            'GET', '/api/widgetdata/multiline',
+            {'req': json.dumps(widget['request']), 'token': widget['token'], 'tz': self.tz},
+            trim_chars=5,
+        )
+        return _parse_timeline(payload, keywords)
+
+    async def fetch_chunk(self, keywords, timeframe, geo='KR', gprop=''):
+        """청크 하나를 재시도 정책에 따라 수집. 실패 시 빈 DataFrame"""
+        async with self._semaphore:
+            try:
+                return await self.retry_policy.call_async(
+                    self.interest_over_time, keywords, timeframe, geo=geo, gprop=gprop
+                )
+            except CircuitOpenError as e:
+                print(f"Skipping async chunk {keywords} ({gprop or 'web'}): {e}")
+            except Exception as e:
+                print(f"Error fetching async chunk {keywords} ({gprop or 'web'}): {e}")
+            return pd.DataFrame()
+
+
+def _merge_chunks(frames):
+    """청크별 결과를 fetch_trend_data와 같은 방식으로 병합 (이미 있는 컬럼은 건너뜀)"""
+    all_data = pd.DataFrame()
+    for data in frames:
+        if data.empty:
+            continue
+        if all_data.empty:
+            all_data = data
+        else:
+            new_cols = [c for c in data.columns if c not in all_data.columns]
+            if new_cols:
+                all_data = pd.concat([all_data, data[new_cols]], axis=1)
+    return all_data
+
+
+async def fetch_trends_async(keywords, timeframe='today 3-m', gprops=('', 'youtube'), geo='KR',
+                             base_url=BASE_TRENDS_URL, max_concurrency=MAX_CONCURRENCY, limiter=None):
+    """
+    여러 gprop(웹, YouTube 등)의 청크를 한 이벤트 루프에서 동시에 수집합니다.
+
+    Args:
+        keywords: 키워드 리스트
+        timeframe: PyTrends timeframe 문자열
+        gprops: 수집할 gprop 목록 ('' = 웹, 'youtube', 'news', ...)
+        geo: 지역 코드
+        base_url: Trends API 주소 (테스트 시 로컬 stub 서버 주소)
+        max_concurrency: 동시에 진행할 청크 수 (요청 속도는 limiter가 별도로 제한)
+        limiter: TokenBucket (기본값: PyTrends 공용 버킷)
+
+    Returns:
+        dict: {gprop: DataFrame} — 각 DataFrame은 fetch_trend_data와 같은 형태
+    """
+    chunks = [keywords[i:i + CHUNK_SIZE] for i in range(0, len(keywords), CHUNK_SIZE)]
+    jar = aiohttp.CookieJar(unsafe=True)
+
+    async with aiohttp.ClientSession(cookie_jar=jar, headers={'accept-language': 'ko-KR'}) as session:
+        client = AsyncTrendsClient(session, base_url=base_url, limiter=limiter,
+                                   max_concurrency=max_concurrency)
+        try:
+            await client.get_cookie()
+        except Exception as e:
+            print(f"Error fetching Google cookie: {e}")
+
+        tasks = {
+            gprop: [asyncio.create_task(client.fetch_chunk(chunk, timeframe, geo=geo, gprop=gprop))
+                    for chunk in chunks]
+            for gprop in gprops
+        }
+        results = {}
+        for gprop, gprop_tasks in tasks.items():
+            results[gprop] = _merge_chunks(await asyncio.gather(*gprop_tasks))
+        return results
+
+
+def fetch_multi_signal_data_async(keywords, timeframe='today 3-m', **kwargs):
+    """
+    fetch_multi_signal_data의 비동기 엔진 버전.
+    Returns: dict with 'web' and 'youtube' DataFrames
+    """
+    results = asyncio.run(fetch_trends_async(keywords, timeframe, gprops=('', 'youtube'), **kwargs))
+    return {'web': results[''], 'youtube': results['youtube']}
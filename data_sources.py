@@ -0,0 +1,229 @@
+# 데이터 소스 계층
+# 앱이 데이터를 어디서 읽을지(실시간 PyTrends, 로컬 저장소, CSV/Parquet 스냅샷)를 교체할 수 있도록
+# 모든 소스가 fetch_multi_signal_data와 같은 형태의 결과를 돌려주는 공통 인터페이스를 제공합니다.
+#
+# 환경 변수 EDUTREND_DATA_SOURCE로 선택:
+#   pytrends (기본값)                          Google Trends 실시간 수집 (저장소 증분 수집)
+#   store                                      로컬 저장소만 사용 (네트워크 요청 없음)
+#   file:education_trends_timeseries.csv       CSV/Parquet 파일 하나 (웹 검색 데이터로 사용)
+#   file:data/snapshots/2026-10-18             web.parquet · youtube.parquet (또는 .csv)가 있는 스냅샷 디렉터리
+
+import os
+
+import pandas as pd
+
+from trend_store import timeframe_start
+from trends import fetch_multi_signal_data, get_pytrends_pool
+
+SIGNALS = ('web', 'youtube')
+SNAPSHOT_FORMATS = ('parquet', 'csv')
+
+
+def _result(frames, keywords, status):
+    """{'web': df, 'youtube': df}에 키워드별 출처(provenance)를 붙여 fetch_multi_signal_data 형태로 반환"""
+    result = {signal: frames.get(signal, pd.DataFrame()) for signal in SIGNALS}
+    result['provenance'] = {
+        signal: {kw: status if kw in result[signal].columns else 'missing' for kw in keywords}
+        for signal in SIGNALS
+    }
+    return result
+
+
+class DataSource:
+    """
+    데이터 소스 인터페이스.
+
+    load(keywords, timeframe)은 fetch_multi_signal_data와 같은 dict를 반환합니다:
+        {'web': DataFrame, 'youtube': DataFrame, 'provenance': {'web': {...}, 'youtube': {...}}}
+    keywords()가 None이 아니면 앱은 keyword_list.KEYWORDS 대신 그 키워드 목록을 사용합니다.
+    """
+
+    name = 'base'
+
+    def load(self, keywords, timeframe):
+        raise NotImplementedError
+
+    def keywords(self):
+        return None
+
+
+class PyTrendsSource(DataSource):
+    """
+    Google Trends 실시간 수집 (store를 넘기면 저장소에 없는 날짜만 요청)
+
+    Args:
+        store: TrendStore (None이면 매번 전체 구간 요청)
+        daily: True이면 긴 기간도 일별 데이터로 수집
+        deadline: 수집 시간 예산(초). 기본값 None은 마감 없음 —
+                  앱은 이 소스를 백그라운드 스케줄러에서 사용하므로, 빈 저장소의 일별 12개월 수집
+                  (요청 약 50건, 토큰 버킷 기준 1-2분)도 끝까지 받습니다.
+    """
+
+    name = 'pytrends'
+
+    def __init__(self, store=None, daily=True, deadline=None):
+        self.store = store
+        self.daily = daily
+        self.deadline = deadline
+
+    def load(self, keywords, timeframe):
+        # 웹·YouTube 수집 스레드가 쿠키 발급을 기다리지 않도록 세션을 미리 준비
+        get_pytrends_pool().warm()
+        return fetch_multi_signal_data(keywords, timeframe, store=self.store, daily=self.daily,
+                                       deadline=self.deadline)
+
+
+class StoreSource(DataSource):
+    """로컬 저장소(TrendStore)에 이미 있는 데이터만 사용 (네트워크 요청 없음)"""
+
+    name = 'store'
+
+    def __init__(self, store):
+        self.store = store
+
+    def load(self, keywords, timeframe):
+        start = timeframe_start(timeframe)
+        frames = {
+            signal: self.store.load(keywords, timeframe, gprop='youtube' if signal == 'youtube' else '',
+                                    start=start)
+            for signal in SIGNALS
+        }
+        return _result(frames, keywords, 'cached')
+
+
+def read_frame(path):
+    """CSV/Parquet 파일을 날짜 인덱스 · 키워드 컬럼 DataFrame으로 읽기 (확장자로 형식 판단)"""
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+
+    if 'date' in df.columns:
+        df = df.set_index('date')
+    df.index = pd.to_datetime(df.index)
+    df.index.name = 'date'
+    return df.sort_index()
+
+
+def read_columns(path):
+    """
+    read_frame이 돌려줄 키워드 컬럼 목록을 파일 전체를 읽지 않고 헤더만으로 구합니다.
+    CSV는 첫 줄, Parquet은 스키마(pandas 인덱스로 저장된 컬럼 제외)만 읽습니다.
+    """
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        schema = pq.read_schema(path)
+        index_columns = (schema.pandas_metadata or {}).get('index_columns', [])
+        names = [name for name in schema.names if name not in index_columns]
+    else:
+        names = list(pd.read_csv(path, nrows=0).columns)
+    return [name for name in names if name != 'date']
+
+
+def write_frame(df, path):
+    """read_frame으로 다시 읽을 수 있는 형태로 저장 (확장자로 형식 판단)"""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    df = df.copy()
+    df.index.name = 'date'
+    if path.endswith('.parquet'):
+        df.to_parquet(path)
+    else:
+        df.to_csv(path)
+
+
+def write_snapshot(result, directory, fmt='parquet'):
+    """
+    수집 결과({'web': df, 'youtube': df, ...})를 스냅샷 디렉터리로 저장합니다.
+    저장한 디렉터리는 FileSource로 다시 읽을 수 있습니다.
+
+    Returns:
+        list: 저장한 파일 경로
+    """
+    if fmt not in SNAPSHOT_FORMATS:
+        raise ValueError(f"unknown snapshot format: {fmt}")
+    paths = []
+    for signal in SIGNALS:
+        df = result.get(signal)
+        if df is None or df.empty:
+            continue
+        path = os.path.join(directory, f"{signal}.{fmt}")
+        write_frame(df, path)
+        paths.append(path)
+    return paths
+
+
+class FileSource(DataSource):
+    """
+    CSV/Parquet 스냅샷에서 읽기.
+
+    Args:
+        path: 파일 하나(웹 검색 데이터로 사용) 또는 web.* · youtube.* 파일이 있는 디렉터리
+    """
+
+    name = 'file'
+
+    def __init__(self, path):
+        self.path = path
+        self._keywords = None   # ((경로, 수정 시각, 크기), 키워드 목록)
+
+    def _signal_paths(self):
+        if not os.path.isdir(self.path):
+            return {'web': self.path}
+        paths = {}
+        for signal in SIGNALS:
+            for fmt in SNAPSHOT_FORMATS:
+                candidate = os.path.join(self.path, f"{signal}.{fmt}")
+                if os.path.exists(candidate):
+                    paths[signal] = candidate
+                    break
+        return paths
+
+    def keywords(self):
+        """
+        스냅샷에 들어 있는 키워드 (웹 검색 파일의 컬럼 순서).
+        앱은 재실행마다 호출하므로 헤더만 읽고, 파일이 바뀌지 않았으면(수정 시각 · 크기) 이전 결과를 재사용합니다.
+        """
+        paths = self._signal_paths()
+        if 'web' not in paths:
+            return None
+        path = paths['web']
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        if self._keywords is None or self._keywords[0] != key:
+            self._keywords = (key, read_columns(path))
+        return list(self._keywords[1])
+
+    def load(self, keywords, timeframe):
+        frames = {}
+        for signal, path in self._signal_paths().items():
+            df = read_frame(path)
+            start = timeframe_start(timeframe, df.index.max()) if not df.empty else None
+            if start is not None:
+                df = df.loc[df.index >= start]
+            frames[signal] = df[[kw for kw in keywords if kw in df.columns]]
+        return _result(frames, keywords, 'snapshot')
+
+
+def create_data_source(spec=None, store=None):
+    """
+    설정 문자열로 데이터 소스 생성.
+
+    Args:
+        spec: 'pytrends' | 'store' | 'file:<경로>' (기본값: 환경 변수 EDUTREND_DATA_SOURCE, 없으면 'pytrends')
+        store: PyTrendsSource · StoreSource가 사용할 TrendStore
+    """
+    spec = spec or os.environ.get('EDUTREND_DATA_SOURCE') or 'pytrends'
+    kind, _, arg = spec.partition(':')
+    if kind == 'pytrends':
+        return PyTrendsSource(store=store)
+    if kind == 'store':
+        if store is None:
+            raise ValueError("store data source requires a TrendStore")
+        return StoreSource(store)
+    if kind == 'file':
+        if not arg:
+            raise ValueError("file data source requires a path (file:<path>)")
+        return FileSource(arg)
+    raise ValueError(f"unknown data source: {spec}")
@@ -0,0 +1,225 @@
+# 키워드 특성(feature) 테이블
+# 성장률 · 최근 관심도 · 변동 계수 · 추세 기울기 · 피크 위치 · YouTube 성장률을 (날짜 × 키워드) 패널에서 한 번에 계산해
+# 키워드 인덱스의 넓은 표 하나로 반환합니다.
+# calculate_growth_metrics · classify_trends · analyze_cross_signals · generate_strategic_insights가 모두 이 표를 읽으므로
+# 원본 데이터를 함수마다 다시 자르지 않고, 페이지마다 같은 숫자가 나옵니다.
+
+import numpy as np
+import pandas as pd
+
+from keyword_list import get_categories
+
+# 컬럼과 타입 (모든 특성 테이블이 같은 스키마)
+FEATURE_DTYPES = {
+    # 웹 검색 (calculate_growth_metrics)
+    'web_early_mean': 'float64',      # 초기 30% 구간 평균 (데이터 10일 미만이면 전체 평균, NaN은 0)
+    'web_recent_mean': 'float64',     # 최근 30% 구간 평균 (NaN은 0)
+    'web_mean': 'float64',            # 전체 평균 (NaN은 0)
+    'web_std': 'float64',             # 전체 표준편차 (NaN은 0, 정수 컬럼은 moment_std)
+    'web_max': 'float64',
+    'web_zero_ratio': 'float64',      # 0으로 집계된 날짜 비율
+    'web_recent_4w_mean': 'float64',  # 최근 28일 평균
+    'web_prev_4w_mean': 'float64',    # 그 이전 28일 평균
+    'web_growth': 'float64',          # 성장률(%) (초기 평균 1 미만이면 999 또는 0)
+    'web_cv': 'float64',              # 변동 계수 std / mean
+    # 트렌드 분류 (classify_trends, 7일 이동평균 기준, 데이터 14일 미만이면 NaN)
+    'ma_count': 'int64',              # 이동평균의 유효 데이터 수
+    'ma_cv': 'float64',
+    'ma_max_ratio': 'float64',
+    'ma_slope': 'float64',            # 최근 4주 시작 · 끝 차이 / 일수
+    'ma_peak_position': 'int64',      # 첫 번째 최댓값의 행 위치
+    # YouTube 검색
+    'has_youtube': 'bool',            # YouTube 데이터가 있는 키워드 (10일 이상)
+    'youtube_growth': 'float64',      # 성장률(%) (초기 평균 1 미만이면 최근 평균 5 초과 시 999, 아니면 0)
+    'youtube_low_base': 'bool',       # 초기 평균이 없거나 1 미만 (Low base effect)
+    'category': 'object',
+}
+
+TREND_MIN_DAYS = 14       # 트렌드 분류에 필요한 최소 일수
+YOUTUBE_MIN_DAYS = 10     # YouTube 성장률에 필요한 최소 일수
+
+
+def _split_growth(df, low_base_growth=999.0):
+    """split_growth와 같고 Low base 여부(초기 평균이 없거나 1 미만)도 함께 반환"""
+    df = df.loc[:, ~df.columns.duplicated()]
+    split_idx = int(len(df) * 0.3)
+    early = df.iloc[:split_idx].mean()
+    recent = df.iloc[-split_idx:].mean()
+    growth = (recent - early) / early * 100
+    low_base = early.isna() | (early < 1.0)
+    return growth.where(~low_base, np.where(recent > 5.0, low_base_growth, 0.0)), low_base
+
+
+def split_growth(df, low_base_growth=999.0):
+    """
+    모든 컬럼의 초기 30% 구간 대비 최근 30% 구간 평균 성장률(%)을 한 번에 계산합니다.
+    초기 평균이 없거나 1 미만이면 최근 평균이 5 초과일 때 low_base_growth (Low base effect), 아니면 0.
+
+    Returns:
+        Series: 키워드 인덱스 성장률 (중복 컬럼은 첫 번째 컬럼 사용)
+    """
+    return _split_growth(df, low_base_growth)[0]
+
+
+def moment_std(count, total, total_sq):
+    """
+    개수 · 합 · 제곱합으로 표본 표준편차(ddof=1)를 계산합니다 (값이 2개 미만이면 0).
+    정수 관심도(0-100)는 합 · 제곱합 · n·Σx² - (Σx)²가 모두 float64에서 정확하므로 나눗셈 · 제곱근의 반올림만 남아
+    pandas std()(두 번 순회)보다 오차가 작거나 같고, 누적 방식(IncrementalMetrics)과 비트 단위로 같습니다.
+    소수 값은 두 큰 수의 차이에서 자릿수 손실이 생길 수 있으므로 _web_std처럼 pandas std()를 사용합니다.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        var = (count * total_sq - total * total) / (count * (count - 1))
+    return np.nan_to_num(np.sqrt(np.maximum(var, 0.0)), posinf=0.0)
+
+
+def _web_std(df):
+    """
+    컬럼별 표본 표준편차 (NaN은 0).
+    값이 모두 정수인 컬럼은 moment_std (IncrementalMetrics와 같은 값), 소수가 있는 컬럼은 pandas std()를 사용합니다.
+    """
+    values = df.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    std_dev = moment_std(valid.sum(axis=0).astype(float), filled.sum(axis=0), (filled ** 2).sum(axis=0))
+    fractional = (filled != np.round(filled)).any(axis=0)
+    if fractional.any():
+        std_dev[fractional] = np.nan_to_num(df.iloc[:, fractional].std().to_numpy(dtype=float))
+    return std_dev
+
+
+def _web_features(df):
+    """성장률 · 변동성 진단에 쓰는 통계량 (컬럼 위치 순서 배열)"""
+    n_rows = len(df)
+    if n_rows < 10:
+        early_period = df
+        recent_period = df
+    else:
+        split_idx = int(n_rows * 0.3)
+        early_period = df.iloc[:split_idx]
+        recent_period = df.iloc[-split_idx:]
+
+    # 4주(약 28일) 기준 윈도우 비교를 위한 인덱스 계산 (데이터가 일별이라고 가정)
+    last_4w_idx = max(0, n_rows - 28)
+    prev_4w_idx = max(0, n_rows - 56)
+
+    early_mean = np.nan_to_num(early_period.mean().to_numpy(dtype=float))
+    recent_mean = np.nan_to_num(recent_period.mean().to_numpy(dtype=float))
+    total_mean = np.nan_to_num(df.mean().to_numpy(dtype=float))
+    std_dev = _web_std(df)
+
+    recent_4w_mean = df.iloc[last_4w_idx:].mean().to_numpy(dtype=float)
+    if prev_4w_idx < last_4w_idx:
+        prev_4w_mean = df.iloc[prev_4w_idx:last_4w_idx].mean().to_numpy(dtype=float)
+    else:
+        prev_4w_mean = early_period.mean().to_numpy(dtype=float)
+
+    # 성장률 (초기 관심도가 1 미만이면 최근 5 초과 시 999 = Low base effect, 아니면 0), 변동계수 CV = std / mean
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth_rate = np.where(
+            early_mean < 1.0,
+            np.where(recent_mean > 5.0, 999.0, 0.0),
+            (recent_mean - early_mean) / early_mean * 100,
+        )
+        cv = np.where(total_mean > 0, std_dev / total_mean, 0.0)
+
+    return {
+        'web_early_mean': early_mean,
+        'web_recent_mean': recent_mean,
+        'web_mean': total_mean,
+        'web_std': std_dev,
+        'web_max': df.max().to_numpy(dtype=float),
+        'web_zero_ratio': ((df == 0).sum() / n_rows).to_numpy(dtype=float),
+        'web_recent_4w_mean': recent_4w_mean,
+        'web_prev_4w_mean': prev_4w_mean,
+        'web_growth': growth_rate,
+        'web_cv': cv,
+    }
+
+
+def _trend_features(df):
+    """트렌드 분류에 쓰는 7일 이동평균 통계량 (컬럼 위치 순서 배열)"""
+    n_rows, n_cols = df.shape
+    if n_rows < TREND_MIN_DAYS:
+        nan = np.full(n_cols, np.nan)
+        return {'ma_count': np.zeros(n_cols, dtype=int), 'ma_cv': nan, 'ma_max_ratio': nan, 'ma_slope': nan,
+                'ma_peak_position': np.zeros(n_cols, dtype=int)}
+
+    # 기울기 0 같은 경계값에서 키워드별 Series.rolling과 같은 결과가 나오도록 누적합 대신 rolling을 패널 전체에 한 번 적용
+    ma = df.rolling(window=7, min_periods=1).mean().to_numpy(dtype=float)
+    valid = ~np.isnan(ma)
+    count = valid.sum(axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Series.mean · std와 같이 NaN 제외, 표본 표준편차
+        mean_val = np.where(valid, ma, 0.0).sum(axis=0) / count
+        std_val = np.sqrt((np.where(valid, ma - mean_val, 0.0) ** 2).sum(axis=0) / (count - 1))
+        max_val = np.where(valid, ma, -np.inf).max(axis=0)
+        positive = mean_val > 0
+        cv = np.where(positive, std_val / mean_val, 0.0)
+        max_ratio = np.where(positive, max_val / mean_val, 1.0)
+
+    # 최근 4주 시작 · 끝 차이의 단순 근사
+    recent_n = min(28, n_rows)
+    slope = (ma[-1] - ma[-recent_n]) / recent_n
+
+    peak_position = np.argmax(np.where(valid, ma, -np.inf), axis=0)
+    if not df.index.is_unique:
+        # 같은 날짜가 여러 행이면 그 날짜의 첫 번째 행 위치 (idxmax 후 날짜로 위치를 찾던 방식과 동일)
+        date_codes, _ = pd.factorize(df.index)
+        first_row = np.unique(date_codes, return_index=True)[1]
+        peak_position = first_row[date_codes[peak_position]]
+
+    return {'ma_count': count, 'ma_cv': cv, 'ma_max_ratio': max_ratio, 'ma_slope': slope,
+            'ma_peak_position': peak_position}
+
+
+def youtube_features(youtube_df, keywords):
+    """
+    YouTube 성장률 특성만 계산합니다 (build_features의 YouTube 부분).
+
+    Returns:
+        DataFrame: keywords 순서의 has_youtube · youtube_growth · youtube_low_base
+                   (데이터가 없는 키워드는 False · NaN · False)
+    """
+    kws = pd.Index(keywords, name='키워드')
+    has_youtube = np.zeros(len(kws), dtype=bool)
+    growth = pd.Series(np.nan, index=kws)
+    low_base = pd.Series(False, index=kws)
+    if youtube_df is not None and len(youtube_df) >= YOUTUBE_MIN_DAYS:
+        has_youtube = np.asarray(kws.isin(youtube_df.columns))
+        if has_youtube.any():
+            present = kws[has_youtube]
+            youtube_growth, youtube_low_base = _split_growth(youtube_df)
+            growth[has_youtube] = youtube_growth.reindex(present).to_numpy(dtype=float)
+            low_base[has_youtube] = youtube_low_base.reindex(present).to_numpy(dtype=bool)
+    return pd.DataFrame({'has_youtube': has_youtube, 'youtube_growth': growth, 'youtube_low_base': low_base},
+                        index=kws)
+
+
+def build_features(web_df, youtube_df=None):
+    """
+    웹(필요하면 YouTube) 패널에서 모든 분석 지표를 한 번에 계산합니다.
+
+    Args:
+        web_df: 웹 트렌드 DataFrame (날짜 인덱스, 키워드 컬럼)
+        youtube_df: YouTube 트렌드 DataFrame (없으면 YouTube 특성은 NaN)
+
+    Returns:
+        DataFrame: 웹 데이터 컬럼 순서의 '키워드' 인덱스, FEATURE_DTYPES 컬럼
+                   (중복 컬럼도 위치별로 한 행씩 유지)
+    """
+    keywords = pd.Index(web_df.columns, name='키워드')
+    if web_df.empty:
+        return pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in FEATURE_DTYPES.items()},
+                            index=keywords[:0])
+
+    columns = {**_web_features(web_df), **_trend_features(web_df)}
+    youtube = youtube_features(youtube_df, keywords[~keywords.duplicated()]).reindex(keywords)
+    columns['has_youtube'] = youtube['has_youtube'].to_numpy(dtype=bool)
+    columns['youtube_growth'] = youtube['youtube_growth'].to_numpy(dtype=float)
+    columns['youtube_low_base'] = youtube['youtube_low_base'].to_numpy(dtype=bool)
+    columns['category'] = np.asarray(get_categories(web_df.columns), dtype=object)
+
+    features = pd.DataFrame(columns, index=keywords)
+    return features.astype(FEATURE_DTYPES)
@@ -0,0 +1,179 @@
+# 일별 증분 성장 지표 엔진
+# 새 날짜의 관심도 한 행이 들어올 때 전체 기간을 다시 계산하지 않고 키워드별 누적 통계만 갱신합니다.
+# 행마다 누적합(prefix sum) · 유효 개수 한 행을 덧붙이고 (키워드당 O(1)), 합 · 제곱합 · 0 개수 · 최댓값을 누적하므로
+# 초기/최근 30% 구간과 최근 · 이전 4주 구간처럼 기간에 따라 움직이는 윈도우도 누적합의 차이로 바로 구합니다.
+#
+# 정수 관심도(Google Trends 0-100)는 누적합이 정확하므로 calculate_growth_metrics(batch)와 평균 · 표준편차 ·
+# 성장률이 비트 단위로 같고, 진단 라벨도 같은 코드(growth_metrics_from_features)로 붙입니다.
+# 소수 값(Mock 등)은 누적합의 반올림 오차와 batch 쪽 pandas std()와의 차이만큼(1e-13 수준) 다를 수 있어,
+# 성장률이 정확히 0인 경우처럼 경계값에 걸린 키워드는 라벨이 달라질 수 있습니다.
+
+import numpy as np
+import pandas as pd
+
+from features import FEATURE_DTYPES, moment_std
+from keyword_list import get_categories
+from trends import growth_metrics_from_features
+
+INITIAL_CAPACITY = 512   # 누적합 버퍼의 처음 행 수 (가득 차면 두 배로 늘림)
+
+
+class IncrementalMetrics:
+    """
+    키워드별 성장 지표를 일 단위로 증분 갱신합니다.
+
+    Args:
+        keywords: 키워드(컬럼) 리스트 (중복 없음). append하는 배열 행은 이 순서를 따릅니다.
+
+    사용 예:
+        engine = IncrementalMetrics.from_frame(history_df)
+        engine.append(new_row, date)      # 하루치 (키워드 순서 배열 · dict · Series)
+        metrics = engine.metrics()        # calculate_growth_metrics(전체 기간)과 같은 결과
+    """
+
+    def __init__(self, keywords, capacity=INITIAL_CAPACITY):
+        self.keywords = pd.Index(keywords, name='키워드')
+        if self.keywords.has_duplicates:
+            raise ValueError("keywords must be unique")
+        k = len(self.keywords)
+        # 누적합 버퍼: 0행은 0, t행은 처음 t개 행의 합 (구간 [a, b)의 합 = cum[b] - cum[a])
+        self._cum = np.zeros((capacity + 1, k))
+        self._cnt = np.zeros((capacity + 1, k))
+        self._n = 0
+        self._sum_sq = np.zeros(k)
+        self._zeros = np.zeros(k)
+        self._max = np.full(k, np.nan)
+        self._categories = get_categories(self.keywords)
+        self.dates = []
+
+    @classmethod
+    def from_frame(cls, df):
+        """기존 이력(날짜 인덱스, 키워드 컬럼)으로 엔진을 만듭니다 (누적합 한 번)"""
+        engine = cls(df.columns, capacity=max(INITIAL_CAPACITY, len(df)))
+        engine.extend(df)
+        return engine
+
+    def __len__(self):
+        return self._n
+
+    def _row(self, row):
+        """한 행을 키워드 순서의 float 배열로 (dict · Series는 키워드 이름으로, 없는 키워드는 NaN)"""
+        if isinstance(row, dict):
+            row = pd.Series(row, dtype=float)
+        if isinstance(row, pd.Series):
+            row = row.reindex(self.keywords)
+        row = np.asarray(row, dtype=float)
+        if row.shape != (len(self.keywords),):
+            raise ValueError(f"row must have {len(self.keywords)} values, got shape {row.shape}")
+        return row
+
+    def _reserve(self, rows):
+        """누적합 버퍼에 rows행을 더 넣을 공간 확보 (두 배씩 늘려 행 추가는 평균 O(1))"""
+        needed = self._n + rows + 1
+        if needed <= len(self._cum):
+            return
+        capacity = max(needed, 2 * len(self._cum))
+        for name in ('_cum', '_cnt'):
+            buffer = np.zeros((capacity, len(self.keywords)))
+            buffer[:self._n + 1] = getattr(self, name)[:self._n + 1]
+            setattr(self, name, buffer)
+
+    def _add(self, values, dates):
+        """행 블록(2차원 배열)을 누적 통계에 반영"""
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        self._reserve(len(values))
+        start = self._n
+        end = start + len(values)
+        self._cum[start + 1:end + 1] = self._cum[start] + np.cumsum(filled, axis=0)
+        self._cnt[start + 1:end + 1] = self._cnt[start] + np.cumsum(valid, axis=0)
+        self._sum_sq += (filled ** 2).sum(axis=0)
+        self._zeros += (values == 0).sum(axis=0)
+        self._max = np.fmax(self._max, np.max(np.where(valid, values, -np.inf), axis=0, initial=-np.inf))
+        self._max[np.isinf(self._max)] = np.nan
+        self._n = end
+        self.dates.extend(dates)
+
+    def append(self, row, date=None):
+        """
+        하루치 관심도를 추가합니다 (키워드당 O(1)).
+
+        Args:
+            row: 키워드 순서의 값 배열, 또는 {키워드: 값} dict · Series (없는 키워드 · NaN은 결측)
+            date: 날짜 (dates에 기록)
+        """
+        self._add(self._row(row)[None, :], [date])
+
+    def extend(self, df):
+        """여러 날짜를 한 번에 추가 (날짜 인덱스, 키워드 컬럼. 없는 키워드는 결측)"""
+        values = df.reindex(columns=self.keywords).to_numpy(dtype=float)
+        self._add(values, list(df.index))
+
+    def _window_mean(self, start, end):
+        """행 구간 [start, end)의 키워드별 평균 (값이 없으면 NaN)"""
+        total = self._cum[end] - self._cum[start]
+        count = self._cnt[end] - self._cnt[start]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return total / count
+
+    def features(self):
+        """
+        현재까지의 웹 통계량을 특성 테이블 스키마로 반환합니다 (build_features의 web_* · category 컬럼).
+        트렌드 분류 · YouTube 컬럼은 계산하지 않으므로 '데이터 없음' 값입니다.
+        """
+        n = self._n
+        if n < 10:
+            early, recent = (0, n), (0, n)
+        else:
+            split_idx = int(n * 0.3)
+            early, recent = (0, split_idx), (n - split_idx, n)
+        last_4w_idx = max(0, n - 28)
+        prev_4w_idx = max(0, n - 56)
+
+        early_raw = self._window_mean(*early)
+        early_mean = np.nan_to_num(early_raw)
+        recent_mean = np.nan_to_num(self._window_mean(*recent))
+        total_mean = np.nan_to_num(self._window_mean(0, n))
+        count = self._cnt[n]
+        std_dev = moment_std(count, self._cum[n], self._sum_sq)
+        recent_4w_mean = self._window_mean(last_4w_idx, n)
+        prev_4w_mean = self._window_mean(prev_4w_idx, last_4w_idx) if prev_4w_idx < last_4w_idx else early_raw
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth_rate = np.where(
+                early_mean < 1.0,
+                np.where(recent_mean > 5.0, 999.0, 0.0),
+                (recent_mean - early_mean) / early_mean * 100,
+            )
+            cv = np.where(total_mean > 0, std_dev / total_mean, 0.0)
+            zero_ratio = self._zeros / n
+
+        k = len(self.keywords)
+        columns = {
+            'web_early_mean': early_mean,
+            'web_recent_mean': recent_mean,
+            'web_mean': total_mean,
+            'web_std': std_dev,
+            'web_max': self._max.copy(),
+            'web_zero_ratio': zero_ratio,
+            'web_recent_4w_mean': recent_4w_mean,
+            'web_prev_4w_mean': prev_4w_mean,
+            'web_growth': growth_rate,
+            'web_cv': cv,
+            'ma_count': np.zeros(k, dtype=int),
+            'ma_cv': np.full(k, np.nan),
+            'ma_max_ratio': np.full(k, np.nan),
+            'ma_slope': np.full(k, np.nan),
+            'ma_peak_position': np.zeros(k, dtype=int),
+            'has_youtube': np.zeros(k, dtype=bool),
+            'youtube_growth': np.full(k, np.nan),
+            'youtube_low_base': np.zeros(k, dtype=bool),
+            'category': self._categories,
+        }
+        return pd.DataFrame(columns, index=self.keywords).astype(FEATURE_DTYPES)
+
+    def metrics(self):
+        """calculate_growth_metrics(전체 이력)와 같은 메트릭스 DataFrame (데이터가 없으면 빈 DataFrame)"""
+        if self._n == 0 or len(self.keywords) == 0:
+            return pd.DataFrame()
+        return growth_metrics_from_features(self.features())
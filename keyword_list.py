@@ -1,5 +1,10 @@
 # 초기 키워드 리스트 (MVP용)
 
+import re
+
+import numpy as np
+import pandas as pd
+
 KEYWORDS = [
     # AI / Data
     "ChatGPT 교육",
@@ -40,17 +45,36 @@ KEYWORDS = [
     "직무 멘토링"
 ]
 
+# 카테고리 분류 규칙 (위에서부터 먼저 포함되는 단어가 있는 카테고리)
+CATEGORY_RULES = [
+    ('AI/데이터', ['ai', 'gpt', '러닝', '분석', 'sql', '파이썬']),
+    ('개발', ['개발', '리액트', 'next', '스프링', '코드', 'devops']),
+    ('노코드/생산성', ['노션', '재피어', '피그마', '자동화', '노코드']),
+    ('마케팅', ['마케팅', 'seo', 'ga4', '그로스']),
+]
+DEFAULT_CATEGORY = '기타'
+
 def get_category(keyword):
     """
     단순 키워드 기반 카테고리 분류
     """
     k = keyword.lower()
-    if any(x in k for x in ['ai', 'gpt', '러닝', '분석', 'sql', '파이썬']):
-        return 'AI/데이터'
-    if any(x in k for x in ['개발', '리액트', 'next', '스프링', '코드', 'devops']):
-        return '개발'
-    if any(x in k for x in ['노션', '재피어', '피그마', '자동화', '노코드']):
-        return '노코드/생산성'
-    if any(x in k for x in ['마케팅', 'seo', 'ga4', '그로스']):
-        return '마케팅'
-    return '기타'
+    for category, terms in CATEGORY_RULES:
+        if any(x in k for x in terms):
+            return category
+    return DEFAULT_CATEGORY
+
+def get_categories(keywords):
+    """
+    get_category의 배열 버전. 키워드 전체를 규칙별 정규식 한 번씩으로 분류합니다.
+
+    Returns:
+        ndarray: 키워드 순서대로의 카테고리 (object 배열)
+    """
+    lowered = pd.Index(keywords).astype(str).str.lower()
+    conditions = [
+        np.asarray(lowered.str.contains('|'.join(map(re.escape, terms))), dtype=bool)
+        for _, terms in CATEGORY_RULES
+    ]
+    categories = [category for category, _ in CATEGORY_RULES]
+    return np.select(conditions, categories, default=DEFAULT_CATEGORY).astype(object)
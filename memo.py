@@ -0,0 +1,162 @@
+# 분석 결과 메모이제이션 (내용 해시 + LRU)
+# Streamlit은 슬라이더 · 선택 상자를 움직일 때마다 페이지 스크립트 전체를 다시 실행하고,
+# st.cache_data는 매번 결과의 복사본을 돌려주므로 객체 id로는 '같은 데이터'를 알아볼 수 없습니다.
+# 입력 DataFrame · 파라미터의 내용 지문(fingerprint)을 키로 결과를 보관해
+# 같은 데이터의 재렌더링은 해시 계산과 딕셔너리 조회만으로 끝나게 합니다.
+
+import hashlib
+import pickle
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+import telemetry
+
+DEFAULT_MAXSIZE = 32   # 함수별로 보관하는 결과 수 (가장 오래 쓰지 않은 결과부터 제거)
+
+_caches = {}   # 캐시 이름 -> LRUCache
+_caches_lock = threading.Lock()
+
+
+def _is_numeric(obj):
+    dtypes = obj.dtypes if isinstance(obj, pd.DataFrame) else [obj.dtype]
+    return all(isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM' for dtype in dtypes)
+
+
+def _update_values(h, obj):
+    """
+    DataFrame · Series의 값과 인덱스.
+    숫자 패널은 배열 바이트를 그대로 해시하고 (컬럼별 hash_pandas_object보다 수십 배 빠름),
+    문자열 등 object 컬럼은 hash_pandas_object, 해시할 수 없는 값(list 등)이 있으면 pickle을 사용합니다.
+    """
+    try:
+        h.update(pd.util.hash_pandas_object(obj.index).to_numpy().tobytes())
+        if _is_numeric(obj):
+            h.update(np.ascontiguousarray(obj.to_numpy()).tobytes())
+        else:
+            h.update(pd.util.hash_pandas_object(obj, index=False).to_numpy().tobytes())
+    except TypeError:
+        h.update(pickle.dumps((obj.index.tolist(), obj.to_numpy().tolist())))
+
+
+def _update(h, obj):
+    """obj의 내용을 해시 h에 반영 (타입 태그를 함께 넣어 [1] · (1,) · '1'이 구분되도록)"""
+    if isinstance(obj, pd.DataFrame):
+        h.update(b'D')
+        h.update(pickle.dumps((obj.columns.tolist(), obj.dtypes.tolist(), obj.index.names)))
+        _update_values(h, obj)
+    elif isinstance(obj, pd.Series):
+        h.update(b'S')
+        h.update(pickle.dumps((obj.name, obj.dtype, obj.index.names)))
+        _update_values(h, obj)
+    elif isinstance(obj, np.ndarray):
+        h.update(b'A')
+        _update(h, (str(obj.dtype), obj.shape))
+        h.update(obj.tobytes() if obj.dtype != object else pickle.dumps(obj.tolist()))
+    elif isinstance(obj, dict):
+        h.update(b'M%d:' % len(obj))
+        for key, value in obj.items():
+            _update(h, key)
+            _update(h, value)
+    elif isinstance(obj, (list, tuple)):
+        h.update(b'L' if isinstance(obj, list) else b'T')
+        h.update(b'%d:' % len(obj))
+        for item in obj:
+            _update(h, item)
+    elif obj is None or isinstance(obj, (str, bytes, bool, int, float, np.generic, pd.Timestamp)):
+        h.update(type(obj).__name__.encode())
+        h.update(repr(obj).encode())
+        h.update(b';')
+    else:
+        h.update(b'P')
+        h.update(pickle.dumps(obj))
+
+
+def fingerprint(*objects):
+    """
+    DataFrame · Series · 배열 · dict · list · 스칼라의 내용 지문을 계산합니다.
+    값 · 인덱스 · 컬럼 · dtype이 같으면 다른 객체(캐시 복사본)라도 같은 지문입니다.
+
+    Returns:
+        str: 16진수 해시 (blake2b 128비트)
+    """
+    h = hashlib.blake2b(digest_size=16)
+    _update(h, objects)
+    return h.hexdigest()
+
+
+class LRUCache:
+    """스레드 안전한 크기 제한 LRU 캐시 (여러 Streamlit 세션이 공유)"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_MISSING = object()
+
+
+def memoize(name, maxsize=DEFAULT_MAXSIZE):
+    """
+    인자의 내용 지문을 키로 결과를 보관하는 데코레이터.
+    적중/미스는 telemetry의 캐시 지표(edutrend_cache_requests_total{cache=name})로 집계합니다.
+    보관한 결과를 그대로 돌려주므로 호출한 쪽에서 결과를 수정하면 안 됩니다.
+    Streamlit은 재실행마다 app.py의 함수를 새로 정의하므로 캐시는 이름 단위로 모듈에 보관합니다.
+
+    Args:
+        name: 캐시 이름 (지표 라벨)
+        maxsize: 보관할 최대 결과 수
+    """
+    def decorator(fn):
+        with _caches_lock:
+            cache = _caches.setdefault(name, LRUCache(maxsize))
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = fingerprint(args, sorted(kwargs.items()))
+            result = cache.get(key, _MISSING)
+            if result is not _MISSING:
+                telemetry.CACHE_REQUESTS.inc(cache=name, result='hit')
+                return result
+            telemetry.CACHE_REQUESTS.inc(cache=name, result='miss')
+            result = fn(*args, **kwargs)
+            cache.put(key, result)
+            return result
+
+        wrapper.cache = cache
+        wrapper.clear = cache.clear
+        return wrapper
+    return decorator
+
+
+def clear_all():
+    """memoize로 만든 모든 캐시를 비웁니다 (데이터 새로고침 시)"""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
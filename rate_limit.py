@@ -0,0 +1,384 @@
+# Google Trends 요청 속도 제어
+# 모든 PyTrends 호출이 하나의 토큰 버킷을 거치도록 하여
+# 스레드 · Streamlit 세션 · 프로세스가 함께 요청해도 허용 속도를 넘지 않게 합니다.
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from pytrends.exceptions import TooManyRequestsError
+
+try:
+    import fcntl  # POSIX 전용 (Windows에서는 프로세스 내 공유만 지원)
+except ImportError:
+    fcntl = None
+
+
+class TokenBucket:
+    """
+    예약(reservation) 방식의 토큰 버킷.
+
+    초당 rate개의 토큰이 capacity까지 채워지며, 요청 1건이 토큰 1개를 사용합니다.
+    토큰이 부족하면 잔고가 음수가 되고, 호출자는 반환된 시간만큼 기다린 뒤 요청합니다.
+    state_path를 지정하면 파일 잠금(flock)으로 같은 호스트의 여러 프로세스가 버킷을 공유합니다.
+    """
+
+    def __init__(self, rate, capacity=1, state_path=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.state_path = state_path if fcntl is not None else None
+        self._lock = threading.Lock()
+        self._state = {'tokens': self.capacity, 'updated': time.time()}
+
+        if self.state_path and os.path.dirname(self.state_path):
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+
+    def _take(self, state, tokens, max_wait=None):
+        """
+        잔고를 보충한 뒤 tokens개를 차감하고, 기다려야 할 시간(초)을 반환.
+        대기 시간이 max_wait를 넘으면 차감하지 않고 None을 반환
+        """
+        now = time.time()
+        elapsed = max(0.0, now - state['updated'])
+        state['tokens'] = min(self.capacity, state['tokens'] + elapsed * self.rate)
+        state['updated'] = now
+        wait = max(0.0, (tokens - state['tokens']) / self.rate)
+        if max_wait is not None and wait > max_wait:
+            return None
+        state['tokens'] -= tokens
+        return wait
+
+    def reserve(self, tokens=1, max_wait=None):
+        """
+        토큰을 예약하고 요청 전까지 기다려야 할 시간(초)을 반환합니다.
+        직접 대기하지 않으므로 asyncio 코드에서도 사용할 수 있습니다.
+        max_wait를 지정하면 그보다 오래 기다려야 할 때 예약하지 않고 None을 반환합니다
+        (마감 시간 안에 보낼 수 없는 요청이 다른 요청의 순서를 밀어내지 않도록).
+        """
+        with self._lock:
+            if not self.state_path:
+                return self._take(self._state, tokens, max_wait)
+
+            with open(self.state_path, 'a+') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read())
+                    except ValueError:
+                        state = {'tokens': self.capacity, 'updated': time.time()}
+                    wait = self._take(state, tokens, max_wait)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+            return wait
+
+    def acquire(self, tokens=1):
+        """토큰을 확보할 때까지 대기합니다. 실제로 기다린 시간(초)을 반환"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+# =============================================================================
+# 마감 시간 (deadline) 및 협조적 취소
+# =============================================================================
+
+class DeadlineExceeded(Exception):
+    """마감 시간이 지났거나 취소되어 더 이상 요청을 보내지 않음"""
+
+
+class Deadline:
+    """
+    수집 한 건의 시간 예산.
+    청크 루프 · 토큰 대기 · 재시도 대기 · HTTP 타임아웃이 남은 시간을 확인하고,
+    마감되거나 cancel()이 호출되면 다음 확인 지점에서 새 요청 없이 멈춥니다.
+
+    Args:
+        seconds: 예산(초). None이면 마감 없음 (cancel()로만 중단)
+    """
+
+    def __init__(self, seconds=None):
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+        self._cancelled = threading.Event()
+
+    def remaining(self):
+        """남은 시간(초). 마감이 없으면 None, 취소되었으면 0"""
+        if self._cancelled.is_set():
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def check(self):
+        """마감되었으면 DeadlineExceeded"""
+        if self.expired():
+            raise DeadlineExceeded("fetch deadline exceeded")
+
+    def sleep(self, seconds):
+        """최대 seconds만큼 대기. 그 전에 마감·취소되면 DeadlineExceeded"""
+        remaining = self.remaining()
+        if remaining is not None and seconds > remaining:
+            self._cancelled.wait(remaining)
+            raise DeadlineExceeded("fetch deadline exceeded")
+        if self._cancelled.wait(seconds):
+            raise DeadlineExceeded("fetch cancelled")
+
+    def timeout(self, timeout):
+        """HTTP 타임아웃((connect, read) 또는 초)을 남은 시간 이하로 줄임"""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        remaining = max(remaining, 0.001)
+        if isinstance(timeout, tuple):
+            return tuple(min(t, remaining) for t in timeout)
+        return min(timeout, remaining) if timeout is not None else remaining
+
+
+# =============================================================================
+# 재시도 정책 (지수 백오프 + Retry-After) 및 서킷 브레이커
+# =============================================================================
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않고 즉시 실패함"""
+
+
+def _status_code(error):
+    """requests(response.status_code) · aiohttp(status) 예외에서 HTTP 상태 코드 추출"""
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    return status if status is not None else getattr(error, 'status', None)
+
+
+def is_throttled(error):
+    """
+    429 (Too Many Requests) 응답으로 인한 예외인지 판단.
+    응답 상태 코드와 PyTrends의 TooManyRequestsError만 보고, 메시지 문자열(URL · 개수 등)은 보지 않습니다.
+    """
+    return isinstance(error, TooManyRequestsError) or _status_code(error) == 429
+
+
+def retry_after_seconds(error):
+    """응답의 Retry-After 헤더(초 또는 HTTP 날짜)를 초 단위로 변환. 없으면 None"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or getattr(error, 'headers', None) or {}
+    value = headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class _Counters:
+    """스레드 안전 카운터 묶음"""
+
+    def __init__(self, names):
+        self._lock = threading.Lock()
+        self._values = {name: 0 for name in names}
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+
+class CircuitBreaker:
+    """
+    연속 429가 failure_threshold회 발생하면 회로를 열어(open) reset_timeout 동안 요청을 즉시 거절합니다.
+    이후 요청 1건만 시험(half-open)으로 통과시키고, 성공하면 닫고(closed) 다시 429면 재개방합니다.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=3, reset_timeout=120.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.counters = _Counters(['trips', 'half_open_probes', 'rejected', 'recoveries'])
+
+    def allow(self):
+        """요청을 보내도 되는지 확인 (open 상태면 False)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self.counters.incr('half_open_probes')
+                return True
+            self.counters.incr('rejected')
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                self.counters.incr('recoveries')
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_error(self):
+        """429가 아닌 오류: 스로틀링 여부를 알 수 없으므로 다음 요청이 다시 시험하도록 함"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_throttle(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.counters.incr('trips')
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+
+class RetryPolicy:
+    """
+    429 · 5xx 응답에 대한 재시도 정책.
+
+    - 지수 백오프 + full jitter: 대기 시간 = uniform(0, min(max_delay, base_delay * 2^시도))
+    - Retry-After 헤더가 있으면 그 시간을 우선 적용 (max_delay 상한)
+    - 429가 반복되면 서킷 브레이커를 열어 이후 요청은 CircuitOpenError로 즉시 실패
+    - 모든 결정(재시도, 차단, half-open 시험)은 stats()로 집계
+    """
+
+    def __init__(self, max_attempts=4, base_delay=2.0, max_delay=60.0, breaker=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.counters = _Counters([
+            'calls', 'successes', 'failures', 'retries', 'throttled',
+            'server_errors', 'retry_after_honored', 'backoff_seconds', 'deadline_exceeded'
+        ])
+
+    def _should_retry(self, error):
+        status = _status_code(error)
+        return is_throttled(error) or (status is not None and 500 <= status < 600)
+
+    def backoff(self, attempt, error=None):
+        """attempt번째 재시도 전 대기 시간(초)"""
+        retry_after = retry_after_seconds(error) if error is not None else None
+        if retry_after is not None:
+            self.counters.incr('retry_after_honored')
+            return min(self.max_delay, retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _before_attempt(self, deadline=None):
+        if deadline is not None and deadline.expired():
+            self.counters.incr('deadline_exceeded')
+            raise DeadlineExceeded("fetch deadline exceeded")
+        if not self.breaker.allow():
+            self.counters.incr('failures')
+            raise CircuitOpenError("Google Trends circuit is open (too many 429 responses)")
+
+    def _after_error(self, attempt, error):
+        """예외를 기록하고 재시도 전 대기 시간(초)을 반환. 재시도하지 않으면 None"""
+        if isinstance(error, DeadlineExceeded):
+            # 요청을 보내지 않았으므로 half-open 시험 자리만 반납
+            self.breaker.record_error()
+            self.counters.incr('deadline_exceeded')
+            return None
+
+        status = _status_code(error)
+        if is_throttled(error):
+            self.counters.incr('throttled')
+            self.breaker.record_throttle()
+        else:
+            self.breaker.record_error()
+            if status is not None and status >= 500:
+                self.counters.incr('server_errors')
+
+        if not self._should_retry(error) or attempt == self.max_attempts - 1:
+            self.counters.incr('failures')
+            return None
+
+        delay = self.backoff(attempt, error)
+        self.counters.incr('retries')
+        self.counters.incr('backoff_seconds', delay)
+        return delay
+
+    def _after_success(self):
+        self.breaker.record_success()
+        self.counters.incr('successes')
+
+    def call(self, fn, *args, deadline=None, **kwargs):
+        """
+        fn을 정책에 따라 실행. 최종 실패 시 마지막 예외(또는 CircuitOpenError)를 던짐.
+        deadline(Deadline)을 넘기면 마감 후에는 시도하지 않고, 재시도 대기가 마감을 넘기면 DeadlineExceeded
+        """
+        self.counters.incr('calls')
+        for attempt in range(self.max_attempts):
+            self._before_attempt(deadline)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._after_error(attempt, e)
+                if delay is None:
+                    raise
+                if deadline is not None:
+                    deadline.sleep(delay)
+                else:
+                    time.sleep(delay)
+                continue
+            self._after_success()
+            return result
+
+    async def call_async(self, fn, *args, **kwargs):
+        """call의 asyncio 버전 (fn은 코루틴 함수)"""
+        self.counters.incr('calls')
+        for attempt in range(self.max_attempts):
+            self._before_attempt()
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._after_error(attempt, e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self._after_success()
+            return result
+
+    def stats(self):
+        """재시도·서킷 브레이커 결정 횟수 집계"""
+        stats = self.counters.snapshot()
+        stats.update({f"circuit_{k}": v for k, v in self.breaker.counters.snapshot().items()})
+        stats['circuit_state'] = self.breaker.state
+        return stats
@@ -0,0 +1,260 @@
+# Google Trends 응답 녹화/재생 (record/replay)
+# 실제 수집 중 받은 응답을 파일(cassette)에 기록해 두고, 재생 모드에서는 네트워크 없이 같은 응답을 돌려줍니다.
+# requests 전송 계층(adapter)에서 동작하므로 PyTrends 파싱 · 토큰 버킷 · 재시도 · 세션 풀은 그대로 실행되고,
+# 지연 시간과 429 비율을 주입해 수집 엔진 변경을 오프라인에서 같은 조건으로 비교할 수 있습니다.
+#
+# 환경 변수로 설정 (또는 configure() 호출):
+#   TRENDS_REPLAY=record:data/cassette.jsonl   실제 요청을 보내고 응답을 기록
+#   TRENDS_REPLAY=replay:data/cassette.jsonl   기록된 응답만 사용 (없는 요청은 404)
+#   TRENDS_REPLAY_LATENCY=0.3                  재생 응답마다 추가할 지연(초)
+#   TRENDS_REPLAY_429_RATE=0.1                 재생 요청 중 429로 응답할 비율 (0-1)
+#   TRENDS_REPLAY_SEED=42                      429 주입 난수 시드
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import date
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.cookies import cookiejar_from_dict
+from requests.structures import CaseInsensitiveDict
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+# 응답 헤더 중 기록할 항목 (쿠키는 별도로 기록)
+_RECORDED_HEADERS = ('Content-Type', 'Retry-After')
+
+# 요청 안의 절대 날짜(YYYY-MM-DD) — 녹화일 기준 상대 일수로 바꿔 다른 날에도 같은 키가 되도록 함
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+def request_key(method, url, body=None, today=None):
+    """
+    요청을 재생 키로 변환합니다.
+    'today 12-m' 일별 수집처럼 날짜가 들어간 요청도 녹화일·재생일 기준 상대 날짜로 비교합니다.
+    """
+    today = today or date.today()
+    parts = urlsplit(url)
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', 'replace')
+    text = json.dumps([method.upper(), parts.path, sorted(parse_qsl(parts.query)), body or ''],
+                      ensure_ascii=False)
+
+    def relative(match):
+        try:
+            return f"D{(date.fromisoformat(match.group()) - today).days:+d}"
+        except ValueError:
+            return match.group()
+
+    return _DATE_RE.sub(relative, text)
+
+
+class Cassette:
+    """녹화된 응답 묶음 (JSONL 파일, 줄마다 요청 키와 응답 1건)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry['key']] = entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def add(self, entry):
+        with self._lock:
+            self._entries[entry['key']] = entry
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def _build_response(request, status, body, headers=None, cookies=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body.encode('utf-8')
+    response.encoding = 'utf-8'
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.cookies = cookiejar_from_dict(cookies or {})
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class RecordingAdapter(HTTPAdapter):
+    """실제로 요청을 보내고, 받은 응답을 cassette에 기록하는 adapter"""
+
+    def __init__(self, cassette, stats):
+        super().__init__()
+        self.cassette = cassette
+        self.stats = stats
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self.cassette.add({
+            'key': request_key(request.method, request.url, request.body),
+            'method': request.method,
+            'url': request.url,
+            'status': response.status_code,
+            'headers': {k: response.headers[k] for k in _RECORDED_HEADERS if k in response.headers},
+            'cookies': response.cookies.get_dict(),
+            'body': response.text,
+        })
+        self.stats.incr('recorded')
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    cassette의 응답을 네트워크 없이 돌려주는 adapter.
+
+    Args:
+        cassette: Cassette
+        latency: 응답마다 추가할 지연(초)
+        throttle_rate: 429 (Retry-After 포함)로 응답할 비율 (0-1)
+        retry_after: 주입한 429 응답의 Retry-After 값(초)
+        seed: 429 주입 난수 시드 (같은 시드면 같은 순서로 429 발생)
+    """
+
+    def __init__(self, cassette, stats, latency=0.0, throttle_rate=0.0, retry_after=0, seed=None):
+        super().__init__()
+        self.cassette = cassette
+        self.stats = stats
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        with self._rng_lock:
+            throttled = self.throttle_rate > 0 and self._rng.random() < self.throttle_rate
+        if throttled:
+            self.stats.incr('throttled')
+            return _build_response(request, 429, 'Too Many Requests (injected)',
+                                   {'Content-Type': 'text/html', 'Retry-After': str(self.retry_after)})
+
+        entry = self.cassette.get(request_key(request.method, request.url, request.body))
+        if entry is None:
+            self.stats.incr('misses')
+            return _build_response(request, 404, 'No recorded response', {'Content-Type': 'text/html'})
+
+        self.stats.incr('hits')
+        return _build_response(request, entry['status'], entry['body'], entry['headers'], entry['cookies'])
+
+    def close(self):
+        pass  # 세션 간 공유하므로 닫을 연결이 없음
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {'recorded': 0, 'hits': 0, 'misses': 0, 'throttled': 0}
+
+    def incr(self, name):
+        with self._lock:
+            self._values[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+
+_config = None
+_config_lock = threading.Lock()
+
+
+def configure(mode=None, path=None, latency=0.0, throttle_rate=0.0, retry_after=0, seed=None):
+    """
+    녹화/재생 모드를 설정합니다. mode=None이면 해제 (실제 요청).
+    이후 새로 만들어지는 PyTrends 세션부터 적용됩니다.
+
+    Args:
+        mode: 'record' | 'replay' | None
+        path: cassette 파일 경로
+        latency: 재생 응답 지연(초)
+        throttle_rate: 재생 요청 중 429로 응답할 비율
+        retry_after: 주입한 429의 Retry-After(초)
+        seed: 429 주입 난수 시드
+    """
+    global _config
+    config = _build_config(mode, path, latency, throttle_rate, retry_after, seed)
+    with _config_lock:
+        _config = config
+
+
+def _build_config(mode, path=None, latency=0.0, throttle_rate=0.0, retry_after=0, seed=None):
+    if mode not in (None, RECORD, REPLAY):
+        raise ValueError(f"unknown replay mode: {mode}")
+
+    config = {'mode': mode}
+    if mode is not None:
+        cassette = Cassette(path)
+        stats = _Stats()
+        if mode == RECORD:
+            adapter = RecordingAdapter(cassette, stats)
+        else:
+            adapter = ReplayAdapter(cassette, stats, latency=latency, throttle_rate=throttle_rate,
+                                    retry_after=retry_after, seed=seed)
+        # 모든 세션이 adapter 하나를 공유 (429 주입 순서가 세션 수와 무관하게 시드로 결정됨)
+        config.update(cassette=cassette, stats=stats, adapter=adapter)
+    return config
+
+
+def _config_from_env():
+    value = os.environ.get('TRENDS_REPLAY', '')
+    if not value:
+        return _build_config(None)
+    mode, _, path = value.partition(':')
+    seed = os.environ.get('TRENDS_REPLAY_SEED')
+    return _build_config(
+        mode, path,
+        latency=float(os.environ.get('TRENDS_REPLAY_LATENCY', 0)),
+        throttle_rate=float(os.environ.get('TRENDS_REPLAY_429_RATE', 0)),
+        seed=int(seed) if seed else None,
+    )
+
+
+def _current():
+    """현재 설정 (처음 호출 시 환경 변수에서 읽음)"""
+    global _config
+    with _config_lock:
+        if _config is None:
+            _config = _config_from_env()
+        return _config
+
+
+def mount(session):
+    """설정된 모드의 adapter를 세션의 https:// · http:// 요청에 연결. 연결했으면 True"""
+    config = _current()
+    if config['mode'] is None:
+        return False
+    session.mount('https://', config['adapter'])
+    session.mount('http://', config['adapter'])
+    return True
+
+
+def stats():
+    """녹화·재생 횟수 (recorded, hits, misses, throttled)"""
+    config = _current()
+    if config['mode'] is None:
+        return {}
+    return dict(config['stats'].snapshot(), mode=config['mode'], responses=len(config['cassette']))
@@ -0,0 +1,128 @@
+# 백그라운드 데이터 갱신 스케줄러 (stale-while-revalidate)
+# 각 timeframe의 데이터셋을 만료 전에 백그라운드 스레드에서 다시 수집하고 원자적으로 교체합니다.
+# 페이지는 항상 마지막으로 성공한 스냅샷을 즉시 받으므로, TTL 만료 직후의 사용자도 수집 시간을 기다리지 않습니다.
+
+import threading
+from datetime import datetime, timedelta
+
+from single_flight import SingleFlight
+
+REFRESH_INTERVAL = timedelta(hours=6)    # 스냅샷 유효 기간 (기존 st.cache_data TTL과 동일)
+REFRESH_LEAD = timedelta(minutes=30)     # 만료 이 시간 전에 미리 갱신 시작
+RETRY_DELAY = timedelta(minutes=10)      # 갱신 실패 시 재시도 간격
+
+
+class RefreshScheduler:
+    """
+    키(timeframe)별 데이터셋 스냅샷을 보관하고 주기적으로 백그라운드 갱신합니다.
+
+    Args:
+        loader: loader(key) -> 스냅샷 (예: load_all_data가 반환하던 튜플)
+        keys: 관리할 키 리스트 (예: timeframe_map의 값들)
+        interval: 스냅샷 유효 기간
+        lead: 만료 전 미리 갱신을 시작할 여유 시간
+        retry_delay: 갱신 실패 또는 일부만 수집된 경우 다시 시도할 간격
+        is_complete: is_complete(스냅샷) -> bool. False이면 스냅샷은 교체하되
+                     retry_delay 뒤에 다시 갱신 (저장소가 성공한 키워드는 건너뛰므로 실패한 청크만 재요청됨)
+    """
+
+    def __init__(self, loader, keys, interval=REFRESH_INTERVAL, lead=REFRESH_LEAD,
+                 retry_delay=RETRY_DELAY, is_complete=None):
+        self.loader = loader
+        self.is_complete = is_complete
+        self.keys = list(keys)
+        self.interval = interval
+        self.lead = lead
+        self.retry_delay = retry_delay
+
+        self._lock = threading.Lock()
+        self._snapshots = {}     # key -> (스냅샷, 갱신 시각, 버전)
+        self._next_due = {key: datetime.now() for key in self.keys}
+        self._refreshing = set()
+        self._flight = SingleFlight()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """백그라운드 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='trend-refresh', daemon=True)
+            self._thread.start()
+
+    def get(self, key):
+        """
+        마지막으로 성공한 스냅샷을 즉시 반환합니다.
+        아직 한 번도 수집하지 않은 키는 (다른 호출과 병합하여) 동기적으로 수집합니다.
+        """
+        with self._lock:
+            entry = self._snapshots.get(key)
+        if entry is not None:
+            return entry[0]
+        return self._refresh(key)
+
+    def version(self, key):
+        """스냅샷이 교체될 때마다 증가하는 버전 (스냅샷 기반 파생 캐시의 키로 사용)"""
+        with self._lock:
+            entry = self._snapshots.get(key)
+        return entry[2] if entry is not None else 0
+
+    def refreshed_at(self, key):
+        with self._lock:
+            entry = self._snapshots.get(key)
+        return entry[1] if entry is not None else None
+
+    def is_refreshing(self, key):
+        with self._lock:
+            return key in self._refreshing
+
+    def request_refresh(self, key=None):
+        """지정한 키(기본값: 전체)를 즉시 백그라운드 갱신하도록 예약"""
+        with self._lock:
+            for k in ([key] if key is not None else self.keys):
+                self._next_due[k] = datetime.now()
+        self._wakeup.set()
+
+    def _refresh(self, key):
+        """loader를 실행하고 성공 시 스냅샷을 교체. 동시에 같은 키를 갱신하지 않음"""
+        def load():
+            with self._lock:
+                self._refreshing.add(key)
+            try:
+                snapshot = self.loader(key)
+                complete = self.is_complete is None or self.is_complete(snapshot)
+                with self._lock:
+                    prev = self._snapshots.get(key)
+                    version = prev[2] + 1 if prev is not None else 1
+                    self._snapshots[key] = (snapshot, datetime.now(), version)
+                    if complete:
+                        self._next_due[key] = datetime.now() + self.interval - self.lead
+                    else:
+                        self._next_due[key] = datetime.now() + self.retry_delay
+                return snapshot
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        return self._flight.do(key, load)
+
+    def _run(self):
+        while True:
+            now = datetime.now()
+            with self._lock:
+                due = [k for k in self.keys if self._next_due.get(k, now) <= now]
+
+            for key in due:
+                try:
+                    self._refresh(key)
+                except Exception as e:
+                    print(f"Error refreshing dataset {key}: {e}")
+                    with self._lock:
+                        self._next_due[key] = datetime.now() + self.retry_delay
+
+            with self._lock:
+                next_due = min(self._next_due.values(), default=datetime.now() + self.interval)
+            wait = max(1.0, (next_due - datetime.now()).total_seconds())
+            self._wakeup.wait(timeout=wait)
+            self._wakeup.clear()
@@ -0,0 +1,175 @@
+# 재사용 가능한 HTTP 세션 풀
+# 쿠키 발급(handshake)을 마친 세션을 보관해 두고 요청 단위로 빌려주어,
+# 요청마다 새 인스턴스를 만들며 쿠키 요청과 TCP/TLS 연결을 반복하지 않도록 합니다.
+
+import threading
+import time
+from contextlib import contextmanager
+
+POOL_SIZE = 4              # 동시에 존재할 수 있는 최대 세션 수
+MIN_IDLE = 2               # warm()이 미리 준비해 두는 세션 수
+SESSION_MAX_AGE = 1800.0   # 이 시간(초)이 지난 세션은 폐기하고 새로 발급 (쿠키 갱신)
+FACTORY_COOLDOWN = 30.0    # 세션 생성 실패 후 이 시간(초) 동안은 새로 만들지 않고 즉시 실패
+
+
+class SessionPool:
+    """
+    스레드 안전한 고정 크기 세션 풀.
+
+    - acquire/release 또는 session() 컨텍스트로 요청 1건 동안 세션을 독점 사용
+    - 반납 시 예외가 있었던 세션은 폐기 (다음 요청은 새 쿠키·새 연결로 시작)
+    - 빌려주기 전 상태 점검: 생성 후 max_age가 지났거나 health_check를 통과하지 못하면 폐기 후 재발급
+    - 세션 생성이 실패하면 cooldown 동안 생성 시도 없이 즉시 실패 (오프라인에서 요청마다 연결을 시도하지 않도록)
+
+    Args:
+        factory: 새 세션을 만드는 함수 (실패 시 예외)
+        size: 최대 세션 수 (모두 사용 중이면 반납될 때까지 대기)
+        min_idle: warm()이 미리 만들어 둘 세션 수
+        max_age: 세션 최대 사용 기간(초)
+        health_check: health_check(세션) -> bool (기본값: 항상 정상)
+        cooldown: 생성 실패 후 재시도까지 대기 시간(초)
+    """
+
+    def __init__(self, factory, size=POOL_SIZE, min_idle=MIN_IDLE, max_age=SESSION_MAX_AGE,
+                 health_check=None, cooldown=FACTORY_COOLDOWN):
+        self.factory = factory
+        self.size = size
+        self.min_idle = min_idle
+        self.max_age = max_age
+        self.health_check = health_check
+        self.cooldown = cooldown
+
+        self._cond = threading.Condition()
+        self._idle = []       # [(세션, 생성 시각)]
+        self._leased = {}     # id(세션) -> 생성 시각
+        self._total = 0
+        self._failed_at = None
+        self._stats = {'created': 0, 'reused': 0, 'recycled': 0, 'create_failures': 0}
+
+    def _healthy(self, session, created):
+        if time.monotonic() - created >= self.max_age:
+            return False
+        if self.health_check is None:
+            return True
+        try:
+            return bool(self.health_check(session))
+        except Exception:
+            return False
+
+    def _close(self, session):
+        close = getattr(session, 'close', None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+
+    def acquire(self, timeout=None):
+        """
+        세션을 빌려옵니다. 정상인 유휴 세션이 있으면 재사용하고, 없으면 새로 만듭니다.
+
+        Raises:
+            TimeoutError: timeout 안에 세션을 얻지 못함 (모두 사용 중)
+            RuntimeError: 최근 세션 생성이 실패하여 cooldown 중
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        expired = []
+
+        with self._cond:
+            while True:
+                session = None
+                while self._idle and session is None:
+                    candidate, created = self._idle.pop()
+                    if self._healthy(candidate, created):
+                        session = candidate
+                        self._leased[id(session)] = created
+                        self._stats['reused'] += 1
+                    else:
+                        self._total -= 1
+                        self._stats['recycled'] += 1
+                        expired.append(candidate)
+                if session is not None:
+                    break
+
+                if self._total < self.size:
+                    if self._failed_at is not None and time.monotonic() - self._failed_at < self.cooldown:
+                        raise RuntimeError("session factory failed recently; not retrying yet")
+                    self._total += 1
+                    break
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("no session available in pool")
+                self._cond.wait(remaining)
+
+        for old in expired:
+            self._close(old)
+        if session is not None:
+            return session
+        return self._create()
+
+    def _create(self):
+        """acquire에서 자리를 확보한 뒤 락 밖에서 새 세션 생성 (쿠키 요청 등 네트워크 대기)"""
+        try:
+            session = self.factory()
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._failed_at = time.monotonic()
+                self._stats['create_failures'] += 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._failed_at = None
+            self._leased[id(session)] = time.monotonic()
+            self._stats['created'] += 1
+        return session
+
+    def release(self, session, broken=False):
+        """세션을 반납합니다. broken=True이면 폐기하여 다음 요청이 새 세션을 받도록 함"""
+        with self._cond:
+            created = self._leased.pop(id(session), None)
+            keep = not broken and created is not None and self._healthy(session, created)
+            if keep:
+                self._idle.append((session, created))
+            else:
+                self._total -= 1
+                self._stats['recycled'] += 1
+            self._cond.notify()
+        if not keep:
+            self._close(session)
+
+    @contextmanager
+    def session(self, timeout=None):
+        """요청 1건 동안 세션을 빌려 쓰는 컨텍스트. 예외가 발생하면 세션을 폐기"""
+        session = self.acquire(timeout)
+        try:
+            yield session
+        except BaseException:
+            self.release(session, broken=True)
+            raise
+        else:
+            self.release(session)
+
+    def warm(self, count=None):
+        """유휴 세션이 count개(기본값: min_idle) 준비되도록 미리 생성. 준비된 유휴 세션 수 반환"""
+        count = min(self.size, count or self.min_idle)
+        sessions = []
+        try:
+            for _ in range(count):
+                sessions.append(self.acquire(timeout=0))
+        except Exception as e:
+            print(f"Error warming session pool: {e}")
+        finally:
+            for session in sessions:
+                self.release(session)
+        return len(sessions)
+
+    def stats(self):
+        """생성·재사용·폐기 횟수와 현재 유휴/사용 중 세션 수"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats['idle'] = len(self._idle)
+            stats['leased'] = len(self._leased)
+        return stats
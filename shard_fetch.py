@@ -0,0 +1,280 @@
+# 대규모 키워드 샤드 수집 작업
+# 수천 개 키워드를 샤드로 나눠 여러 워커 프로세스가 동시에 수집하고, 결과를 스냅샷 하나로 병합합니다.
+#
+# - 워커 프로세스마다 자체 PyTrends 세션(세션 풀)을 사용하고,
+#   모든 워커가 파일 기반 공용 토큰 버킷(PYTRENDS_RATE_STATE)에서 토큰을 받으므로 합산 요청 속도는 rate 이하
+#   (워커 수는 요청 왕복 지연을 가리는 용도이며, 처리량은 허용 요청 속도에 비례)
+# - 진행 상황은 출력 디렉터리의 manifest.json에 샤드 단위로 기록되어, 중단 후 다시 실행하면
+#   끝난 샤드는 건너뛰고 일부 키워드가 실패한 샤드는 그 키워드만 다시 요청
+# - 병합 결과(web.parquet · youtube.parquet)는 EDUTREND_DATA_SOURCE=file:<출력 디렉터리>로 앱에서 사용
+#
+# 사용 예:
+#   python shard_fetch.py --keywords-file catalogue.txt --out data/shards/catalogue --workers 4 --rate 1.0
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from data_sources import SIGNALS, SNAPSHOT_FORMATS, read_frame, write_frame, write_snapshot
+from keyword_list import KEYWORDS
+from trends import (
+    CHUNK_SIZE, PYTRENDS_BURST, PYTRENDS_RATE_PER_SEC, PYTRENDS_RATE_STATE,
+    configure_rate_limiter, fetch_daily_history, fetch_trend_data, fetch_youtube_trend_data,
+)
+
+SHARD_SIZE = 50          # 샤드당 키워드 수 (CHUNK_SIZE의 배수로 맞춰 요청 단위가 샤드 경계를 넘지 않도록 함)
+WORKERS = 4              # 워커 프로세스 수
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+PENDING = 'pending'
+DONE = 'done'
+PARTIAL = 'partial'      # 일부 키워드 수집 실패 (다시 실행하면 실패한 키워드만 요청)
+
+
+def load_keywords(path=None):
+    """키워드 파일(한 줄에 하나, '#'으로 시작하는 줄은 주석)을 읽기. path가 없으면 keyword_list.KEYWORDS"""
+    if path is None:
+        return list(KEYWORDS)
+    keywords = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and line not in keywords:
+                keywords.append(line)
+    return keywords
+
+
+def split_shards(keywords, shard_size=SHARD_SIZE):
+    """키워드를 샤드로 분할 (샤드 크기는 CHUNK_SIZE 배수로 올림)"""
+    shard_size = max(CHUNK_SIZE, -(-shard_size // CHUNK_SIZE) * CHUNK_SIZE)
+    return [keywords[i:i + shard_size] for i in range(0, len(keywords), shard_size)]
+
+
+def _task_id(signal, shard):
+    return f"{signal}-{shard:05d}"
+
+
+def _new_manifest(keywords, timeframe, signals, daily, shard_size):
+    tasks = {}
+    for shard, shard_keywords in enumerate(split_shards(keywords, shard_size)):
+        for signal in signals:
+            task_id = _task_id(signal, shard)
+            tasks[task_id] = {
+                'signal': signal,
+                'shard': shard,
+                'keywords': shard_keywords,
+                'status': PENDING,
+                'missing': shard_keywords,
+                'attempts': 0,
+                'file': os.path.join('shards', f"{task_id}.parquet"),
+                'finished_at': None,
+            }
+    return {
+        'version': MANIFEST_VERSION,
+        'timeframe': timeframe,
+        'signals': list(signals),
+        'daily': daily,
+        'keywords': keywords,
+        'created_at': datetime.now().isoformat(),
+        'tasks': tasks,
+    }
+
+
+def read_manifest(directory):
+    """출력 디렉터리의 진행 기록 (없으면 None)"""
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_manifest(directory, manifest):
+    """임시 파일에 쓴 뒤 교체하여 중단되어도 manifest가 깨지지 않도록 저장"""
+    path = os.path.join(directory, MANIFEST_NAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+def _init_worker(rate, burst, state_path):
+    # 모든 워커가 같은 상태 파일 · 같은 속도의 토큰 버킷을 사용 (합산 속도 = rate)
+    configure_rate_limiter(rate, burst, state_path)
+
+
+def _fetch_task(signal, keywords, timeframe, daily, path):
+    """
+    워커 프로세스에서 샤드 하나(signal 하나)를 수집해 path에 저장합니다.
+    path에 이전 실행의 일부 결과가 있으면 이번에 받은 키워드를 합쳐서 저장합니다.
+
+    Returns:
+        list: 이번 실행 후 path에 들어 있는 키워드
+    """
+    fetch_fn = fetch_youtube_trend_data if signal == 'youtube' else fetch_trend_data
+    if daily:
+        data = fetch_daily_history(fetch_fn, keywords, timeframe)
+    else:
+        data = fetch_fn(keywords, timeframe)
+
+    if os.path.exists(path):
+        previous = read_frame(path)
+        if data is None or data.empty:
+            data = previous
+        else:
+            new_cols = [kw for kw in data.columns if kw not in previous.columns]
+            data = pd.concat([previous, data[new_cols]], axis=1)
+
+    if data is None or data.empty:
+        return []
+    write_frame(data, path)
+    return list(data.columns)
+
+
+def run(keywords, directory, timeframe='today 12-m', signals=SIGNALS, daily=False,
+        shard_size=SHARD_SIZE, workers=WORKERS, rate=PYTRENDS_RATE_PER_SEC, burst=PYTRENDS_BURST,
+        state_path=PYTRENDS_RATE_STATE, fmt='parquet'):
+    """
+    키워드 전체를 샤드 단위로 수집하고 스냅샷으로 병합합니다.
+    directory에 같은 설정의 manifest가 있으면 이어서 실행합니다.
+
+    Args:
+        keywords: 키워드 리스트
+        directory: 출력 디렉터리 (manifest.json, shards/, 병합 스냅샷)
+        timeframe: PyTrends timeframe 문자열
+        signals: 수집할 신호 ('web', 'youtube')
+        daily: True이면 긴 기간도 일별 구간을 이어 붙여 수집
+        shard_size: 샤드당 키워드 수
+        workers: 워커 프로세스 수
+        rate, burst: 모든 워커 합산 요청 속도 (공용 토큰 버킷)
+        state_path: 공용 토큰 버킷 상태 파일
+        fmt: 병합 스냅샷 형식 ('parquet' | 'csv')
+
+    Returns:
+        dict: manifest (작업별 상태)
+    """
+    unknown = [signal for signal in signals if signal not in SIGNALS]
+    if unknown:
+        raise ValueError(f"unknown signals: {unknown}")
+
+    os.makedirs(os.path.join(directory, 'shards'), exist_ok=True)
+    manifest = read_manifest(directory)
+    if manifest is None:
+        manifest = _new_manifest(keywords, timeframe, signals, daily, shard_size)
+        _write_manifest(directory, manifest)
+    elif (manifest['keywords'] != keywords or manifest['timeframe'] != timeframe
+          or manifest['signals'] != list(signals) or manifest['daily'] != daily):
+        raise ValueError(f"{directory} holds a job with different settings; use a new output directory")
+
+    pending = {task_id: task for task_id, task in manifest['tasks'].items() if task['status'] != DONE}
+    total = len(manifest['tasks'])
+    print(f"{total - len(pending)}/{total} shard tasks already done; fetching {len(pending)} "
+          f"with {workers} workers at {rate:g} req/s")
+
+    started = time.monotonic()
+    fetched_keywords = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(rate, burst, state_path)) as executor:
+        futures = {
+            executor.submit(_fetch_task, task['signal'], task['missing'], timeframe, daily,
+                            os.path.join(directory, task['file'])): task_id
+            for task_id, task in pending.items()
+        }
+        try:
+            for future in as_completed(futures):
+                task_id = futures[future]
+                task = manifest['tasks'][task_id]
+                task['attempts'] += 1
+                try:
+                    received = set(future.result())
+                except Exception as e:
+                    print(f"Error fetching shard {task_id}: {e}")
+                    received = {kw for kw in task['keywords'] if kw not in task['missing']}
+
+                fetched_keywords += len([kw for kw in task['missing'] if kw in received])
+                task['missing'] = [kw for kw in task['keywords'] if kw not in received]
+                task['status'] = PARTIAL if task['missing'] else DONE
+                task['finished_at'] = datetime.now().isoformat()
+                _write_manifest(directory, manifest)
+
+                done = sum(t['status'] == DONE for t in manifest['tasks'].values())
+                elapsed = time.monotonic() - started
+                print(f"[{done}/{total}] {task_id}: {len(task['keywords']) - len(task['missing'])}"
+                      f"/{len(task['keywords'])} keywords ({fetched_keywords / max(elapsed, 1e-9):.1f} keywords/s)")
+        except KeyboardInterrupt:
+            # 끝난 샤드는 manifest에 기록되어 있으므로 다시 실행하면 이어서 진행
+            for future in futures:
+                future.cancel()
+            raise
+
+    merge_shards(directory, fmt=fmt)
+    return manifest
+
+
+def merge_shards(directory, fmt='parquet'):
+    """
+    샤드 결과를 키워드 순서대로 이어 붙여 스냅샷(web.* · youtube.*)으로 저장합니다.
+    수집하지 못한 키워드는 빠진 채로 병합됩니다.
+
+    Returns:
+        list: 저장한 파일 경로
+    """
+    if fmt not in SNAPSHOT_FORMATS:
+        raise ValueError(f"unknown snapshot format: {fmt}")
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"no {MANIFEST_NAME} in {directory}")
+
+    frames = {}
+    for signal in manifest['signals']:
+        tasks = sorted((t for t in manifest['tasks'].values() if t['signal'] == signal),
+                       key=lambda t: t['shard'])
+        parts = []
+        for task in tasks:
+            path = os.path.join(directory, task['file'])
+            if not os.path.exists(path):
+                continue
+            # 이어서 실행하며 뒤에 붙은 키워드도 원래 순서로
+            df = read_frame(path)
+            parts.append(df[[kw for kw in task['keywords'] if kw in df.columns]])
+        if parts:
+            frames[signal] = pd.concat(parts, axis=1).sort_index()
+    return write_snapshot(frames, directory, fmt=fmt)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch Google Trends for a large keyword list in shards")
+    parser.add_argument('--keywords-file', help="one keyword per line (default: keyword_list.KEYWORDS)")
+    parser.add_argument('--out', required=True, help="output directory (rerun to resume)")
+    parser.add_argument('--timeframe', default='today 12-m')
+    parser.add_argument('--signals', nargs='+', default=list(SIGNALS), choices=SIGNALS)
+    parser.add_argument('--daily', action='store_true', help="stitch daily windows for long timeframes")
+    parser.add_argument('--shard-size', type=int, default=SHARD_SIZE)
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--rate', type=float, default=PYTRENDS_RATE_PER_SEC, help="requests/s across all workers")
+    parser.add_argument('--burst', type=float, default=PYTRENDS_BURST)
+    parser.add_argument('--format', default='parquet', choices=SNAPSHOT_FORMATS)
+    parser.add_argument('--merge-only', action='store_true', help="only merge finished shards")
+    args = parser.parse_args(argv)
+
+    if args.merge_only:
+        paths = merge_shards(args.out, fmt=args.format)
+    else:
+        manifest = run(load_keywords(args.keywords_file), args.out, timeframe=args.timeframe,
+                       signals=args.signals, daily=args.daily, shard_size=args.shard_size,
+                       workers=args.workers, rate=args.rate, burst=args.burst, fmt=args.format)
+        incomplete = [task_id for task_id, task in manifest['tasks'].items() if task['status'] != DONE]
+        if incomplete:
+            print(f"{len(incomplete)} shard tasks incomplete; rerun the same command to retry them")
+        paths = [os.path.join(args.out, f"{signal}.{args.format}") for signal in args.signals]
+    print("Snapshot:", ', '.join(p for p in paths if os.path.exists(p)))
+
+
+if __name__ == '__main__':
+    main()
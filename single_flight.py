@@ -0,0 +1,129 @@
+# 프로세스 전역 single-flight (요청 병합)
+# 같은 데이터를 동시에 요청한 여러 Streamlit 세션 중 첫 호출만 실제로 수집하고,
+# 나머지는 같은 Future의 결과를 기다려 Google 요청이 중복되지 않도록 합니다.
+
+import threading
+from concurrent.futures import Future
+
+import pandas as pd
+
+
+class SingleFlight:
+    """
+    키 단위 single-flight.
+    같은 키로 진행 중인 호출이 있으면 새로 실행하지 않고 그 결과(또는 예외)를 공유합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._calls[key] = future
+
+        if is_leader:
+            try:
+                future.set_result(fn())
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._calls[key]
+
+        return future.result()
+
+
+class KeywordSingleFlight:
+    """
+    키워드 집합 단위 single-flight.
+
+    같은 scope(timeframe, gprop, geo 등)에서 진행 중인 수집과 키워드가 겹치면
+    겹치는 키워드는 그 수집 결과를 기다리고, 겹치지 않는 키워드만 새로 수집합니다.
+    예) 세션 A가 30개 키워드를 수집 중일 때 세션 B가 그중 5개를 요청하면 B는 추가 요청 없이 대기.
+
+    각 호출은 자신의 수집을 등록하기 전에 이미 진행 중이던 수집만 기다리므로 교착 상태가 생기지 않습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}  # scope -> [(frozenset(keywords), Future)]
+
+    def fetch(self, keywords, scope, fetch_fn):
+        """
+        Args:
+            keywords: 요청 키워드 리스트
+            scope: 요청을 구분하는 키 (예: (timeframe, gprop, geo))
+            fetch_fn: fetch_fn(keywords) -> DataFrame (날짜 인덱스, 키워드 컬럼)
+
+        Returns:
+            DataFrame: 요청한 키워드 중 수집된 컬럼 (요청 순서 유지)
+        """
+        waits = []
+        covered = set()
+        own = None
+
+        with self._lock:
+            for flight_keywords, future in self._inflight.get(scope, []):
+                overlap = [kw for kw in keywords if kw in flight_keywords and kw not in covered]
+                if overlap:
+                    waits.append(future)
+                    covered.update(overlap)
+
+            remaining = [kw for kw in keywords if kw not in covered]
+            if remaining:
+                own = (frozenset(remaining), Future())
+                self._inflight.setdefault(scope, []).append(own)
+
+        frames = []
+        if own is not None:
+            try:
+                own[1].set_result(fetch_fn(remaining))
+            except Exception as e:
+                own[1].set_exception(e)
+            finally:
+                with self._lock:
+                    self._inflight[scope].remove(own)
+                    if not self._inflight[scope]:
+                        del self._inflight[scope]
+            frames.append(own[1].result())
+
+        for future in waits:
+            try:
+                frames.append(future.result())
+            except Exception as e:
+                # 다른 세션의 수집 실패는 해당 키워드 누락으로 처리 (청크 실패와 동일)
+                print(f"Error in coalesced fetch {scope}: {e}")
+
+        return _combine_keyword_frames(frames, keywords)
+
+
+def _combine_keyword_frames(frames, keywords):
+    """
+    여러 결과에서 요청한 키워드만 골라 하나의 DataFrame으로 병합.
+    각 결과의 attrs['provenance'](키워드별 출처)도 요청한 키워드 기준으로 합칩니다.
+    """
+    combined = pd.DataFrame()
+    provenance = {}
+    for data in frames:
+        if data is None:
+            continue
+        for kw, status in data.attrs.get('provenance', {}).items():
+            if kw in keywords and provenance.get(kw, 'missing') == 'missing':
+                provenance[kw] = status
+        if data.empty:
+            continue
+        cols = [c for c in data.columns if c in keywords and c not in combined.columns]
+        if not cols:
+            continue
+        combined = data[cols] if combined.empty else pd.concat([combined, data[cols]], axis=1)
+
+    if not combined.empty:
+        combined = combined[[kw for kw in keywords if kw in combined.columns]]
+    if provenance:
+        combined.attrs['provenance'] = provenance
+    return combined
@@ -0,0 +1,135 @@
+# 패널 단위 정규화 · 평활(smoothing)
+# (날짜 × 키워드) 패널 전체를 NumPy 배열 하나로 처리합니다.
+# 단순 이동평균(SMA) · 중앙 이동평균은 누적합 한 번으로 모든 윈도우를 계산하고,
+# 지수 이동평균(EMA)은 가중 누적합으로 계산하므로 윈도우 · 키워드 수만큼 rolling을 반복하지 않습니다.
+# 결과는 pandas rolling(min_periods=1).mean() · rolling(center=True) · ewm(span).mean()과 같습니다.
+
+import numpy as np
+import pandas as pd
+
+# EMA 가중 누적합을 다시 기준화하는 간격의 상한 (가중치 (1-α)^-k가 1e100을 넘지 않도록)
+_EMA_SCALE_LIMIT = 100 * np.log(10)
+
+
+def _unique_columns(df):
+    """중복 컬럼은 첫 번째 컬럼 사용"""
+    return df.loc[:, ~df.columns.duplicated()]
+
+
+def normalize_panel(df, method='minmax'):
+    """
+    패널 전체를 한 번의 브로드캐스트 연산으로 정규화합니다 (Min-Max Scaling: 0-100 범위).
+    모든 값이 같은 컬럼은 50(중간값), 값이 하나도 없는 컬럼은 NaN입니다.
+
+    Args:
+        df: pandas DataFrame (날짜 인덱스, 키워드 컬럼)
+        method: 정규화 방법 ('minmax' 지원)
+
+    Returns:
+        DataFrame: 정규화된 새로운 DataFrame
+    """
+    if method != 'minmax':
+        raise ValueError(f"unknown normalization method: {method}")
+    if df.empty:
+        return df
+
+    df = _unique_columns(df)
+    values = df.to_numpy(dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        low = np.where(np.isnan(values), np.inf, values).min(axis=0)
+        high = np.where(np.isnan(values), -np.inf, values).max(axis=0)
+        span = high - low
+        normalized = (values - low) / span * 100
+    normalized[:, span == 0] = 50.0
+    normalized[:, np.isinf(low)] = np.nan
+    return pd.DataFrame(normalized, index=df.index, columns=df.columns)
+
+
+def _window_sums(cum, count, start, end):
+    """행 t마다 [start[t], end[t]) 구간의 합과 유효 개수 (cum · count는 앞에 0 행이 붙은 누적합)"""
+    total = cum[end] - cum[start]
+    n = count[end] - count[start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / n
+    mean[n == 0] = np.nan
+    return mean, n
+
+
+def _ema(values, valid, span):
+    """
+    ewm(span=span, adjust=True).mean()과 같은 지수 이동평균을 가중 누적합으로 계산합니다.
+    y[t] = Σ β^(t-j) x[j] / Σ β^(t-j) (β = 1 - α, NaN은 분자 · 분모 모두 제외)
+    가중치 β^-j가 커지지 않도록 일정 행마다 기준점을 옮겨 가며 누적합을 이어 붙입니다.
+    """
+    alpha = 2.0 / (span + 1.0)
+    log_beta = np.log1p(-alpha)
+    block = max(int(_EMA_SCALE_LIMIT / -log_beta), 1) if log_beta < 0 else len(values)
+    result = np.empty_like(values)
+    num = np.zeros(values.shape[1])
+    den = np.zeros(values.shape[1])
+    for start in range(0, len(values), block):
+        end = min(start + block, len(values))
+        k = np.arange(end - start, dtype=float)[:, None]
+        grow = np.exp(-log_beta * k)   # β^-k
+        decay = np.exp(log_beta * k)   # β^k
+        # 블록 시작 전 누적값은 β^(k+1)만큼 감쇠, 블록 안의 값은 β^(k-i) 가중
+        block_num = np.cumsum(values[start:end] * grow, axis=0) * decay + num * decay * np.exp(log_beta)
+        block_den = np.cumsum(valid[start:end] * grow, axis=0) * decay + den * decay * np.exp(log_beta)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result[start:end] = block_num / block_den
+        num, den = block_num[-1], block_den[-1]
+    result[np.cumsum(valid, axis=0) == 0] = np.nan
+    return result
+
+
+def smooth_panel(df, sma=(7,), ema=(), centered=(), min_periods=1):
+    """
+    여러 평활 결과를 한 번에 계산합니다.
+    SMA · 중앙 이동평균은 같은 누적합 하나에서 윈도우마다 차분만 하고, EMA는 가중 누적합으로 계산합니다.
+
+    Args:
+        df: pandas DataFrame (날짜 인덱스, 키워드 컬럼)
+        sma: 단순 이동평균 윈도우 목록 (rolling(window, min_periods).mean()과 동일)
+        ema: 지수 이동평균 span 목록 (ewm(span=span).mean()과 동일)
+        centered: 중앙 이동평균 윈도우 목록 (rolling(window, center=True, min_periods).mean()과 동일)
+        min_periods: SMA · 중앙 이동평균의 최소 유효 데이터 수
+
+    Returns:
+        dict: {('sma', 7): DataFrame, ('ema', 14): DataFrame, ('centered', 7): DataFrame, ...}
+    """
+    df = _unique_columns(df)
+    values = df.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    n_rows = len(values)
+
+    results = {}
+    if sma or centered:
+        # 앞에 0 행을 붙인 누적합: 구간 [a, b)의 합 = cum[b] - cum[a]
+        zero = np.zeros((1, values.shape[1]))
+        cum = np.concatenate([zero, np.cumsum(filled, axis=0)])
+        count = np.concatenate([zero, np.cumsum(valid, axis=0)])
+        rows = np.arange(n_rows)
+
+        windows = [('sma', w, rows - w + 1, rows + 1) for w in sma]
+        windows += [('centered', w, rows - w // 2, rows - w // 2 + w) for w in centered]
+        for kind, window, start, end in windows:
+            if window < 1:
+                raise ValueError(f"window must be positive: {window}")
+            mean, n = _window_sums(cum, count, np.clip(start, 0, n_rows), np.clip(end, 0, n_rows))
+            mean[n < min_periods] = np.nan
+            results[(kind, window)] = pd.DataFrame(mean, index=df.index, columns=df.columns)
+
+    for span in ema:
+        if span < 1:
+            raise ValueError(f"span must be at least 1: {span}")
+        results[('ema', span)] = pd.DataFrame(_ema(filled, valid.astype(float), span),
+                                              index=df.index, columns=df.columns)
+    return results
+
+
+def moving_average(df, window=7, min_periods=1):
+    """단순 이동평균 하나 (smooth_panel의 단축 함수)"""
+    if df.empty:
+        return df
+    return smooth_panel(df, sma=(window,), min_periods=min_periods)[('sma', window)]
@@ -0,0 +1,104 @@
+# 시드 고정 합성 트렌드 데이터 생성기
+# 데모 모드와 대규모 벤치마크용으로 (날짜 × 키워드) 패널 전체를 NumPy 배열 하나로 생성합니다.
+# 같은 시드 · 같은 인자라면 항상 같은 데이터가 나옵니다.
+
+import numpy as np
+import pandas as pd
+
+# 트렌드 유형
+#   trend      : 기울기를 slopes 중에서 고르는 직선 추세 (기존 Mock 데이터와 같은 형태)
+#   growth     : 꾸준한 상승
+#   decay      : 꾸준한 하락
+#   spike      : 임의 시점의 일시적 급등 후 원래 수준으로 복귀
+#   seasonal   : 주간 · 연간 주기 변동
+#   zero_heavy : 대부분 0이고 가끔만 검색되는 희소 키워드
+ARCHETYPES = ('trend', 'growth', 'decay', 'spike', 'seasonal', 'zero_heavy')
+
+DEFAULT_SLOPES = (-0.1, 0.0, 0.2, 0.5)   # trend 유형의 기울기 후보 (하락, 정체, 상승, 급상승)
+
+
+def _archetype_weights(archetypes):
+    """유형 목록(균등) 또는 {유형: 가중치}를 (이름 배열, 확률 배열)로 변환"""
+    if isinstance(archetypes, dict):
+        names = list(archetypes)
+        weights = np.array([archetypes[name] for name in names], dtype=float)
+    else:
+        names = list(archetypes)
+        weights = np.ones(len(names))
+
+    unknown = [name for name in names if name not in ARCHETYPES]
+    if unknown:
+        raise ValueError(f"unknown archetypes: {unknown}")
+    return names, weights / weights.sum()
+
+
+def generate_panel(keywords=None, n_keywords=None, days=90, archetypes=ARCHETYPES, seed=None,
+                   end=None, index=None, base_range=(10, 50), noise=5, slopes=DEFAULT_SLOPES,
+                   clip=True):
+    """
+    합성 트렌드 패널을 생성합니다.
+
+    Args:
+        keywords: 키워드(컬럼) 리스트 (없으면 n_keywords개의 'keyword_0000' 형식 이름)
+        n_keywords: keywords가 없을 때 생성할 키워드 수
+        days: 일수 (index를 넘기면 무시)
+        archetypes: 사용할 트렌드 유형 목록 또는 {유형: 가중치}
+        seed: 난수 시드 (None이면 매번 다른 데이터)
+        end: 마지막 날짜 (기본값: 오늘 자정)
+        index: 사용할 날짜 인덱스 (실제 데이터와 같은 인덱스로 맞출 때)
+        base_range: 기준 관심도 범위 [low, high]
+        noise: 일별 정수 노이즈 폭 (±noise)
+        slopes: trend 유형의 기울기 후보
+        clip: 0-100 범위로 자를지 여부
+
+    Returns:
+        DataFrame: 날짜 인덱스(자정 기준 일별), 키워드 컬럼
+    """
+    if keywords is None:
+        keywords = [f"keyword_{i:04d}" for i in range(n_keywords or 0)]
+    keywords = list(keywords)
+
+    if index is None:
+        end = pd.Timestamp(end or pd.Timestamp.now()).normalize()
+        index = pd.date_range(end=end, periods=days, freq='D')
+    n_days, n_cols = len(index), len(keywords)
+
+    rng = np.random.default_rng(seed)
+    names, probs = _archetype_weights(archetypes)
+    kinds = rng.choice(len(names), size=n_cols, p=probs)
+
+    t = np.arange(n_days, dtype=float)[:, None]
+    values = rng.integers(base_range[0], base_range[1], size=n_cols, endpoint=True).astype(float)
+    values = np.repeat(values[None, :], n_days, axis=0)   # 결과 배열 (이후 제자리 연산)
+    if noise:
+        values += rng.integers(-noise, noise, size=values.shape, endpoint=True)
+
+    for i, name in enumerate(names):
+        cols = np.flatnonzero(kinds == i)
+        if len(cols) == 0:
+            continue
+        k = len(cols)
+
+        if name == 'trend':
+            values[:, cols] += t * rng.choice(np.asarray(slopes, dtype=float), size=k)
+        elif name == 'growth':
+            values[:, cols] += t * rng.uniform(0.2, 0.8, size=k) * (90 / max(n_days, 1))
+        elif name == 'decay':
+            values[:, cols] -= t * rng.uniform(0.2, 0.6, size=k) * (90 / max(n_days, 1))
+        elif name == 'spike':
+            center = rng.uniform(0.2, 0.95, size=k) * n_days
+            width = rng.uniform(2, 7, size=k)
+            height = rng.uniform(30, 80, size=k)
+            values[:, cols] += height * np.exp(-0.5 * ((t - center) / width) ** 2)
+        elif name == 'seasonal':
+            weekly = rng.uniform(3, 10, size=k) * np.sin(2 * np.pi * t / 7 + rng.uniform(0, 2 * np.pi, size=k))
+            yearly = rng.uniform(5, 20, size=k) * np.sin(2 * np.pi * t / 365 + rng.uniform(0, 2 * np.pi, size=k))
+            values[:, cols] += weekly + yearly
+        elif name == 'zero_heavy':
+            # 노이즈까지 더한 값에 마스크를 곱해 검색된 날(5-30%)만 남김
+            values[:, cols] *= 0.3 * (rng.random((n_days, k)) < rng.uniform(0.05, 0.3, size=k))
+
+    if clip:
+        np.clip(values, 0, 100, out=values)
+
+    return pd.DataFrame(values, index=index, columns=keywords, copy=False)
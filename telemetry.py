@@ -0,0 +1,323 @@
+# 수집 계층 계측 (telemetry)
+# PyTrends 요청의 지연 시간 · 응답 크기 · 상태 코드, 토큰 대기 시간, 청크 성공률, 캐시 적중률을 집계하여
+# Prometheus 텍스트 형식(로컬 포트)과 순환(rolling) JSONL 파일로 내보냅니다.
+#
+# 환경 변수:
+#   EDUTREND_METRICS_PORT=9108                 http://127.0.0.1:9108/metrics 에서 Prometheus 텍스트 제공
+#   EDUTREND_METRICS_LOG=data/metrics.jsonl    요청 · 청크 이벤트를 한 줄씩 기록 (크기 초과 시 .1 .2 ...로 순환)
+
+import json
+import os
+import threading
+from bisect import bisect_left
+from datetime import datetime
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6)
+
+LOG_MAX_BYTES = 5 * 1024 * 1024   # JSONL 파일 하나의 최대 크기
+LOG_BACKUPS = 3                   # 보관할 이전 파일 수 (metrics.jsonl.1 ~ .3)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """라벨별 누적 카운터"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {} if self.labels else {(): 0}   # 라벨 없는 카운터는 0부터 노출
+
+    def _key(self, labels):
+        return tuple((name, str(labels[name])) for name in self.labels)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in sorted(self._values.items())]
+
+
+class Histogram(Counter):
+    """라벨별 누적 히스토그램 (Prometheus _bucket · _sum · _count)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0}
+            state['counts'][bisect_left(self.buckets, value)] += 1
+            state['sum'] += value
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), state['counts']):
+                    cumulative += count
+                    samples.append((f"{self.name}_bucket", key + (('le', _format_value(bound)),), cumulative))
+                samples.append((f"{self.name}_sum", key, state['sum']))
+                samples.append((f"{self.name}_count", key, cumulative))
+        return samples
+
+
+class Registry:
+    """
+    메트릭 모음. render()는 Prometheus 텍스트 형식을 반환합니다.
+    register_collector로 등록한 함수는 render 시점에 호출되어 다른 모듈의 집계값(재시도 횟수, 세션 수 등)을 추가합니다.
+    collector() -> [(이름, 'counter' | 'gauge', 설명, [({라벨}, 값), ...]), ...]
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text, labels=()):
+        return self._add(Counter(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(name, help_text, labels, buckets))
+
+    def _add(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for collector in collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                print(f"Error collecting metrics: {e}")
+                continue
+            for name, kind, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(sorted(labels.items()))} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+class EventLog:
+    """
+    이벤트를 JSONL로 기록하는 순환 로그.
+    파일이 max_bytes를 넘으면 path.1로 옮기고 (기존 .1은 .2로 ...) 새 파일에 이어서 기록합니다.
+    """
+
+    def __init__(self, path, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def write(self, event):
+        line = json.dumps(event, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            if os.path.exists(self.path) and os.path.getsize(self.path) + len(line) > self.max_bytes:
+                self._rotate()
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.counter(
+    'edutrend_pytrends_requests_total', 'Google Trends HTTP requests by endpoint and status',
+    ('endpoint', 'status'))
+REQUEST_SECONDS = REGISTRY.histogram(
+    'edutrend_pytrends_request_seconds', 'Google Trends HTTP request latency', ('endpoint',))
+RESPONSE_BYTES = REGISTRY.histogram(
+    'edutrend_pytrends_response_bytes', 'Google Trends response payload size', ('endpoint',), SIZE_BUCKETS)
+RATE_LIMIT_WAIT = REGISTRY.counter(
+    'edutrend_rate_limit_wait_seconds_total', 'Time spent waiting for the shared token bucket')
+CHUNKS = REGISTRY.counter(
+    'edutrend_fetch_chunks_total', 'Keyword chunks by outcome (ok, empty, error, circuit_open, deadline)',
+    ('gprop', 'outcome'))
+CACHE_REQUESTS = REGISTRY.counter(
+    'edutrend_cache_requests_total', 'Cached loader calls by result (hit, miss)', ('cache', 'result'))
+
+_log = None
+_log_lock = threading.Lock()
+_server = None
+_server_lock = threading.Lock()
+_local = threading.local()
+
+
+def _event_log():
+    """환경 변수 EDUTREND_METRICS_LOG의 이벤트 로그 (설정하지 않았으면 False)"""
+    global _log
+    with _log_lock:
+        if _log is None:
+            path = os.environ.get('EDUTREND_METRICS_LOG', '')
+            _log = EventLog(path) if path else False
+        return _log
+
+
+def configure_log(path=None, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS):
+    """이벤트 로그 파일을 지정합니다 (path=None이면 기록하지 않음)"""
+    global _log
+    with _log_lock:
+        _log = EventLog(path, max_bytes, backups) if path else False
+
+
+def event(kind, **fields):
+    """이벤트 로그에 한 줄 기록 (로그를 설정하지 않았으면 무시)"""
+    log = _event_log()
+    if not log:
+        return
+    try:
+        log.write({'ts': datetime.now().isoformat(timespec='milliseconds'), 'event': kind, **fields})
+    except OSError as e:
+        print(f"Error writing metrics log: {e}")
+
+
+def record_request(endpoint, status, seconds, size):
+    """HTTP 요청 1건 (status는 상태 코드 또는 예외 이름)"""
+    REQUESTS.inc(endpoint=endpoint, status=status)
+    REQUEST_SECONDS.observe(seconds, endpoint=endpoint)
+    RESPONSE_BYTES.observe(size, endpoint=endpoint)
+    event('request', endpoint=endpoint, status=status, seconds=round(seconds, 4), bytes=size)
+
+
+def record_rate_wait(seconds):
+    """토큰 버킷 대기 시간 (요청 속도 한도에 얼마나 가까운지)"""
+    if seconds > 0:
+        RATE_LIMIT_WAIT.inc(seconds)
+
+
+def record_chunk(gprop, outcome, keywords, seconds):
+    """청크(키워드 최대 5개) 수집 결과 1건"""
+    CHUNKS.inc(gprop=gprop or 'web', outcome=outcome)
+    event('chunk', gprop=gprop or 'web', outcome=outcome, keywords=len(keywords), seconds=round(seconds, 4))
+
+
+def count_cache(name):
+    """
+    st.cache_data로 감싼 함수의 적중/미스를 집계하는 데코레이터 (cache_data 바깥에 적용).
+    캐시된 함수 본문에서 record_cache_miss()를 호출하면 미스, 호출되지 않으면 적중으로 기록합니다.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            stack = _local.__dict__.setdefault('cache_stack', [])
+            stack.append(False)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                missed = stack.pop()
+                CACHE_REQUESTS.inc(cache=name, result='miss' if missed else 'hit')
+        if hasattr(fn, 'clear'):
+            wrapper.clear = fn.clear
+        return wrapper
+    return decorator
+
+
+def record_cache_miss():
+    """count_cache로 감싼 캐시 함수의 본문이 실행됨 (캐시 미스)"""
+    stack = getattr(_local, 'cache_stack', None)
+    if stack:
+        stack[-1] = True
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_http_server(port=None, addr='127.0.0.1'):
+    """
+    /metrics 엔드포인트를 백그라운드 스레드로 시작합니다 (프로세스당 한 번, 이후 호출은 무시).
+
+    Args:
+        port: 포트 (기본값: 환경 변수 EDUTREND_METRICS_PORT, 없으면 시작하지 않음)
+
+    Returns:
+        ThreadingHTTPServer 또는 None
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server or None
+        port = port or os.environ.get('EDUTREND_METRICS_PORT')
+        if not port:
+            return None
+        try:
+            _server = ThreadingHTTPServer((addr, int(port)), _MetricsHandler)
+        except OSError as e:
+            # Streamlit 재실행마다 다시 시도하지 않도록 실패도 기록
+            print(f"Error starting metrics endpoint on port {port}: {e}")
+            _server = False
+            return None
+        threading.Thread(target=_server.serve_forever, name='metrics-endpoint', daemon=True).start()
+        return _server
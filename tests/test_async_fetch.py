@@ -0,0 +1,133 @@
+# async_fetch 엔진을 로컬 stub 서버(aiohttp.web)에 연결해
+# PyTrends 경로(fetch_trend_data)와 같은 형태의 DataFrame을 만드는지 확인합니다.
+
+import asyncio
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytrends.request
+from aiohttp import web
+from pytrends.request import TrendReq
+
+from async_fetch import fetch_trends_async
+from rate_limit import TokenBucket
+from trends import fetch_trend_data
+
+KEYWORDS = ['파이썬 강의', '데이터 분석', 'SQL 기초', '엑셀 자격증', 'AI 교육', '코딩 테스트', 'UX 디자인']
+DAYS = 30
+START = 1_700_006_400  # 2023-11-15 00:00 UTC
+
+
+def _series(keyword, gprop):
+    """키워드 · gprop마다 고정된 0-100 관심도"""
+    seed = sum(keyword.encode()) + (7 if gprop else 0)
+    return [(seed * (day + 3)) % 101 for day in range(DAYS)]
+
+
+def _timeline(items, gprop):
+    keywords = [item['keyword'] for item in items]
+    columns = [_series(kw, gprop) for kw in keywords]
+    timeline = []
+    for day in range(DAYS):
+        point = {'time': str(START + day * 86400), 'formattedTime': '', 'value': [col[day] for col in columns],
+                 'hasData': [True] * len(keywords), 'formattedValue': [str(col[day]) for col in columns]}
+        if day == DAYS - 1:
+            point['isPartial'] = True
+        timeline.append(point)
+    return {'default': {'timelineData': timeline, 'averages': []}}
+
+
+async def _cookie(request):
+    response = web.Response(text='ok')
+    response.set_cookie('NID', 'stub')
+    return response
+
+
+async def _explore(request):
+    req = json.loads(request.query['req'])
+    widget = {'id': 'TIMESERIES', 'token': 'stub-token',
+              'request': {'comparisonItem': req['comparisonItem'], 'property': req.get('property', '')}}
+    return web.Response(text=")]}'" + json.dumps({'widgets': [widget]}), content_type='application/json')
+
+
+async def _multiline(request):
+    req = json.loads(request.query['req'])
+    payload = _timeline(req['comparisonItem'], req.get('property', ''))
+    return web.Response(text=")]}'," + json.dumps(payload), content_type='application/json')
+
+
+@pytest.fixture
+def stub_server():
+    """별도 스레드의 이벤트 루프에서 explore · multiline stub 서버 실행. 기본 URL 반환"""
+    app = web.Application()
+    app.router.add_get('/explore/', _cookie)
+    app.router.add_post('/api/explore', _explore)
+    app.router.add_get('/api/widgetdata/multiline', _multiline)
+
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    loop.run_until_complete(site.start())
+    port = site._server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+
+@pytest.fixture
+def stub_pytrends(stub_server, monkeypatch):
+    """stub 서버를 바라보는 PyTrends 인스턴스"""
+    monkeypatch.setattr(pytrends.request, 'BASE_TRENDS_URL', stub_server)
+    monkeypatch.setattr(TrendReq, 'GENERAL_URL', f'{stub_server}/api/explore')
+    monkeypatch.setattr(TrendReq, 'INTEREST_OVER_TIME_URL', f'{stub_server}/api/widgetdata/multiline')
+    return TrendReq(hl='ko-KR', tz=540)
+
+
+def test_async_engine_matches_fetch_trend_data(stub_server, stub_pytrends):
+    limiter = TokenBucket(rate=1000, capacity=100)
+    results = asyncio.run(fetch_trends_async(KEYWORDS, 'today 1-m', gprops=('',), base_url=stub_server,
+                                             limiter=limiter))
+    expected = fetch_trend_data(KEYWORDS, 'today 1-m', pytrends_instance=stub_pytrends)
+
+    assert list(expected.columns) == KEYWORDS
+    pd.testing.assert_frame_equal(results[''], expected)
+
+
+def test_async_engine_youtube_gprop(stub_server):
+    limiter = TokenBucket(rate=1000, capacity=100)
+    results = asyncio.run(fetch_trends_async(KEYWORDS, 'today 1-m', base_url=stub_server, limiter=limiter))
+
+    assert set(results) == {'', 'youtube'}
+    for gprop, df in results.items():
+        assert list(df.columns) == KEYWORDS
+        assert len(df) == DAYS
+        np.testing.assert_array_equal(df['SQL 기초'].to_numpy(), _series('SQL 기초', gprop))
+
+
+def test_token_reservation_runs_off_event_loop(stub_server):
+    """blocking reserve()(스레드 락 · flock)가 이벤트 루프 스레드에서 실행되지 않아야 함"""
+    class RecordingBucket(TokenBucket):
+        def reserve(self, tokens=1, max_wait=None):
+            threads.add(threading.get_ident())
+            return super().reserve(tokens, max_wait)
+
+    threads = set()
+    loop_threads = set()
+
+    async def run():
+        loop_threads.add(threading.get_ident())
+        return await fetch_trends_async(KEYWORDS, 'today 1-m', gprops=('',), base_url=stub_server,
+                                        limiter=RecordingBucket(rate=1000, capacity=100))
+
+    asyncio.run(run())
+    assert threads and not threads & loop_threads
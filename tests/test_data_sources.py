@@ -0,0 +1,49 @@
+# FileSource.keywords가 파일 전체를 읽지 않고 read_frame과 같은 키워드를 돌려주는지 확인
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_sources
+from data_sources import FileSource, read_columns, read_frame, write_frame, write_snapshot
+
+
+def _panel():
+    index = pd.date_range('2026-01-01', periods=20, freq='D')
+    return pd.DataFrame(np.arange(60).reshape(20, 3) % 101, index=index, columns=['파이썬', 'SQL', '엑셀'])
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet'])
+def test_read_columns_matches_read_frame(tmp_path, fmt):
+    path = str(tmp_path / f'web.{fmt}')
+    write_frame(_panel(), path)
+    assert read_columns(path) == list(read_frame(path).columns)
+
+
+def test_repo_timeseries_csv_columns():
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'education_trends_timeseries.csv')
+    assert read_columns(path) == list(read_frame(path).columns)
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet'])
+def test_file_source_keywords_reads_header_once(tmp_path, monkeypatch, fmt):
+    write_snapshot({'web': _panel(), 'youtube': _panel()}, str(tmp_path), fmt=fmt)
+    source = FileSource(str(tmp_path))
+
+    calls = []
+    original = data_sources.read_columns
+    monkeypatch.setattr(data_sources, 'read_columns', lambda path: calls.append(path) or original(path))
+    monkeypatch.setattr(data_sources, 'read_frame', lambda path: pytest.fail('keywords() read the whole file'))
+
+    assert source.keywords() == ['파이썬', 'SQL', '엑셀']
+    assert source.keywords() == ['파이썬', 'SQL', '엑셀']
+    assert len(calls) == 1
+
+    # 파일이 바뀌면 다시 읽음
+    changed = _panel().rename(columns={'엑셀': 'AI'})
+    changed['코딩'] = 1
+    monkeypatch.undo()
+    write_frame(changed, str(tmp_path / f'web.{fmt}'))
+    assert source.keywords() == ['파이썬', 'SQL', 'AI', '코딩']
@@ -0,0 +1,60 @@
+# 특성 테이블의 web_std가 이전 pandas std() 값과 맞는지 (회귀 테스트)
+
+import numpy as np
+import pandas as pd
+
+from features import build_features, moment_std
+from synthetic import generate_panel
+
+
+def _baseline_std(df):
+    """변경 전 계산 방식: np.nan_to_num(df.std())"""
+    return np.nan_to_num(df.std().to_numpy(dtype=float))
+
+
+def test_integer_std_matches_pandas_within_rounding():
+    df = generate_panel(n_keywords=200, days=365, seed=7).round().clip(0, 100)
+    df = df.mask(np.random.default_rng(7).random(df.shape) < 0.05)
+    df.iloc[:, 0] = np.nan          # 값 없음 → 0
+    df.iloc[:-1, 1] = np.nan        # 값 1개 → 0
+    df.iloc[:, 2] = 42.0            # 상수 → 0
+
+    std = build_features(df)['web_std'].to_numpy()
+    np.testing.assert_allclose(std, _baseline_std(df), rtol=1e-12, atol=1e-12)
+    assert (std[:3] == 0).all()
+
+
+def test_integer_std_is_correctly_rounded():
+    """정수 데이터에서는 정확한 분산(분수)을 한 번만 반올림한 값"""
+    df = generate_panel(n_keywords=50, days=120, seed=8).round().clip(0, 100)
+    values = df.to_numpy(dtype=np.int64)
+    n = len(values)
+    numerator = n * (values ** 2).sum(axis=0) - values.sum(axis=0) ** 2   # 정수 연산 (정확)
+    expected = np.sqrt(numerator / (n * (n - 1)))
+    np.testing.assert_array_equal(build_features(df)['web_std'].to_numpy(), expected)
+
+
+def test_fractional_std_uses_pandas():
+    df = generate_panel(n_keywords=100, days=180, seed=9)
+    df.iloc[:, 3] = 1e6 + np.random.default_rng(9).random(len(df)) * 1e-3   # 큰 평균 · 작은 분산
+    mixed = df.copy()
+    mixed.iloc[:, 0] = mixed.iloc[:, 0].round()
+
+    np.testing.assert_array_equal(build_features(df)['web_std'].to_numpy(), _baseline_std(df))
+    std = build_features(mixed)['web_std'].to_numpy()
+    np.testing.assert_array_equal(std[1:], _baseline_std(mixed)[1:])
+    np.testing.assert_allclose(std[0], _baseline_std(mixed)[0], rtol=1e-12)
+
+
+def test_moment_std_small_counts():
+    count = np.array([0.0, 1.0, 2.0])
+    total = np.array([0.0, 5.0, 3.0])
+    total_sq = np.array([0.0, 25.0, 5.0])
+    np.testing.assert_array_equal(moment_std(count, total, total_sq), [0.0, 0.0, np.sqrt(0.5)])
+
+
+def test_duplicate_columns_keep_position():
+    df = pd.DataFrame({'a': [1.0, 2.0, 4.0], 'b': [0.5, 1.5, 2.0]})
+    df = pd.concat([df, df[['a']]], axis=1)
+    std = build_features(df)['web_std'].to_numpy()
+    np.testing.assert_allclose(std, _baseline_std(df), rtol=1e-12)
@@ -0,0 +1,90 @@
+# IncrementalMetrics가 하루씩 추가할 때마다 calculate_growth_metrics(같은 기간)와 같은 결과를 내는지 확인
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from features import build_features
+from incremental_metrics import IncrementalMetrics
+from synthetic import generate_panel
+from trends import calculate_growth_metrics
+
+WEB_COLUMNS = [name for name in build_features(generate_panel(n_keywords=2, days=20, seed=0)).columns
+               if name.startswith('web_')]
+
+
+def _integer_panel(days=90, seed=0):
+    """0-100 정수 관심도 + NaN · 전부 NaN · 전부 0 · 뒤늦게 시작하는 컬럼"""
+    df = generate_panel(n_keywords=24, days=days, seed=seed,
+                        archetypes=('trend', 'growth', 'decay', 'spike', 'seasonal', 'zero_heavy'))
+    df = df.round().clip(0, 100)
+    rng = np.random.default_rng(seed)
+    df = df.mask(rng.random(df.shape) < 0.05)
+    df.iloc[:, 0] = np.nan
+    df.iloc[:, 1] = 0.0
+    df.iloc[:40, 2] = np.nan
+    return df
+
+
+def _append(engine, df, i):
+    """i번째 날짜를 배열 · dict · Series 순서로 번갈아 추가"""
+    row = df.iloc[i]
+    kind = i % 3
+    if kind == 0:
+        engine.append(row.to_numpy(), df.index[i])
+    elif kind == 1:
+        engine.append({kw: v for kw, v in row.items() if not np.isnan(v)}, df.index[i])
+    else:
+        engine.append(row, df.index[i])
+
+
+def _assert_same_features(engine, batch):
+    expected = build_features(batch)[WEB_COLUMNS].to_numpy()
+    actual = engine.features()[WEB_COLUMNS].to_numpy()
+    np.testing.assert_array_equal(actual, expected)   # NaN 위치까지 비트 단위 비교
+
+
+@pytest.mark.parametrize('seed, start', [(0, 3), (1, 12), (2, 1)])
+def test_append_matches_batch_every_day(seed, start):
+    df = _integer_panel(seed=seed)
+    engine = IncrementalMetrics.from_frame(df.iloc[:start])
+    pd.testing.assert_frame_equal(engine.metrics(), calculate_growth_metrics(df.iloc[:start]))
+
+    for i in range(start, len(df)):
+        _append(engine, df, i)
+        batch = df.iloc[:i + 1]
+        assert len(engine) == i + 1
+        pd.testing.assert_frame_equal(engine.metrics(), calculate_growth_metrics(batch))
+        _assert_same_features(engine, batch)
+
+
+def test_short_history_under_ten_days():
+    df = _integer_panel(days=9, seed=3)
+    engine = IncrementalMetrics(df.columns, capacity=2)   # 버퍼 확장도 함께 확인
+    for i in range(len(df)):
+        _append(engine, df, i)
+        pd.testing.assert_frame_equal(engine.metrics(), calculate_growth_metrics(df.iloc[:i + 1]))
+
+
+def test_extend_matches_from_frame():
+    df = _integer_panel(seed=4)
+    engine = IncrementalMetrics.from_frame(df.iloc[:30])
+    engine.extend(df.iloc[30:])
+    pd.testing.assert_frame_equal(engine.metrics(), IncrementalMetrics.from_frame(df).metrics())
+    assert engine.dates == list(df.index)
+
+
+def test_fractional_values_within_tolerance():
+    df = generate_panel(n_keywords=24, days=90, seed=5)
+    engine = IncrementalMetrics.from_frame(df)
+    np.testing.assert_allclose(engine.features()[WEB_COLUMNS].to_numpy(),
+                               build_features(df)[WEB_COLUMNS].to_numpy(), rtol=1e-12, atol=1e-12)
+
+
+def test_empty_and_invalid_input():
+    engine = IncrementalMetrics(['a', 'b'])
+    assert engine.metrics().empty
+    with pytest.raises(ValueError):
+        engine.append([1.0, 2.0, 3.0])
+    with pytest.raises(ValueError):
+        IncrementalMetrics(['a', 'a'])
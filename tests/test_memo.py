@@ -0,0 +1,50 @@
+# 내용 지문(fingerprint)과 memoize LRU 동작 확인
+
+import pickle
+
+import numpy as np
+import pandas as pd
+
+import memo
+
+
+def _frame():
+    index = pd.date_range('2026-01-01', periods=30, freq='D')
+    return pd.DataFrame(np.arange(90.0).reshape(30, 3), index=index, columns=['a', 'b', 'c'])
+
+
+def test_fingerprint_same_content_different_objects():
+    df = _frame()
+    assert memo.fingerprint(df, {'x': [1, None]}) == memo.fingerprint(pickle.loads(pickle.dumps(df)),
+                                                                       {'x': [1, None]})
+
+
+def test_fingerprint_detects_changes():
+    df = _frame()
+    changed = df.copy()
+    changed.iloc[3, 1] += 1
+    assert memo.fingerprint(changed) != memo.fingerprint(df)
+    assert memo.fingerprint(df[['b', 'a', 'c']]) != memo.fingerprint(df)
+    assert memo.fingerprint(df.astype('float32')) != memo.fingerprint(df)
+    assert memo.fingerprint([1]) != memo.fingerprint((1,))
+    assert memo.fingerprint(1) != memo.fingerprint('1')
+
+
+def test_memoize_keys_on_every_argument():
+    calls = []
+
+    @memo.memoize('test_report', maxsize=2)
+    def render(df, period, report_date):
+        calls.append(report_date)
+        return f"{period} {report_date} {df.sum().sum()}"
+
+    render.clear()
+    df = _frame()
+    first = render(df, '3개월', report_date='2026-10-18 09:00')
+    assert render(df.copy(), '3개월', report_date='2026-10-18 09:00') is first
+    assert render(df, '3개월', report_date='2026-10-19 09:00') != first   # 다른 생성일은 새로 생성
+    assert len(calls) == 2
+
+    render(df, '6개월', report_date='2026-10-19 09:00')                  # maxsize=2 → 가장 오래된 결과 제거
+    render(df, '3개월', report_date='2026-10-18 09:00')
+    assert len(calls) == 4
@@ -0,0 +1,49 @@
+# 429 판단(is_throttled)과 재시도 대상 판단 테스트
+
+import aiohttp
+import pytest
+import requests
+from pytrends.exceptions import ResponseError, TooManyRequestsError
+
+from rate_limit import RetryPolicy, is_throttled
+
+
+def _response(status):
+    response = requests.Response()
+    response.status_code = status
+    return response
+
+
+def test_throttled_by_status_code():
+    assert is_throttled(requests.HTTPError(response=_response(429)))
+    assert is_throttled(ResponseError.from_response(_response(429)))
+    assert is_throttled(aiohttp.ClientResponseError(None, (), status=429))
+
+
+def test_throttled_by_pytrends_exception():
+    assert is_throttled(TooManyRequestsError('rate limited', None))
+
+
+def test_message_containing_429_is_not_throttled():
+    assert not is_throttled(ValueError('429 keywords requested'))
+    assert not is_throttled(requests.ConnectionError('https://example.com/items/429 unreachable'))
+    assert not is_throttled(ResponseError.from_response(_response(500)))
+    assert not is_throttled(aiohttp.ClientResponseError(None, (), status=404, message='page 429'))
+
+
+def test_retry_policy_retries_only_real_429():
+    calls = []
+
+    def fail(error):
+        calls.append(error)
+        raise error
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0, max_delay=0.0)
+    with pytest.raises(ValueError):
+        policy.call(fail, ValueError('429 keywords requested'))
+    assert len(calls) == 1
+
+    calls.clear()
+    with pytest.raises(TooManyRequestsError):
+        policy.call(fail, TooManyRequestsError.from_response(_response(429)))
+    assert len(calls) == 3
@@ -0,0 +1,99 @@
+# 로컬 stub 서버(tests/test_async_fetch.py)를 상대로 녹화한 cassette를
+# 네트워크 없이 재생해 fetch_trend_data가 같은 DataFrame을 만드는지,
+# 시드로 주입한 429가 재시도 · 서킷 브레이커 집계(get_retry_stats)에 그대로 반영되는지 확인합니다.
+
+import pandas as pd
+import pytest
+import pytrends.request
+import requests
+from pytrends.request import TrendReq
+
+import replay
+import trends
+from rate_limit import CircuitBreaker, RetryPolicy, TokenBucket
+from test_async_fetch import KEYWORDS, stub_server  # noqa: F401  (stub 서버 fixture 공유)
+from trends import fetch_trend_data, get_retry_stats
+
+TIMEFRAME = 'today 1-m'
+
+
+@pytest.fixture
+def stub_trends(stub_server, monkeypatch):
+    """PyTrends 요청을 stub 서버로 보내고, 토큰 버킷 · 재시도 정책을 테스트용(대기 없음)으로 교체"""
+    monkeypatch.setattr(pytrends.request, 'BASE_TRENDS_URL', stub_server)
+    monkeypatch.setattr(trends, 'BASE_TRENDS_URL', stub_server)
+    monkeypatch.setattr(TrendReq, 'GENERAL_URL', f'{stub_server}/api/explore')
+    monkeypatch.setattr(TrendReq, 'INTEREST_OVER_TIME_URL', f'{stub_server}/api/widgetdata/multiline')
+    monkeypatch.setattr(trends, '_rate_limiter', TokenBucket(rate=1000, capacity=100))
+    monkeypatch.setattr(trends, '_retry_policy', RetryPolicy(
+        max_attempts=4, base_delay=0.0, max_delay=0.0,
+        breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60.0),
+    ))
+    yield
+    replay.configure(None)
+
+
+@pytest.fixture
+def cassette(stub_trends, tmp_path):
+    """stub 서버에 실제로 요청하며 녹화. (cassette 경로, 녹화 중 받은 DataFrame)"""
+    path = str(tmp_path / 'cassette.jsonl')
+    replay.configure(replay.RECORD, path)
+    recorded = fetch_trend_data(KEYWORDS, TIMEFRAME, pytrends_instance=trends.create_pytrends())
+    assert replay.stats()['recorded'] > 0
+    return path, recorded
+
+
+@pytest.fixture
+def no_network(monkeypatch):
+    """실제 전송 계층(HTTPAdapter)을 막음 (ReplayAdapter는 HTTPAdapter를 거치지 않음)"""
+    def send(self, request, **kwargs):
+        raise AssertionError(f"network request during replay: {request.url}")
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, 'send', send)
+
+
+def _replay(path, **options):
+    replay.configure(replay.REPLAY, path, **options)
+    pt = trends.create_pytrends()
+    throttled_before = replay.stats()['throttled']  # 쿠키 발급 요청은 재시도 정책을 거치지 않음
+    df = fetch_trend_data(KEYWORDS, TIMEFRAME, pytrends_instance=pt)
+    return df, replay.stats()['throttled'] - throttled_before
+
+
+def test_replay_matches_recording_without_network(cassette, no_network):
+    path, recorded = cassette
+    replayed, _ = _replay(path)
+
+    assert list(recorded.columns) == KEYWORDS
+    pd.testing.assert_frame_equal(replayed, recorded)
+    assert replay.stats()['misses'] == 0
+    assert get_retry_stats()['throttled'] == 0
+
+
+def test_seeded_429s_are_retried_and_counted(cassette, no_network):
+    path, recorded = cassette
+    replayed, throttled = _replay(path, throttle_rate=0.3, seed=2)
+    stats = get_retry_stats()
+
+    pd.testing.assert_frame_equal(replayed, recorded)
+    assert throttled > 0
+    assert stats['throttled'] == throttled
+    assert stats['retries'] == throttled
+    assert stats['retry_after_honored'] == throttled
+    assert stats['circuit_trips'] == 0
+
+    # 같은 시드는 같은 순서로 429를 주입
+    _, again = _replay(path, throttle_rate=0.3, seed=2)
+    assert again == throttled
+
+
+def test_persistent_429s_open_the_circuit(cassette, no_network):
+    path, _ = cassette
+    replayed, throttled = _replay(path, throttle_rate=1.0, seed=0)
+    stats = get_retry_stats()
+
+    assert replayed.empty
+    assert stats['throttled'] == throttled == 3
+    assert stats['circuit_trips'] == 1
+    assert stats['circuit_state'] == CircuitBreaker.OPEN
+    # 429가 3번 연속되면 첫 청크의 마지막 시도와 이후 청크는 요청하지 않고 건너뜀
+    assert stats['circuit_rejected'] == len(trends._chunk_keywords(KEYWORDS))
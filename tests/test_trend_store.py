@@ -0,0 +1,113 @@
+# 빈 저장소에서 시작한 일별 12개월 수집이 토큰 버킷에 묶여 한 번에 끝나지 않아도
+# 갱신마다 받은 구간이 저장되어 결국 모든 키워드를 채우는지 확인합니다.
+
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_sources
+import trends
+from data_sources import create_data_source
+from rate_limit import TokenBucket
+from trend_store import TrendStore, timeframe_end
+from trends import RateLimitedTrendReq, fetch_multi_signal_data
+
+KEYWORDS = ['파이썬 강의', '데이터 분석', 'SQL 기초', '엑셀 자격증', 'AI 교육', '코딩 테스트', 'UX 디자인']
+TIMEFRAME = 'today 12-m'
+
+
+class FakeTrendReq:
+    """
+    공용 토큰 버킷을 거치는 가짜 PyTrends 클라이언트.
+    실제 PyTrends처럼 요청 1건이 explore · multiline 두 번의 토큰을 쓰고, 요청한 구간의 일별 값을 돌려줍니다.
+    """
+
+    deadline = None
+    _acquire_token = RateLimitedTrendReq._acquire_token
+
+    def __init__(self, log):
+        self.log = log
+
+    def build_payload(self, kw_list, cat=0, timeframe='today 5-y', geo='', gprop=''):
+        self._acquire_token()
+        self.kw_list, self.timeframe, self.gprop = list(kw_list), timeframe, gprop
+
+    def interest_over_time(self):
+        self._acquire_token()
+        self.log.append((self.gprop, tuple(self.kw_list), self.timeframe))
+        start, end = self.timeframe.split()
+        index = pd.date_range(start, end, freq='D', name='date')
+        data = {kw: (np.arange(len(index)) * (i + 3) + index.dayofyear.to_numpy()) % 90 + 10
+                for i, kw in enumerate(self.kw_list)}
+        data['isPartial'] = False
+        return pd.DataFrame(data, index=index)
+
+
+class FakePool:
+    def __init__(self):
+        self.log = []
+
+    @contextmanager
+    def session(self, timeout=None):
+        yield FakeTrendReq(self.log)
+
+    def warm(self):
+        pass
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """세션 풀을 가짜 클라이언트로, 공용 토큰 버킷을 빠른 테스트용 버킷으로 교체"""
+    pool = FakePool()
+    monkeypatch.setattr(trends, '_pytrends_pool', pool)
+    monkeypatch.setattr(trends, '_rate_limiter', TokenBucket(rate=40, capacity=2))
+    return pool
+
+
+def _assert_full_history(store, gprop):
+    df = store.load(KEYWORDS, TIMEFRAME, gprop=gprop)
+    assert list(df.columns) == KEYWORDS
+    assert df.notna().all().all()
+    assert (timeframe_end(TIMEFRAME) - df.index.min()).days > 360
+
+
+def test_scheduler_source_has_no_deadline(tmp_path, fake_client, monkeypatch):
+    """백그라운드 갱신용 소스는 마감 없이 빈 저장소의 전체 구간을 한 번에 받음"""
+    deadlines = []
+
+    def spy(*args, deadline, **kwargs):
+        deadlines.append(deadline)
+        return fetch_multi_signal_data(*args, deadline=deadline, **kwargs)
+
+    monkeypatch.setattr(data_sources, 'fetch_multi_signal_data', spy)
+    store = TrendStore(str(tmp_path / 'trends.sqlite3'))
+    result = create_data_source('pytrends', store=store).load(KEYWORDS, TIMEFRAME)
+
+    assert deadlines == [None]
+    assert result['completeness']['web']['ratio'] == 1.0
+    assert result['completeness']['youtube']['ratio'] == 1.0
+    assert not result['completeness']['deadline_exceeded']
+    _assert_full_history(store, '')
+
+
+def test_cold_store_fills_across_deadline_bound_refreshes(tmp_path, fake_client):
+    """마감에 걸린 갱신도 받은 구간을 저장하므로, 다음 갱신은 남은 부분만 요청해 결국 완료됨"""
+    store = TrendStore(str(tmp_path / 'trends.sqlite3'))
+    cold_requests = 2 * 2 * len(trends._chunk_keywords(KEYWORDS))  # gprop 2개 × 일별 구간 2개 × 청크
+
+    ratios = []
+    for _ in range(20):
+        result = fetch_multi_signal_data(KEYWORDS, TIMEFRAME, store=store, daily=True, deadline=0.15)
+        ratios.append(min(result['completeness']['web']['ratio'], result['completeness']['youtube']['ratio']))
+        if ratios[-1] == 1.0:
+            break
+
+    assert ratios[-1] == 1.0
+    assert len(ratios) > 1, "deadline should cut the first refresh short"
+    assert ratios == sorted(ratios)
+    # 처음부터 다시 요청하지 않음: 앞부분 보충 요청을 더해도 빈 저장소 1회 수집의 두 배를 넘지 않음
+    assert len(fake_client.log) <= 2 * cold_requests
+    _assert_full_history(store, '')
+    _assert_full_history(store, 'youtube')
@@ -0,0 +1,116 @@
+# 작은 메모리 표현의 트렌드 패널
+# Google Trends 관심도는 0-100 정수이므로 float64 DataFrame 대신 uint8 2차원 배열 하나(연속 메모리)에 담습니다.
+# 결측은 uint8에 없는 값이므로 255(MISSING)로 표시합니다.
+# 이동평균 등 파생 시계열은 float32로 보관할 수 있고, 손실 없이 줄일 수 없는 값은 float64 그대로 둡니다.
+# st.cache_data는 적중할 때마다 결과를 pickle에서 복원하므로 캐시에는 TrendPanel을 넣고
+# 페이지에서 쓸 때만 to_frame()으로 DataFrame을 만듭니다 (메모리 · 복원 비용 약 1/8).
+
+import numpy as np
+import pandas as pd
+
+MISSING = 255              # uint8 패널의 결측 표시
+MAX_INTEREST = 100         # Google Trends 관심도 최댓값
+SUPPORTED_DTYPES = (np.uint8, np.float32, np.float64)
+
+
+def _compact_dtype(values):
+    """값을 잃지 않는 가장 작은 dtype (0-100 정수 → uint8, float32로 정확히 표현되면 float32, 아니면 float64)"""
+    valid = values[~np.isnan(values)]
+    if np.all((valid >= 0) & (valid <= MAX_INTEREST) & (valid == np.round(valid))):
+        return np.uint8
+    if np.array_equal(valid.astype(np.float32).astype(np.float64), valid):
+        return np.float32
+    return np.float64
+
+
+class TrendPanel:
+    """
+    (날짜 × 키워드) 관심도 패널.
+
+    Args:
+        values: 2차원 배열 (행: 날짜, 열: 키워드), dtype은 uint8 · float32 · float64
+                (uint8은 MISSING(255)이 결측)
+        index: 날짜 인덱스
+        keywords: 키워드 리스트 (중복 없음, values의 열 순서)
+        attrs: DataFrame.attrs로 복원할 부가 정보 (출처 등)
+    """
+
+    def __init__(self, values, index, keywords, attrs=None):
+        # 키워드(열) 단위 연속 메모리: to_frame()의 float64 배열을 복사 없이 DataFrame 블록으로 사용
+        values = np.asfortranarray(values)
+        if values.dtype.type not in SUPPORTED_DTYPES:
+            raise ValueError(f"unsupported panel dtype: {values.dtype}")
+        if values.ndim != 2 or values.shape != (len(index), len(keywords)):
+            raise ValueError(f"values shape {values.shape} does not match ({len(index)}, {len(keywords)})")
+        self.values = values
+        self.index = pd.Index(index)
+        self.keywords = pd.Index(keywords)
+        self.columns = {kw: i for i, kw in enumerate(self.keywords)}
+        if len(self.columns) != len(self.keywords):
+            raise ValueError("keywords must be unique")
+        self.attrs = dict(attrs or {})
+
+    @classmethod
+    def from_frame(cls, df, dtype=None):
+        """
+        DataFrame에서 패널을 만듭니다.
+
+        Args:
+            df: 날짜 인덱스, 키워드 컬럼 DataFrame
+            dtype: 'uint8' · 'float32' · 'float64' (None이면 값을 잃지 않는 가장 작은 타입)
+                   uint8은 0-100 정수만, float32는 파생 시계열(반올림 허용)에 사용합니다.
+
+        Returns:
+            TrendPanel
+        """
+        values = df.to_numpy(dtype=float)
+        target = _compact_dtype(values) if dtype is None else np.dtype(dtype).type
+        if target is np.uint8:
+            missing = np.isnan(values)
+            valid = values[~missing]
+            if np.any((valid < 0) | (valid > MAX_INTEREST) | (valid != np.round(valid))):
+                raise ValueError("uint8 panel requires integer values between 0 and 100")
+            values = np.where(missing, MISSING, values).astype(np.uint8)
+        else:
+            values = values.astype(target)
+        return cls(values, df.index, df.columns, attrs=df.attrs)
+
+    def __len__(self):
+        return self.values.shape[0]
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def nbytes(self):
+        """값 배열의 메모리 크기 (바이트)"""
+        return self.values.nbytes
+
+    def _as_float(self, values):
+        """float64로 변환 (uint8의 MISSING은 NaN)"""
+        result = values.astype(np.float64)
+        if self.values.dtype == np.uint8:
+            missing = values == MISSING
+            if missing.any():
+                np.copyto(result, np.nan, where=missing)
+        return result
+
+    def column(self, keyword):
+        """키워드 하나의 시계열 (float64 Series)"""
+        i = self.columns[keyword]
+        return pd.Series(self._as_float(self.values[:, i]), index=self.index, name=keyword)
+
+    def to_frame(self, keywords=None):
+        """
+        float64 DataFrame으로 변환합니다 (keywords를 주면 그 컬럼만, 없는 키워드는 KeyError).
+        """
+        if keywords is None:
+            keywords = self.keywords
+            values = self.values
+        else:
+            keywords = pd.Index(keywords)
+            values = self.values[:, [self.columns[kw] for kw in keywords]]
+        df = pd.DataFrame(self._as_float(values), index=self.index, columns=keywords, copy=False)
+        df.attrs.update(self.attrs)
+        return df
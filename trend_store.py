@@ -0,0 +1,346 @@
+# 로컬 시계열 저장소 (SQLite)
+# 키워드 · gprop · geo · timeframe · 날짜 단위로 Google Trends 값을 보관하고,
+# 마지막 수집 이후 비어 있는 날짜만 새로 요청해 병합합니다.
+
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'trends.sqlite3')
+
+# 마지막 수집 후 이 시간 안에는 다시 요청하지 않음 (재시작·중복 갱신 시 요청 방지)
+# 갱신 주기 자체는 백그라운드 스케줄러(scheduler.py)가 결정하므로 그 주기보다 짧게 유지
+REFRESH_INTERVAL = timedelta(hours=1)
+
+# 증분 수집 시 기존 데이터와 겹쳐서 받는 일수 (스케일 보정용)
+OVERLAP_DAYS = 7
+
+# Google Trends가 일별 데이터를 돌려주는 최대 기간 (이보다 길면 주별 데이터)
+DAILY_MAX_DAYS = 269
+
+
+def timeframe_start(timeframe, today=None):
+    """
+    PyTrends timeframe 문자열이 가리키는 구간의 시작일을 계산합니다.
+
+    Args:
+        timeframe: 'today 3-m', 'today 5-y', 'now 7-d', 'YYYY-MM-DD YYYY-MM-DD' 등
+        today: 기준일 (기본값: 오늘)
+
+    Returns:
+        Timestamp: 구간 시작일 ('all' 등 해석할 수 없으면 None)
+    """
+    today = pd.Timestamp(today or datetime.now()).normalize()
+    parts = timeframe.split()
+    if len(parts) != 2:
+        return None
+
+    head, span = parts
+    if head in ('today', 'now'):
+        amount, unit = span.split('-')
+        amount = int(amount)
+        if unit == 'm':
+            return today - pd.DateOffset(months=amount)
+        if unit == 'y':
+            return today - pd.DateOffset(years=amount)
+        if unit == 'd':
+            return today - pd.Timedelta(days=amount)
+        return None
+
+    try:
+        return pd.Timestamp(head).normalize()
+    except ValueError:
+        return None
+
+
+def timeframe_end(timeframe, today=None):
+    """
+    PyTrends timeframe 문자열이 가리키는 구간의 마지막 날.
+    'YYYY-MM-DD YYYY-MM-DD'는 뒤의 날짜, 그 외('today 3-m' 등)는 기준일입니다.
+    """
+    today = pd.Timestamp(today or datetime.now()).normalize()
+    parts = timeframe.split()
+    if len(parts) != 2 or parts[0] in ('today', 'now'):
+        return today
+    try:
+        return pd.Timestamp(parts[1]).normalize()
+    except ValueError:
+        return today
+
+
+def _rescale_to_overlap(new_df, old_df):
+    """
+    새로 받은 구간을 기존 저장 데이터의 스케일에 맞춥니다.
+    Google Trends는 요청마다 0-100으로 다시 정규화하므로,
+    겹치는 날짜의 평균 비율로 새 값을 보정합니다.
+    """
+    rescaled = new_df.astype(float).copy()
+    common_idx = new_df.index.intersection(old_df.index)
+
+    for kw in new_df.columns:
+        if kw not in old_df.columns or len(common_idx) == 0:
+            continue
+        new_mean = new_df.loc[common_idx, kw].mean()
+        old_mean = old_df.loc[common_idx, kw].mean()
+        if pd.isna(new_mean) or pd.isna(old_mean) or new_mean <= 0:
+            continue
+        rescaled[kw] = new_df[kw] * (old_mean / new_mean)
+
+    return rescaled.round()
+
+
+class TrendStore:
+    """
+    Google Trends 시계열을 SQLite 파일에 보관하는 저장소.
+    여러 Streamlit 세션과 프로세스가 같은 파일을 공유할 수 있습니다.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, refresh_interval=REFRESH_INTERVAL):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS trend_points (
+                    keyword TEXT NOT NULL,
+                    gprop TEXT NOT NULL,
+                    geo TEXT NOT NULL,
+                    timeframe TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    value REAL NOT NULL,
+                    PRIMARY KEY (keyword, gprop, geo, timeframe, date)
+                );
+                CREATE TABLE IF NOT EXISTS fetch_log (
+                    keyword TEXT NOT NULL,
+                    gprop TEXT NOT NULL,
+                    geo TEXT NOT NULL,
+                    timeframe TEXT NOT NULL,
+                    fetched_at TEXT NOT NULL,
+                    PRIMARY KEY (keyword, gprop, geo, timeframe)
+                );
+            """)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def load(self, keywords, timeframe, gprop='', geo='KR', start=None):
+        """
+        저장된 시계열을 fetch_trend_data와 같은 형태로 읽어옵니다.
+
+        Returns:
+            DataFrame: 날짜 인덱스, 키워드 컬럼 (저장된 키워드만 포함)
+        """
+        df = self._read(keywords, timeframe, gprop, geo, start)
+        if df.empty:
+            return df
+
+        # 증분 보정으로 100을 넘은 키워드는 구간 최대값 100 기준으로 다시 맞춤
+        peaks = df.max()
+        over = peaks[peaks > 100].index
+        if len(over) > 0:
+            df[over] = (df[over] * (100 / peaks[over])).round()
+
+        return df
+
+    def _read(self, keywords, timeframe, gprop, geo, start=None):
+        """저장된 값을 보정 없이 그대로 읽어옵니다."""
+        if not keywords:
+            return pd.DataFrame()
+
+        placeholders = ','.join('?' * len(keywords))
+        query = (
+            f"SELECT keyword, date, value FROM trend_points "
+            f"WHERE gprop = ? AND geo = ? AND timeframe = ? AND keyword IN ({placeholders})"
+        )
+        params = [gprop, geo, timeframe, *keywords]
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(pd.Timestamp(start).strftime('%Y-%m-%d'))
+
+        with closing(self._connect()) as conn:
+            rows = pd.read_sql_query(query, conn, params=params)
+
+        if rows.empty:
+            return pd.DataFrame()
+
+        df = rows.pivot(index='date', columns='keyword', values='value')
+        df.index = pd.to_datetime(df.index)
+        df.index.name = 'date'
+        df.columns.name = None
+        return df[[kw for kw in keywords if kw in df.columns]]
+
+    def save(self, df, timeframe, gprop='', geo='KR', replace=False, fetched_at=None):
+        """
+        수집한 DataFrame을 저장하고 키워드별 수집 시각을 기록합니다.
+        replace=True이면 해당 키워드의 기존 데이터를 지우고 새로 씁니다 (전체 재수집).
+        """
+        if df is None or df.empty:
+            return
+
+        fetched_at = (fetched_at or datetime.now()).isoformat()
+        keywords = list(df.columns)
+        dates = pd.to_datetime(df.index).strftime('%Y-%m-%d')
+
+        points = []
+        for kw in keywords:
+            for date, value in zip(dates, df[kw]):
+                if not pd.isna(value):
+                    points.append((kw, gprop, geo, timeframe, date, float(value)))
+
+        with self._lock, closing(self._connect()) as conn, conn:
+            if replace:
+                conn.executemany(
+                    "DELETE FROM trend_points WHERE keyword = ? AND gprop = ? AND geo = ? AND timeframe = ?",
+                    [(kw, gprop, geo, timeframe) for kw in keywords]
+                )
+            conn.executemany("INSERT OR REPLACE INTO trend_points VALUES (?, ?, ?, ?, ?, ?)", points)
+            conn.executemany(
+                "INSERT OR REPLACE INTO fetch_log VALUES (?, ?, ?, ?, ?)",
+                [(kw, gprop, geo, timeframe, fetched_at) for kw in keywords]
+            )
+
+    def _fetch_state(self, keywords, timeframe, gprop, geo):
+        """키워드별 (마지막 수집 시각, 첫 날짜, 마지막 날짜, 일별 데이터 여부)"""
+        placeholders = ','.join('?' * len(keywords))
+        params = [gprop, geo, timeframe, *keywords]
+        with closing(self._connect()) as conn:
+            log = dict(conn.execute(
+                f"SELECT keyword, fetched_at FROM fetch_log "
+                f"WHERE gprop = ? AND geo = ? AND timeframe = ? AND keyword IN ({placeholders})",
+                params
+            ).fetchall())
+            # 키워드별 최근 두 날짜로 데이터 간격(일별/주별) 판단
+            tails = conn.execute(
+                f"SELECT keyword, date FROM ("
+                f"  SELECT keyword, date, ROW_NUMBER() OVER (PARTITION BY keyword ORDER BY date DESC) AS rn"
+                f"  FROM trend_points"
+                f"  WHERE gprop = ? AND geo = ? AND timeframe = ? AND keyword IN ({placeholders})"
+                f") WHERE rn <= 2",
+                params
+            ).fetchall()
+            first_dates = dict(conn.execute(
+                f"SELECT keyword, MIN(date) FROM trend_points "
+                f"WHERE gprop = ? AND geo = ? AND timeframe = ? AND keyword IN ({placeholders}) "
+                f"GROUP BY keyword",
+                params
+            ).fetchall())
+
+        last_dates = {}
+        for kw, date in tails:
+            last_dates.setdefault(kw, []).append(pd.Timestamp(date))
+
+        state = {}
+        for kw, fetched_at in log.items():
+            dates = sorted(last_dates.get(kw, []))
+            if not dates:
+                continue
+            is_daily = len(dates) == 2 and (dates[1] - dates[0]).days == 1
+            state[kw] = (datetime.fromisoformat(fetched_at), pd.Timestamp(first_dates[kw]), dates[-1], is_daily)
+        return state
+
+    def fetch_incremental(self, keywords, timeframe, fetch_fn, gprop='', geo='KR', now=None):
+        """
+        저장소에 없는 날짜만 Google Trends에 요청해 병합한 뒤 전체 구간을 반환합니다.
+
+        - 최근 refresh_interval 안에 수집한 키워드는 요청하지 않음
+        - 일별 데이터는 마지막 날짜 - OVERLAP_DAYS부터만 다시 요청하여 스케일 보정 후 병합
+        - 저장된 데이터가 없거나 주별 데이터인 키워드만 전체 구간을 새로 요청
+        - 마감 등으로 최신 구간만 받아 앞부분이 비어 있는 키워드는 수집 주기와 관계없이 비어 있는 앞부분만 요청
+          (받은 구간은 매번 저장되므로 갱신이 거듭될수록 채워지고, 처음부터 다시 요청하지 않음)
+        - 요청이 실패한 키워드는 저장된 마지막 데이터를 그대로 사용
+          (청크 하나가 실패해도 나머지 청크와 이전 값은 유지되고, 다음 갱신 때 그 키워드만 다시 요청)
+
+        Args:
+            keywords: 키워드 리스트
+            timeframe: PyTrends timeframe 문자열 (저장 키로도 사용)
+            fetch_fn: fetch_fn(keywords, timeframe) -> DataFrame (예: fetch_trend_data)
+            gprop: '' (웹) 또는 'youtube'
+            geo: 지역 코드
+
+        Returns:
+            DataFrame: fetch_trend_data와 같은 형태 (날짜 인덱스, 키워드 컬럼)
+                       df.attrs['provenance']에 키워드별 출처 기록
+                       ('fresh' 이번에 수집, 'cached' 최신 저장값, 'stale' 수집 실패로 이전 저장값,
+                        'partial' 앞부분(과거 구간)이 아직 비어 있음, 'missing' 없음)
+        """
+        now = now or datetime.now()
+        today = pd.Timestamp(now).normalize()
+        period_start = timeframe_start(timeframe, today)
+        # 첫 날짜가 이보다 늦으면 과거 구간이 잘린 것으로 봄 (주별 데이터의 첫 일요일까지는 허용)
+        history_limit = period_start + pd.Timedelta(days=OVERLAP_DAYS) if period_start is not None else None
+        state = self._fetch_state(keywords, timeframe, gprop, geo)
+
+        full_keywords = []
+        backfill = {}     # 저장된 첫 날짜 -> 키워드 리스트 (비어 있는 앞부분만 요청)
+        incremental = {}  # 시작일 -> 키워드 리스트 (같은 구간끼리 묶어서 요청)
+
+        for kw in keywords:
+            if kw not in state:
+                full_keywords.append(kw)
+                continue
+
+            fetched_at, first_date, last_date, is_daily = state[kw]
+            if is_daily and history_limit is not None and first_date > history_limit:
+                backfill.setdefault(first_date, []).append(kw)
+            if now - fetched_at < self.refresh_interval:
+                continue
+
+            start = last_date - pd.Timedelta(days=OVERLAP_DAYS)
+            if is_daily and (today - start).days <= DAILY_MAX_DAYS:
+                incremental.setdefault(start, []).append(kw)
+            else:
+                full_keywords.append(kw)
+
+        refreshed = set()
+
+        if full_keywords:
+            fetched = fetch_fn(full_keywords, timeframe)
+            if fetched is not None and not fetched.empty:
+                self.save(fetched, timeframe, gprop, geo, replace=True, fetched_at=now)
+                refreshed.update(fetched.columns)
+
+        for first_date, kws in backfill.items():
+            overlap_end = first_date + pd.Timedelta(days=OVERLAP_DAYS)
+            fetched = fetch_fn(kws, f"{period_start:%Y-%m-%d} {overlap_end:%Y-%m-%d}")
+            if fetched is None or fetched.empty:
+                continue
+            stored = self._read(kws, timeframe, gprop, geo, start=first_date)
+            # 겹치는 날짜는 저장된 값을 유지하고 그 앞의 날짜만 추가
+            head = _rescale_to_overlap(fetched, stored)
+            self.save(head.loc[head.index < first_date], timeframe, gprop, geo, fetched_at=now)
+            refreshed.update(fetched.columns)
+
+        for start, kws in incremental.items():
+            window = f"{start:%Y-%m-%d} {today:%Y-%m-%d}"
+            fetched = fetch_fn(kws, window)
+            if fetched is None or fetched.empty:
+                continue
+            stored = self._read(kws, timeframe, gprop, geo, start=start)
+            self.save(_rescale_to_overlap(fetched, stored), timeframe, gprop, geo, fetched_at=now)
+            refreshed.update(fetched.columns)
+
+        requested = set(full_keywords).union(*backfill.values(), *incremental.values())
+        df = self.load(keywords, timeframe, gprop, geo, start=period_start)
+
+        provenance = {}
+        for kw in keywords:
+            if kw not in df.columns:
+                provenance[kw] = 'missing'
+            elif history_limit is not None and df[kw].first_valid_index() > history_limit:
+                provenance[kw] = 'partial'
+            elif kw in refreshed:
+                provenance[kw] = 'fresh'
+            elif kw in requested:
+                provenance[kw] = 'stale'
+            else:
+                provenance[kw] = 'cached'
+        df.attrs['provenance'] = provenance
+        return df
@@ -1,97 +1,288 @@
-import pandas as pd
-from pytrends.request import TrendReq
+import os
+import json
+import threading
 import time
-import random
-from keyword_list import get_category
+import numpy as np
+import pandas as pd
+import requests
+from pytrends import exceptions
+from pytrends.request import TrendReq, BASE_TRENDS_URL
+from rate_limit import TokenBucket, RetryPolicy, CircuitBreaker, CircuitOpenError, Deadline, DeadlineExceeded
+from single_flight import SingleFlight, KeywordSingleFlight
+from trend_store import timeframe_start, timeframe_end, DAILY_MAX_DAYS
+from session_pool import SessionPool
+from synthetic import generate_panel
+from smoothing import moving_average, normalize_panel
+from features import build_features, youtube_features
+import replay
+import telemetry
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+# Google Trends 요청 속도 (모든 스레드·세션·프로세스 합산)
+PYTRENDS_RATE_PER_SEC = 0.5   # 지속 가능한 요청 속도 (2초에 1건)
+PYTRENDS_BURST = 3            # 한 번에 몰아서 보낼 수 있는 최대 요청 수
+PYTRENDS_RATE_STATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'pytrends_rate.json')
+
+# 요청 1건당 키워드 수 (Google Trends는 같은 요청의 키워드끼리 함께 0-100으로 정규화)
+CHUNK_SIZE = 5
+
+# 여러 일별 구간을 이어 붙일 때 겹쳐 받는 일수 (구간 간 스케일 보정용)
+STITCH_OVERLAP_DAYS = 30
+
+# 웹 + YouTube 수집 전체의 시간 예산(초). 마감 후에는 받은 결과까지만 반환
+FETCH_DEADLINE = 30.0
+DEADLINE_GRACE = 2.0   # 마감 후 진행 중인 요청이 끝나기를 기다리는 여유 시간
+
+# 웹 → YouTube 선행 시차를 찾을 때 살펴볼 최대 시차(일, 양방향)
+MAX_LAG_DAYS = 28
+
+# 데모 모드(Mock) 데이터 시드 (실행할 때마다 같은 데모 데이터)
+MOCK_SEED = 2024
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """모든 PyTrends 호출이 공유하는 토큰 버킷을 반환합니다."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TokenBucket(PYTRENDS_RATE_PER_SEC, PYTRENDS_BURST, state_path=PYTRENDS_RATE_STATE)
+    return _rate_limiter
+
+def configure_rate_limiter(rate=PYTRENDS_RATE_PER_SEC, burst=PYTRENDS_BURST, state_path=PYTRENDS_RATE_STATE):
+    """
+    공용 토큰 버킷의 속도를 바꿉니다 (샤드 수집 작업의 워커 프로세스 시작 시 호출).
+    같은 state_path를 공유하는 모든 프로세스가 같은 rate·burst로 설정해야 합산 속도가 rate를 넘지 않습니다.
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        _rate_limiter = TokenBucket(rate, burst, state_path=state_path)
+    return _rate_limiter
+
+class RateLimitedTrendReq(TrendReq):
+    """
+    Google로 나가는 모든 요청(쿠키 발급 포함)이 공용 토큰 버킷을 거치는 TrendReq.
+    요청마다 새 requests 세션을 만드는 기본 구현 대신 인스턴스별 세션 하나를 유지하여
+    NID 쿠키와 keep-alive 연결을 재사용합니다. (proxies 옵션은 사용하지 않음)
+
+    deadline(Deadline)이 지정되어 있으면 마감 전에 보낼 수 없는 요청은 토큰을 예약하지 않고
+    DeadlineExceeded로 중단하며, HTTP 타임아웃도 남은 시간 이하로 줄입니다.
+    """
+
+    deadline = None  # 세션을 빌린 수집 루프가 요청 동안 지정
+
+    def __init__(self, *args, **kwargs):
+        # 부모 생성자가 GetGoogleCookie를 호출하므로 세션을 먼저 준비
+        self.session = requests.Session()
+        replay.mount(self.session)  # TRENDS_REPLAY 설정 시 응답 녹화/재생
+        super().__init__(*args, **kwargs)
+        self.session.headers.update(self.headers)
+
+    def _acquire_token(self):
+        if self.deadline is None:
+            telemetry.record_rate_wait(get_rate_limiter().acquire())
+            return
+        wait = get_rate_limiter().reserve(max_wait=self.deadline.remaining())
+        if wait is None:
+            raise DeadlineExceeded("no request budget left before the deadline")
+        if wait > 0:
+            telemetry.record_rate_wait(wait)
+            self.deadline.sleep(wait)
+
+    def _send(self, endpoint, method, url, **kwargs):
+        """세션으로 요청을 보내고 지연 시간 · 응답 크기 · 상태 코드를 계측"""
+        started = time.monotonic()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception as e:
+            telemetry.record_request(endpoint, type(e).__name__, time.monotonic() - started, 0)
+            raise
+        telemetry.record_request(endpoint, response.status_code, time.monotonic() - started,
+                                 len(response.content))
+        return response
+
+    def GetGoogleCookie(self):
+        self._acquire_token()
+        response = self._send(
+            'cookie', 'GET',
+            f'{BASE_TRENDS_URL}/explore/?geo={self.hl[-2:]}',
+            timeout=self.timeout,
+            **self.requests_args
+        )
+        return dict(filter(lambda i: i[0] == 'NID', response.cookies.items()))
+
+    def _get_data(self, url, method=TrendReq.GET_METHOD, trim_chars=0, **kwargs):
+        self._acquire_token()
+        timeout = self.deadline.timeout(self.timeout) if self.deadline is not None else self.timeout
+        endpoint = url.rstrip('/').rsplit('/', 1)[-1]  # explore, multiline, relatedsearches ...
+        response = self._send(endpoint, 'POST' if method == TrendReq.POST_METHOD else 'GET', url,
+                              timeout=timeout, cookies=self.cookies, **kwargs, **self.requests_args)
+
+        content_type = response.headers.get('Content-Type', '')
+        if response.status_code == 200 and any(
+            t in content_type for t in ('application/json', 'application/javascript', 'text/javascript')
+        ):
+            # 응답 앞의 garbage 문자(")]}'," 등)를 잘라낸 뒤 파싱
+            return json.loads(response.text[trim_chars:])
+        if response.status_code == requests.codes.too_many_requests:
+            raise exceptions.TooManyRequestsError.from_response(response)
+        raise exceptions.ResponseError.from_response(response)
+
+    def close(self):
+        self.session.close()
+
+def _new_pytrends():
+    # 재시도는 _retry_policy가 담당하므로 PyTrends 내부 재시도는 끔 (토큰 버킷을 우회하지 않도록)
+    return RateLimitedTrendReq(hl='ko-KR', tz=540, timeout=(10, 25), retries=0, backoff_factor=0)
+
 def create_pytrends():
     """새로운 PyTrends 인스턴스 생성 (스레드 안전)"""
     try:
-        return TrendReq(hl='ko-KR', tz=540, timeout=(10, 25), retries=2, backoff_factor=0.1)
+        return _new_pytrends()
     except Exception:
         return None
 
-# 전역 인스턴스 보관용 (lazy loading)
-_pytrends_singleton = None
-
-def _get_pytrends():
-    """PyTrends 인스턴스를 지연 로딩하여 반환합니다."""
-    global _pytrends_singleton
-    if _pytrends_singleton is None:
-        _pytrends_singleton = create_pytrends()
-    return _pytrends_singleton
-
-def fetch_trend_data(keywords, timeframe='today 3-m', pytrends_instance=None):
+# 쿠키 발급을 마친 PyTrends 세션 풀 (요청 1건 동안 한 스레드가 독점 사용)
+# 쿠키가 없는 세션은 점검에서 탈락시켜 새로 발급
+_pytrends_pool = SessionPool(_new_pytrends, health_check=lambda pt: bool(pt.cookies))
+
+def get_pytrends_pool():
+    """모든 PyTrends 요청이 공유하는 세션 풀 (warm(), stats() 등)"""
+    return _pytrends_pool
+
+# 429 재시도 정책 (지수 백오프 + Retry-After, 연속 429 시 서킷 브레이커로 즉시 실패)
+_retry_policy = RetryPolicy(max_attempts=4, base_delay=2.0, max_delay=60.0,
+                            breaker=CircuitBreaker(failure_threshold=3, reset_timeout=120.0))
+
+def get_retry_policy():
+    """PyTrends 요청이 공유하는 재시도 정책 (서킷 브레이커 포함)"""
+    return _retry_policy
+
+def get_retry_stats():
+    """재시도·서킷 브레이커 결정 횟수 (retry, trip, half-open 시험 등) 반환"""
+    return _retry_policy.stats()
+
+def _collect_fetch_metrics():
+    """재시도 정책 · 서킷 브레이커 · 세션 풀 집계를 /metrics에 추가"""
+    retry = get_retry_stats()
+    pool = _pytrends_pool.stats()
+    return [
+        ('edutrend_retry_events_total', 'counter', 'Retry policy and circuit breaker decisions',
+         [({'event': k}, v) for k, v in retry.items() if k != 'circuit_state']),
+        ('edutrend_circuit_open', 'gauge', '1 while the Google Trends circuit breaker is not closed',
+         [({}, int(retry['circuit_state'] != CircuitBreaker.CLOSED))]),
+        ('edutrend_session_pool_events_total', 'counter', 'PyTrends session pool lifecycle events',
+         [({'event': k}, pool[k]) for k in ('created', 'reused', 'recycled', 'create_failures')]),
+        ('edutrend_session_pool_sessions', 'gauge', 'PyTrends sessions by state',
+         [({'state': k}, pool[k]) for k in ('idle', 'leased')]),
+    ]
+
+telemetry.REGISTRY.register_collector(_collect_fetch_metrics)
+
+# 세션 간 중복 수집 방지 (같은 timeframe·gprop의 겹치는 키워드는 진행 중인 수집 결과를 공유)
+_fetch_flight = KeywordSingleFlight()
+_related_flight = SingleFlight()
+
+def _chunk_keywords(keywords):
+    """키워드를 요청 단위(최대 5개) 청크로 분할"""
+    return [keywords[i:i + CHUNK_SIZE] for i in range(0, len(keywords), CHUNK_SIZE)]
+
+def fetch_trend_data(keywords, timeframe='today 3-m', pytrends_instance=None, deadline=None):
     """
     Google Trends 데이터를 가져옵니다.
     MVP에서는 5개씩 나누어 요청를 보냅니다 (Rate Limit 방지).
     실패 시 Mock Data를 반환할 수도 있도록 처리합니다.
+    deadline(Deadline)을 넘기면 마감 후에는 남은 청크를 요청하지 않고 그때까지 받은 결과를 반환합니다.
     """
-    # 스레드 안전을 위해 인스턴스 사용 또는 새로 생성
-    pt = pytrends_instance if pytrends_instance else _get_pytrends()
-    if pt is None:
-        pt = create_pytrends()
-    if pt is None:
-        return pd.DataFrame()
+    return _fetch_interest_over_time(keywords, timeframe, gprop='', pytrends_instance=pytrends_instance,
+                                     deadline=deadline)
+
+def _request_interest(pt, chunk, timeframe, gprop, deadline):
+    pt.deadline = deadline
+    try:
+        pt.build_payload(chunk, cat=0, timeframe=timeframe, geo='KR', gprop=gprop)
+        return pt.interest_over_time()
+    finally:
+        pt.deadline = None
 
+def _fetch_interest_over_time(keywords, timeframe, gprop='', pytrends_instance=None, deadline=None):
+    """
+    웹/YouTube 공통 청크 수집 루프.
+    요청 간격은 공용 토큰 버킷(RateLimitedTrendReq), 429 재시도는 _retry_policy가 담당합니다.
+    pytrends_instance를 넘기지 않으면 청크마다 세션 풀에서 세션을 빌려 쓰고 반납합니다
+    (오류가 난 세션은 폐기되어 재시도는 새 세션으로 진행).
+    청크마다 deadline을 확인하여 마감(또는 취소) 후에는 새 청크를 요청하지 않습니다.
+    """
     all_data = pd.DataFrame()
+    label = "YouTube chunk" if gprop == 'youtube' else "chunk"
 
-    # 최대 5개씩 청크 분할
-    chunk_size = 5
-    keyword_chunks = [keywords[i:i + chunk_size] for i in range(0, len(keywords), chunk_size)]
+    for chunk in _chunk_keywords(keywords):
+        if deadline is not None and deadline.expired():
+            print(f"Deadline reached; skipping remaining {label}s from {chunk}")
+            break
+        started = time.monotonic()
+
+        def request():
+            if pytrends_instance is not None:
+                return _request_interest(pytrends_instance, chunk, timeframe, gprop, deadline)
+            timeout = deadline.remaining() if deadline is not None else None
+            with _pytrends_pool.session(timeout=timeout) as pt:
+                return _request_interest(pt, chunk, timeframe, gprop, deadline)
+
+        try:
+            data = _retry_policy.call(request, deadline=deadline)
+        except DeadlineExceeded as e:
+            telemetry.record_chunk(gprop, 'deadline', chunk, time.monotonic() - started)
+            print(f"Deadline reached while fetching {label} {chunk}: {e}")
+            break
+        except CircuitOpenError as e:
+            # 서킷이 열려 있으면 대기 없이 건너뜀 (저장소에 있는 이전 데이터가 대신 사용됨)
+            telemetry.record_chunk(gprop, 'circuit_open', chunk, time.monotonic() - started)
+            print(f"Skipping {label} {chunk}: {e}")
+            continue
+        except Exception as e:
+            telemetry.record_chunk(gprop, 'error', chunk, time.monotonic() - started)
+            print(f"Error fetching {label} {chunk}: {e}")
+            # 에러 발생 시 건너뜀 (전체가 비어있어야 Mock Data로 전환됨)
+            continue
+
+        telemetry.record_chunk(gprop, 'empty' if data.empty else 'ok', chunk, time.monotonic() - started)
+        if not data.empty:
+            # isPartial 컬럼 제거
+            if 'isPartial' in data.columns:
+                data = data.drop(columns=['isPartial'])
+
+            # 중복 컬럼 제거
+            data = data.loc[:, ~data.columns.duplicated()]
+
+            # 데이터 병합
+            if all_data.empty:
+                all_data = data
+            else:
+                # 기존 컬럼과 중복되지 않는 것만 추가
+                new_cols = [c for c in data.columns if c not in all_data.columns]
+                if new_cols:
+                    all_data = pd.concat([all_data, data[new_cols]], axis=1)
 
-    for i, chunk in enumerate(keyword_chunks):
-        retries = 3
-        while retries > 0:
-            try:
-                # 첫 번째 청크는 최소 딜레이, 이후부터는 좀 더 긴 딜레이 (Rate Limit 방지)
-                if i > 0 or retries < 3:
-                    time.sleep(random.uniform(1.0, 2.0))
-                    
-                pt.build_payload(chunk, cat=0, timeframe=timeframe, geo='KR')
-                data = pt.interest_over_time()
-                
-                if not data.empty:
-                    # isPartial 컬럼 제거
-                    if 'isPartial' in data.columns:
-                        data = data.drop(columns=['isPartial'])
-
-                    # 중복 컬럼 제거
-                    data = data.loc[:, ~data.columns.duplicated()]
-
-                    # 데이터 병합
-                    if all_data.empty:
-                        all_data = data
-                    else:
-                        # 기존 컬럼과 중복되지 않는 것만 추가
-                        new_cols = [c for c in data.columns if c not in all_data.columns]
-                        if new_cols:
-                            all_data = pd.concat([all_data, data[new_cols]], axis=1)
-                break # 성공 시 루프 탈출
-            except Exception as e:
-                retries -= 1
-                if "429" in str(e) and retries > 0:
-                    time.sleep(5) # 429 에러 시 5초 대기 후 재시도
-                    continue
-                print(f"Error fetching chunk {chunk}: {e}")
-                # 에러 발생 시 건너뜀 (전체가 비어있어야 Mock Data로 전환됨)
-                break
-            
     return all_data
 
 def fetch_related_queries(keyword, timeframe='today 3-m'):
     """
     특정 키워드의 연관 검색어(Related Queries)를 가져옵니다.
+    여러 세션이 같은 키워드를 동시에 요청하면 한 번만 수집합니다.
     """
+    return _related_flight.do(('related', keyword, timeframe),
+                              lambda: _fetch_related_queries(keyword, timeframe))
+
+def _fetch_related_queries(keyword, timeframe):
     try:
-        # 지연 로딩된 인스턴스 사용
-        pt = _get_pytrends()
-        if pt is None:
-            return []
-        time.sleep(random.uniform(0.2, 0.4))
-        pt.build_payload([keyword], cat=0, timeframe=timeframe, geo='KR')
-        related = pt.related_queries()
+        def request():
+            with _pytrends_pool.session() as pt:
+                pt.build_payload([keyword], cat=0, timeframe=timeframe, geo='KR')
+                return pt.related_queries()
+
+        related = _retry_policy.call(request)
         
         if related and keyword in related:
             # top / rising 중 rising(급상승) 우선, 없으면 top
@@ -121,400 +312,478 @@ def get_mock_related_queries(keyword):
     suffixes = ["강의", "입문", "자격증", "책", "무료", "사용법", "튜토리얼", "전망", "취업"]
     return [f"{keyword} {s}" for s in suffixes]
 
-def calculate_growth_metrics(df):
+# 진단 유형 (우선순위 순서): (진단유형, 진단근거, 주의라벨)
+_DIAGNOSES = [
+    ("⛔ 데이터 부족", "검색 데이터의 30% 이상이 0으로 집계됨", "데이터 부족"),
+    ("⚠️ 저관심도 급등", "초기 관심도가 낮아 성장률이 과장될 수 있음 (Base Effect)", "저관심도 기반"),
+    ("⚠️ 일시 급등 (이슈성)", "평균 대비 과도한 스파이크 발생, 변동성 큼", "일시 급등 가능"),
+    ("✅ 지속 상승", "최근 구간 평균 상승세가 뚜렷하며 변동성 안정적", "지속 상승 유력"),
+    ("📉 하락세", "최근 관심도가 초기 대비 감소함", "하락 반전"),
+    ("📈 완만한 상승", "급격하지 않으나 상승 흐름 유지 중", "상승 흐름"),
+    ("➖ 정체/안정", "큰 변동 없이 관심도 유지 중", "안정"),
+]
+(_DIAG_INSUFFICIENT, _DIAG_LOW_BASE, _DIAG_SPIKE, _DIAG_RISING,
+ _DIAG_FALLING, _DIAG_GRADUAL, _DIAG_STABLE) = range(len(_DIAGNOSES))
+
+# 추천 액션 (우선순위 순서): (추천액션, 기획_리스크)
+_ACTIONS = [
+    ("🚀 신규 기획 검토", "수요 검증됨. 차별화된 심화 주제 발굴 필요."),
+    ("🔄 기존 과정 리뉴얼", "수요 안정적. 최신 트렌드 반영한 리뉴얼 권장."),
+    ("➖ 현상 유지/보류", "큰 변동 없음. 리소스 투입 대비 성과 낮을 수 있음."),
+    ("🧪 단기 테스트 콘텐츠", "일시적 유행 가능성. 웨비나/특강으로 가볍게 수요 검증."),
+    ("⛔ 이번 분기 기획 제외", "관심도 하락 중. 신규 진입 시 리스크 큼."),
+    ("⛔ 데이터 부족", "판단 근거 부족."),
+    ("이번 분기 기획 제외", "특이 신호 없음. 정기적인 모니터링만 수행."),  # 기본값
+]
+
+def _labels(table, codes, field):
+    """라벨 표(table)의 field번째 값을 코드 배열 순서대로 꺼냄 (field가 함수이면 행에 적용한 값)"""
+    values = [field(row) if callable(field) else row[field] for row in table]
+    return np.array(values, dtype=object)[codes]
+
+def calculate_growth_metrics(df, features=None):
     """
     데이터프레임을 받아 성장률, 상태, 그리고 '추세 진단(Diagnosis)'을 계산합니다.
+    통계량은 특성 테이블(features.build_features)에서 읽고, 진단·액션 라벨을 배열 연산(np.select)으로 한 번에 계산합니다.
+
+    Args:
+        df: 웹 트렌드 DataFrame
+        features: 같은 df로 만든 특성 테이블 (없으면 새로 계산)
     """
-    results = []
-    
     if df.empty:
         return pd.DataFrame()
+    if features is None:
+        features = build_features(df)
+    return growth_metrics_from_features(features)
 
-    n_rows = len(df)
-    if n_rows < 10:
-        early_period = df
-        recent_period = df
-    else:
-        split_idx = int(n_rows * 0.3)
-        early_period = df.iloc[:split_idx]
-        recent_period = df.iloc[-split_idx:]
-    
-    # 4주(약 28일) 기준 윈도우 비교를 위한 인덱스 계산 (데이터가 일별이라고 가정)
-    last_4w_idx = max(0, n_rows - 28)
-    prev_4w_idx = max(0, n_rows - 56)
-        
-    # 모든 컬럼에 대해 한꺼번에 통계량 계산 (벡터화)
-    early_means = early_period.mean()
-    recent_means = recent_period.mean()
-    total_means = df.mean()
-    total_stds = df.std()
-    max_vals = df.max()
-    
-    # 0 비율 계산
-    zero_ratios = (df == 0).sum() / n_rows
-
-    # 최근 및 이전 4주 평균
-    recent_4w_means = df.iloc[last_4w_idx:].mean()
-    prev_4w_means = df.iloc[prev_4w_idx:last_4w_idx].mean() if prev_4w_idx < last_4w_idx else early_means
-
-    for keyword in df.columns:
-        # 1. 기본 통계 (미리 계산된 값 사용)
-        early_mean = float(early_means.get(keyword, 0))
-        recent_mean = float(recent_means.get(keyword, 0))
-        total_mean = float(total_means.get(keyword, 0))
-        std_dev = float(total_stds.get(keyword, 0))
-        max_val = float(max_vals.get(keyword, 0))
-        zero_ratio = float(zero_ratios.get(keyword, 0))
-        recent_4w_mean = float(recent_4w_means.get(keyword, 0))
-        prev_4w_mean = float(prev_4w_means.get(keyword, 0))
-
-        # NaN 처리
-        early_mean = 0.0 if pd.isna(early_mean) else early_mean
-        recent_mean = 0.0 if pd.isna(recent_mean) else recent_mean
-        total_mean = 0.0 if pd.isna(total_mean) else total_mean
-        std_dev = 0.0 if pd.isna(std_dev) else std_dev
-
-        # 2. 성장률 계산 (기존 로직 유지 + 보완)
-        if early_mean < 1.0:
-            if recent_mean > 5.0:
-                growth_rate = 999.0 # Low base effect
-            else:
-                growth_rate = 0.0
-        else:
-            growth_rate = ((recent_mean - early_mean) / early_mean) * 100
-            
-        # 3. 상세 진단 지표 계산
-        
-        # A) 데이터 부족 여부
-        is_insufficient = zero_ratio > 0.3
-        
-        # B) 변동성 (변동계수 CV = std / mean)
-        cv = std_dev / total_mean if total_mean > 0 else 0
-        volatility_label = "높음" if cv > 0.5 else ("보통" if cv > 0.2 else "낮음")
-        
-        # C) 스파이크 여부
-        is_spike = (max_val > total_mean + 2 * std_dev) or (max_val > 2.5 * recent_mean)
-        
-        # D) 최근 추세
-        is_rising_short_term = recent_4w_mean > prev_4w_mean * 1.1 # 10% 이상 상승
-        
-        # 4. 최종 진단 라벨링 (Heuristics)
-        diagnosis_type = "관찰 필요"
-        diagnosis_reason = "특이 사항 없음"
-        caution_label = "-"
-        
-        if is_insufficient:
-            diagnosis_type = "⛔ 데이터 부족"
-            diagnosis_reason = "검색 데이터의 30% 이상이 0으로 집계됨"
-            caution_label = "데이터 부족"
-        elif early_mean < 5 and growth_rate > 100:
-            diagnosis_type = "⚠️ 저관심도 급등"
-            diagnosis_reason = "초기 관심도가 낮아 성장률이 과장될 수 있음 (Base Effect)"
-            caution_label = "저관심도 기반"
-        elif is_spike and volatility_label == "높음":
-            diagnosis_type = "⚠️ 일시 급등 (이슈성)"
-            diagnosis_reason = "평균 대비 과도한 스파이크 발생, 변동성 큼"
-            caution_label = "일시 급등 가능"
-        elif growth_rate > 10 and is_rising_short_term and volatility_label != "높음":
-            diagnosis_type = "✅ 지속 상승"
-            diagnosis_reason = "최근 구간 평균 상승세가 뚜렷하며 변동성 안정적"
-            caution_label = "지속 상승 유력"
-        elif growth_rate < -5:
-            diagnosis_type = "📉 하락세"
-            diagnosis_reason = "최근 관심도가 초기 대비 감소함"
-            caution_label = "하락 반전"
-        elif growth_rate > 0:
-            diagnosis_type = "📈 완만한 상승"
-            diagnosis_reason = "급격하지 않으나 상승 흐름 유지 중"
-            caution_label = "상승 흐름"
-        else:
-            diagnosis_type = "➖ 정체/안정"
-            diagnosis_reason = "큰 변동 없이 관심도 유지 중"
-            caution_label = "안정"
-
-        # 5. Planning Insight & Action Recommendation (PM Logic)
-        insight_target = "입문/기초 타겟 적합" if "기초" in keyword or "입문" in keyword else "실무/중급 타겟 고려"
-        if "자격증" in keyword: insight_target = "취업/자격증 취득 목표 타겟"
-        
-        insight_position = "트렌드 리포트형 콘텐츠" if volatility_label == "높음" else "커리큘럼형/로드맵 콘텐츠"
-        
-        # Action Logic
-        action_label = "이번 분기 기획 제외" # Default
-        insight_risk = "특이 신호 없음. 정기적인 모니터링만 수행." # Default
-        if diagnosis_type == "✅ 지속 상승":
-            action_label = "🚀 신규 기획 검토"
-            insight_risk = "수요 검증됨. 차별화된 심화 주제 발굴 필요."
-        elif diagnosis_type == "➖ 정체/안정":
-            if recent_mean > 40:
-                action_label = "🔄 기존 과정 리뉴얼"
-                insight_risk = "수요 안정적. 최신 트렌드 반영한 리뉴얼 권장."
-            else:
-                action_label = "➖ 현상 유지/보류"
-                insight_risk = "큰 변동 없음. 리소스 투입 대비 성과 낮을 수 있음."
-        elif "급등" in diagnosis_type or volatility_label == "높음":
-            action_label = "🧪 단기 테스트 콘텐츠"
-            insight_risk = "일시적 유행 가능성. 웨비나/특강으로 가볍게 수요 검증."
-        elif diagnosis_type == "📉 하락세":
-            action_label = "⛔ 이번 분기 기획 제외"
-            insight_risk = "관심도 하락 중. 신규 진입 시 리스크 큼."
-        elif is_insufficient:
-             action_label = "⛔ 데이터 부족"
-             insight_risk = "판단 근거 부족."
-
-        results.append({
-            '키워드': keyword,
-            '성장률(%)': round(growth_rate, 1),
-            '최근 관심도': round(recent_mean, 1),
-            '상태': diagnosis_type.split(" ")[-1] if " " in diagnosis_type else diagnosis_type, 
-            '진단유형': diagnosis_type,
-            '진단근거': diagnosis_reason,
-            '주의라벨': caution_label,
-            '변동성': volatility_label,
-            '추천액션': action_label, # New Column
-            '기획_타겟': insight_target,
-            '기획_포지션': insight_position,
-            '기획_리스크': insight_risk,
-            '카테고리': get_category(keyword)
-        })
-        
-    return pd.DataFrame(results)
-
-def get_mock_data(keywords, timeframe='today 3-m'):
+def growth_metrics_from_features(features):
+    """
+    특성 테이블의 웹 통계량(web_*)만으로 calculate_growth_metrics 결과를 만듭니다.
+    IncrementalMetrics처럼 원본 DataFrame 없이 통계량을 유지하는 경우에 사용합니다.
+    """
+    # 1. 기본 통계 · 2. 성장률 · 3-B) 변동계수 (특성 테이블)
+    early_mean = features['web_early_mean'].to_numpy()
+    recent_mean = features['web_recent_mean'].to_numpy()
+    total_mean = features['web_mean'].to_numpy()
+    std_dev = features['web_std'].to_numpy()
+    max_val = features['web_max'].to_numpy()
+    zero_ratio = features['web_zero_ratio'].to_numpy()
+    recent_4w_mean = features['web_recent_4w_mean'].to_numpy()
+    prev_4w_mean = features['web_prev_4w_mean'].to_numpy()
+    growth_rate = features['web_growth'].to_numpy()
+    cv = features['web_cv'].to_numpy()
+
+    # A) 데이터 부족 여부
+    is_insufficient = zero_ratio > 0.3
+    volatility = np.select([cv > 0.5, cv > 0.2], ["높음", "보통"], default="낮음").astype(object)
+    is_volatile = cv > 0.5
+    # C) 스파이크 여부
+    is_spike = (max_val > total_mean + 2 * std_dev) | (max_val > 2.5 * recent_mean)
+    # D) 최근 추세 (10% 이상 상승)
+    is_rising_short_term = recent_4w_mean > prev_4w_mean * 1.1
+
+    # 4. 최종 진단 라벨링 (Heuristics) - 조건 순서가 우선순위
+    diagnosis = np.select(
+        [
+            is_insufficient,
+            (early_mean < 5) & (growth_rate > 100),
+            is_spike & is_volatile,
+            (growth_rate > 10) & is_rising_short_term & ~is_volatile,
+            growth_rate < -5,
+            growth_rate > 0,
+        ],
+        [_DIAG_INSUFFICIENT, _DIAG_LOW_BASE, _DIAG_SPIKE, _DIAG_RISING, _DIAG_FALLING, _DIAG_GRADUAL],
+        default=_DIAG_STABLE,
+    )
+
+    # 5. Planning Insight & Action Recommendation (PM Logic)
+    action = np.select(
+        [
+            diagnosis == _DIAG_RISING,
+            (diagnosis == _DIAG_STABLE) & (recent_mean > 40),
+            diagnosis == _DIAG_STABLE,
+            (diagnosis == _DIAG_LOW_BASE) | (diagnosis == _DIAG_SPIKE) | is_volatile,  # 급등 유형 또는 변동성 높음
+            diagnosis == _DIAG_FALLING,
+            is_insufficient,
+        ],
+        range(len(_ACTIONS) - 1),
+        default=len(_ACTIONS) - 1,
+    )
+
+    keywords = features.index.astype(str)
+    insight_target = np.where(
+        keywords.str.contains("자격증", regex=False), "취업/자격증 취득 목표 타겟",
+        np.where(keywords.str.contains("기초", regex=False) | keywords.str.contains("입문", regex=False),
+                 "입문/기초 타겟 적합", "실무/중급 타겟 고려"),
+    ).astype(object)
+    insight_position = np.where(is_volatile, "트렌드 리포트형 콘텐츠", "커리큘럼형/로드맵 콘텐츠").astype(object)
+
+    return pd.DataFrame({
+        '키워드': list(features.index),
+        # Python round와 같은 반올림 결과 유지 (np.round는 .x5 경계에서 다를 수 있음)
+        '성장률(%)': [round(v, 1) for v in growth_rate.tolist()],
+        '최근 관심도': [round(v, 1) for v in recent_mean.tolist()],
+        '상태': _labels(_DIAGNOSES, diagnosis, lambda row: row[0].split(" ")[-1]),
+        '진단유형': _labels(_DIAGNOSES, diagnosis, 0),
+        '진단근거': _labels(_DIAGNOSES, diagnosis, 1),
+        '주의라벨': _labels(_DIAGNOSES, diagnosis, 2),
+        '변동성': volatility,
+        '추천액션': _labels(_ACTIONS, action, 0),
+        '기획_타겟': insight_target,
+        '기획_포지션': insight_position,
+        '기획_리스크': _labels(_ACTIONS, action, 1),
+        '카테고리': features['category'].to_numpy(),
+    })
+
+def get_mock_data(keywords, timeframe='today 3-m', index=None, seed=MOCK_SEED):
     """
     PyTrends 연결 실패 시 사용할 데모용 Mock Data 생성
+    index를 넘기면 그 날짜 인덱스에 맞춰 생성 (수집에 실패한 키워드만 채울 때 사용)
     """
-    dates = pd.date_range(end=pd.Timestamp.now(), periods=90) # approx 3 months
-    df = pd.DataFrame(index=dates)
-
-    for kw in keywords:
-        # 랜덤 추세 생성
-        base = random.randint(10, 50)
-        trend = random.choice([-0.1, 0, 0.2, 0.5]) # 하락, 정체, 상승, 급상승
-        noise = [random.randint(-5, 5) for _ in range(90)]
-        values = [max(0, min(100, base + (i * trend) + n)) for i, n in enumerate(noise)]
-        df[kw] = values
-
-    return df
+    # 약 3개월, 키워드별 랜덤 추세 (하락, 정체, 상승, 급상승)
+    return generate_panel(keywords, days=90, index=index, archetypes=('trend',), seed=seed,
+                          base_range=(10, 50), noise=5, slopes=(-0.1, 0, 0.2, 0.5))
 
 
 # =============================================================================
 # 다중 신호 데이터 수집 (YouTube Search 추가)
 # =============================================================================
 
-def fetch_youtube_trend_data(keywords, timeframe='today 3-m', pytrends_instance=None):
+def fetch_youtube_trend_data(keywords, timeframe='today 3-m', pytrends_instance=None, deadline=None):
     """
     YouTube Search 트렌드 데이터를 가져옵니다.
     gprop='youtube'로 YouTube 검색 트렌드 수집.
     """
-    # 스레드 안전을 위해 인스턴스 사용 또는 새로 생성
-    pt = pytrends_instance if pytrends_instance else _get_pytrends()
-    if pt is None:
-        pt = create_pytrends()
-    if pt is None:
-        return pd.DataFrame()
+    return _fetch_interest_over_time(keywords, timeframe, gprop='youtube', pytrends_instance=pytrends_instance,
+                                     deadline=deadline)
 
-    all_data = pd.DataFrame()
-    chunk_size = 5
-    keyword_chunks = [keywords[i:i + chunk_size] for i in range(0, len(keywords), chunk_size)]
 
-    for i, chunk in enumerate(keyword_chunks):
-        retries = 3
-        while retries > 0:
-            try:
-                # 첫 번째 청크는 최소 딜레이, 이후부터는 좀 더 긴 딜레이 (Rate Limit 방지)
-                if i > 0 or retries < 3:
-                    time.sleep(random.uniform(1.0, 2.0))
-                    
-                pt.build_payload(chunk, cat=0, timeframe=timeframe, geo='KR', gprop='youtube')
-                data = pt.interest_over_time()
-
-                if not data.empty:
-                    if 'isPartial' in data.columns:
-                        data = data.drop(columns=['isPartial'])
-
-                    # 중복 컬럼 제거
-                    data = data.loc[:, ~data.columns.duplicated()]
-
-                    if all_data.empty:
-                        all_data = data
-                    else:
-                        # 기존 컬럼과 중복되지 않는 것만 추가
-                        new_cols = [c for c in data.columns if c not in all_data.columns]
-                        if new_cols:
-                            all_data = pd.concat([all_data, data[new_cols]], axis=1)
-                break # 성공 시 루프 탈출
-            except Exception as e:
-                retries -= 1
-                if "429" in str(e) and retries > 0:
-                    time.sleep(5)
-                    continue
-                print(f"Error fetching YouTube chunk {chunk}: {e}")
-                break
+def _fetch_signal(keywords, timeframe, gprop='', store=None, daily=False, deadline=None):
+    """
+    단일 gprop('' = 웹, 'youtube')의 트렌드를 수집합니다.
+    다른 세션이 같은 키워드를 수집 중이면 새로 요청하지 않고 그 결과를 기다립니다.
+    daily=True이면 긴 기간도 일별 구간을 이어 붙여 일별 데이터로 수집합니다.
+    """
+    signal_fn = fetch_youtube_trend_data if gprop == 'youtube' else fetch_trend_data
 
-    return all_data
+    def fetch_fn(kws, tf):
+        return signal_fn(kws, tf, deadline=deadline)
+
+    def fetch_chunks(kws, tf):
+        # 청크마다 세션 풀에서 세션을 빌려 쓰므로 스레드별 인스턴스를 따로 만들지 않음
+        # 마감으로 과거 구간을 받지 못한 키워드도 받은 구간은 그대로 반환 (저장소가 저장하고 다음 갱신 때 앞부분만 요청)
+        if not daily:
+            return fetch_fn(kws, tf)
+        return fetch_daily_history(fetch_fn, kws, tf)
+
+    def fetch(kws):
+        if store is not None:
+            return store.fetch_incremental(kws, timeframe, fetch_chunks, gprop=gprop)
+        return fetch_chunks(kws, timeframe)
+
+    return _fetch_flight.fetch(keywords, (timeframe, gprop, 'KR', daily), fetch)
+
+
+def keyword_provenance(df, keywords):
+    """
+    키워드별 데이터 출처.
+    저장소 경로는 df.attrs['provenance']를 그대로 쓰고, 그 외에는 수집된 컬럼을 'fresh', 없는 키워드를 'missing'으로 봅니다.
+
+    Returns:
+        dict: {키워드: 'fresh' | 'cached' | 'stale' | 'partial' | 'missing'}
+    """
+    recorded = df.attrs.get('provenance', {}) if df is not None else {}
+    columns = set(df.columns) if df is not None else set()
+    return {
+        kw: recorded.get(kw, 'fresh' if kw in columns else 'missing')
+        for kw in keywords
+    }
 
 
-def fetch_multi_signal_data(keywords, timeframe='today 3-m'):
+def fetch_multi_signal_data(keywords, timeframe='today 3-m', store=None, daily=False, deadline=FETCH_DEADLINE):
     """
     웹 검색과 YouTube 검색 트렌드를 병렬로 가져옵니다.
-    각 스레드에서 별도의 PyTrends 인스턴스를 사용하여 경합 방지.
-    Returns: dict with 'web' and 'youtube' DataFrames
+    각 요청은 세션 풀에서 독점 세션을 빌려 쓰므로 스레드 간 경합이 없습니다.
+    store(TrendStore)를 넘기면 저장소에 없는 날짜만 요청하고 나머지는 저장된 값을 사용합니다.
+    daily=True이면 12개월 등 긴 기간도 일별 데이터로 수집합니다 (짧은 기간은 slice_timeframe으로 파생).
+    일부 청크가 실패해도 성공한 키워드는 그대로 반환하며, 키워드별 출처는 'provenance'에 기록합니다.
+
+    deadline(초 또는 Deadline)이 지나면 남은 청크는 요청하지 않고 그때까지 받은 결과를 반환합니다.
+    반환 후에도 작업 스레드가 남아 있으면 취소하여 토큰을 더 쓰지 않게 합니다.
+    기본값 FETCH_DEADLINE은 사용자가 기다리는 수집용이며, 빈 저장소의 일별 12개월 수집처럼
+    요청 수가 많은 백그라운드 갱신은 deadline=None으로 호출합니다.
+
+    Returns: dict with 'web' and 'youtube' DataFrames, 'provenance' ({'web': {...}, 'youtube': {...}})
+             and 'completeness' ({'web': {...}, 'youtube': {...}, 'deadline_exceeded', 'elapsed'})
     """
+    if not isinstance(deadline, Deadline):
+        deadline = Deadline(deadline)
+    started = time.monotonic()
     results = {'web': pd.DataFrame(), 'youtube': pd.DataFrame()}
 
     def fetch_web():
-        # 각 스레드에서 독립적인 인스턴스 생성
-        pt = create_pytrends()
-        return fetch_trend_data(keywords, timeframe, pytrends_instance=pt)
+        return _fetch_signal(keywords, timeframe, gprop='', store=store, daily=daily, deadline=deadline)
 
     def fetch_youtube():
-        # 각 스레드에서 독립적인 인스턴스 생성
-        pt = create_pytrends()
-        return fetch_youtube_trend_data(keywords, timeframe, pytrends_instance=pt)
+        return _fetch_signal(keywords, timeframe, gprop='youtube', store=store, daily=daily, deadline=deadline)
 
-    # 병렬 실행 (동시성 2로 제한하여 Rate Limit 방지)
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        try:
-            web_future = executor.submit(fetch_web)
-            # YouTube는 상당 수준의 시차를 두고 시작하여 구글 서버의 요청 밀집 방지
-            time.sleep(2.0)
-            youtube_future = executor.submit(fetch_youtube)
+    # 병렬 실행 (두 스레드의 요청은 공용 토큰 버킷에서 합산되어 조절됨)
+    # 작업 스레드는 마감 후 다음 확인 지점에서 스스로 멈추므로, 마감 + 여유 시간까지만 기다림
+    executor = ThreadPoolExecutor(max_workers=2)
+    futures = {'web': executor.submit(fetch_web), 'youtube': executor.submit(fetch_youtube)}
+    try:
+        for signal, future in futures.items():
+            remaining = deadline.remaining()
+            try:
+                results[signal] = future.result(
+                    timeout=remaining + DEADLINE_GRACE if remaining is not None else None
+                )
+            except Exception as e:
+                print(f"Error in parallel data fetching ({signal}): {e}")
+                # 개별 결과가 이미 비어있는 DataFrame으로 초기화되어 있음
+    finally:
+        deadline.cancel()
+        executor.shutdown(wait=False)
+
+    results['provenance'] = {
+        'web': keyword_provenance(results['web'], keywords),
+        'youtube': keyword_provenance(results['youtube'], keywords),
+    }
+    results['completeness'] = {
+        signal: _completeness(results['provenance'][signal]) for signal in ('web', 'youtube')
+    }
+    results['completeness'].update(
+        deadline_exceeded=deadline.expires_at is not None and time.monotonic() >= deadline.expires_at,
+        elapsed=round(time.monotonic() - started, 2),
+    )
+    return results
 
-            results['web'] = web_future.result(timeout=30)
-            results['youtube'] = youtube_future.result(timeout=30)
-        except Exception as e:
-            print(f"Error in parallel data fetching: {e}")
-            # 개별 결과가 이미 비어있는 DataFrame으로 초기화되어 있음
-            pass
 
-    return results
+def _completeness(provenance):
+    """출처 기록에서 이번 수집의 완료율 계산 ('stale'·'missing'은 이번에 받지 못한 키워드)"""
+    received = sum(1 for status in provenance.values() if status in ('fresh', 'cached'))
+    total = len(provenance)
+    return {
+        'requested': total,
+        'received': received,
+        'ratio': round(received / total, 3) if total else 1.0,
+    }
 
 
-def get_mock_youtube_data(keywords):
+# =============================================================================
+# 기간 계층 (가장 긴 기간을 한 번 수집하고 짧은 기간은 잘라서 사용)
+# =============================================================================
+
+def _renormalize_groups(df, keywords, exclude=()):
     """
-    YouTube 트렌드 데모용 Mock Data 생성.
-    웹 검색과 다른 패턴을 시뮬레이션합니다.
+    요청 청크(5개) 단위로 구간 최대값이 100이 되도록 다시 맞춥니다.
+    같은 청크의 키워드끼리 함께 정규화하는 Google Trends 방식을 그대로 따릅니다.
+    exclude의 컬럼(Mock으로 채운 키워드 등)은 정규화에 참여하지 않고 그대로 둡니다.
     """
-    dates = pd.date_range(end=pd.Timestamp.now(), periods=90)
-    df = pd.DataFrame(index=dates)
+    result = df.astype(float)
+    for group in _chunk_keywords(keywords):
+        cols = [kw for kw in group if kw in result.columns and kw not in exclude]
+        if not cols:
+            continue
+        peak = result[cols].max().max()
+        if pd.notna(peak) and peak > 0:
+            result[cols] = (result[cols] * (100 / peak)).round()
+    return result
 
-    for kw in keywords:
-        # YouTube는 웹과 다른 패턴 (영상 콘텐츠 특성 반영)
-        base = random.randint(5, 40)
-        # YouTube는 급등/급락이 더 빈번한 경향
-        trend = random.choice([-0.2, 0, 0.3, 0.8])
-        noise = [random.randint(-8, 8) for _ in range(90)]
-        values = [max(0, min(100, base + (i * trend) + n)) for i, n in enumerate(noise)]
-        df[kw] = values
+def _stitch_windows(frames, keywords):
+    """
+    최신 구간부터 과거 구간 순서로 받은 DataFrame들을 하나의 일별 시계열로 이어 붙입니다.
+    과거 구간은 겹치는 날짜의 청크 합계 비율로 최신 구간 스케일에 맞춘 뒤 앞에 붙입니다.
+    """
+    stitched = frames[0].astype(float)
+    for older in frames[1:]:
+        if older.empty:
+            continue
+        older = older.astype(float)
+        common_idx = stitched.index.intersection(older.index)
+
+        for group in _chunk_keywords(keywords):
+            cols = [kw for kw in group if kw in older.columns and kw in stitched.columns]
+            if not cols or len(common_idx) == 0:
+                continue
+            newer_sum = stitched.loc[common_idx, cols].sum().sum()
+            older_sum = older.loc[common_idx, cols].sum().sum()
+            if older_sum > 0:
+                older[cols] = older[cols] * (newer_sum / older_sum)
 
-    return df
+        earlier = older.loc[older.index < stitched.index.min()]
+        stitched = pd.concat([earlier, stitched])
 
+    return _renormalize_groups(stitched, keywords)
 
-def analyze_cross_signals(web_metrics, youtube_df, keywords):
+def fetch_daily_history(fetch_fn, keywords, timeframe, today=None):
     """
-    웹 검색과 YouTube 검색 신호를 교차 분석하여
-    '학습 의도 신호 강도'를 판단합니다.
+    timeframe 전체를 일별 데이터로 수집합니다.
 
-    목적: 정확한 예측이 아닌, 판단 보완을 위한 신호 교차 확인
+    Google Trends는 약 9개월(269일)이 넘는 기간을 주별로만 돌려주므로,
+    긴 기간은 STITCH_OVERLAP_DAYS만큼 겹치는 일별 구간 여러 개로 나눠 요청하고 이어 붙입니다.
+    (12개월 = 요청 2회. 3·6개월 보기는 slice_timeframe으로 이 결과에서 파생)
 
-    Returns: DataFrame with cross-signal analysis
+    Args:
+        fetch_fn: fetch_fn(keywords, timeframe) -> DataFrame (예: fetch_trend_data)
+        keywords: 키워드 리스트
+        timeframe: PyTrends timeframe 문자열 ('YYYY-MM-DD YYYY-MM-DD'이면 그 구간, 그 외에는 오늘까지)
+
+    Returns:
+        DataFrame: 날짜 인덱스(일별), 키워드 컬럼
     """
-    results = []
+    end = timeframe_end(timeframe, today)
+    start = timeframe_start(timeframe, end)
+    if start is None or (end - start).days <= DAILY_MAX_DAYS:
+        return fetch_fn(keywords, timeframe)
+
+    frames = []
+    window_end = end
+    while True:
+        window_start = max(start, window_end - pd.Timedelta(days=DAILY_MAX_DAYS - 1))
+        data = fetch_fn(keywords, f"{window_start:%Y-%m-%d} {window_end:%Y-%m-%d}")
+        if data is None or data.empty:
+            # 최신 구간이 실패하면 이어 붙일 기준이 없으므로 중단
+            if not frames:
+                return pd.DataFrame()
+        else:
+            frames.append(data)
+        if window_start <= start:
+            break
+        window_end = window_start + pd.Timedelta(days=STITCH_OVERLAP_DAYS)
 
-    if youtube_df.empty:
-        youtube_df = get_mock_youtube_data(keywords)
+    return _stitch_windows(frames, keywords)
 
-    # YouTube 성장률 계산
-    n_rows = len(youtube_df) if not youtube_df.empty else 0
+def slice_timeframe(df, timeframe, keywords=None, renormalize=True, exclude=()):
+    """
+    긴 기간의 일별 데이터에서 짧은 기간(예: 'today 3-m')을 잘라냅니다.
+    잘라낸 구간에서 청크별 최대값이 100이 되도록 다시 정규화하여
+    해당 기간을 직접 요청했을 때와 같은 스케일로 맞춥니다.
 
-    for kw in keywords:
-        web_row = web_metrics[web_metrics['키워드'] == kw]
-        if web_row.empty:
-            continue
+    Args:
+        df: 날짜 인덱스, 키워드 컬럼 DataFrame
+        timeframe: 잘라낼 PyTrends timeframe 문자열
+        keywords: 수집 시 사용한 키워드 순서 (청크 구성 재현용, 기본값: 컬럼 순서)
+        renormalize: False이면 자르기만 함 (Mock 데이터 등)
+        exclude: 자르기만 하고 정규화하지 않을 컬럼 (일부만 Mock으로 채운 키워드)
 
-        web_growth = web_row.iloc[0]['성장률(%)']
-        web_recent = web_row.iloc[0]['최근 관심도']
-        web_volatility = web_row.iloc[0]['변동성']
+    Returns:
+        DataFrame: 잘라내고 다시 정규화한 DataFrame
+    """
+    if df.empty:
+        return df
 
-        # YouTube 지표 계산
-        if kw in youtube_df.columns and n_rows >= 10:
-            yt_series = youtube_df[kw]
-            # 중복 컬럼으로 인해 DataFrame이 반환되는 경우 처리
-            if isinstance(yt_series, pd.DataFrame):
-                yt_series = yt_series.iloc[:, 0]
+    start = timeframe_start(timeframe, df.index.max())
+    sliced = df.loc[df.index >= start] if start is not None else df
+    if not renormalize:
+        return sliced
+    return _renormalize_groups(sliced, keywords or list(df.columns), exclude)
 
-            split_idx = int(n_rows * 0.3)
-            yt_early = float(yt_series.iloc[:split_idx].mean())
-            yt_recent = float(yt_series.iloc[-split_idx:].mean())
 
-            # NaN 체크
-            if pd.isna(yt_early) or yt_early < 1.0:
-                yt_growth = 999.0 if (not pd.isna(yt_recent) and yt_recent > 5.0) else 0.0
-            else:
-                yt_growth = ((yt_recent - yt_early) / yt_early) * 100
-        else:
-            # Mock 또는 데이터 없음
-            yt_growth = web_growth * random.uniform(0.5, 1.5)
-            yt_recent = web_recent * random.uniform(0.3, 1.2)
-
-        # === 교차 신호 해석 ===
-        signal_pattern = ""
-        signal_interpretation = ""
-        signal_strength = "보통"  # 낮음, 보통, 높음
-
-        # 패턴 1: 웹 안정 + YouTube 급상승 → 영상 학습 수요 증가 신호
-        if abs(web_growth) < 15 and yt_growth > 30:
-            signal_pattern = "영상 전환 신호"
-            signal_interpretation = "웹 검색은 안정적이나 YouTube 검색 급상승. 영상/강의 형태 수요 증가 가능성."
-            signal_strength = "높음"
-
-        # 패턴 2: 웹 + YouTube 모두 상승 → 강한 학습 수요 신호
-        elif web_growth > 10 and yt_growth > 10:
-            signal_pattern = "복합 상승 신호"
-            signal_interpretation = "웹과 YouTube 모두 상승세. 다양한 형태의 학습 탐색이 활발함."
-            signal_strength = "높음"
-
-        # 패턴 3: 웹 상승 + YouTube 정체/하락 → 정보 탐색 단계
-        elif web_growth > 15 and yt_growth < 5:
-            signal_pattern = "정보 탐색 단계"
-            signal_interpretation = "웹 검색 증가 중이나 영상 탐색은 미미. 아직 학습 단계 진입 전일 수 있음."
-            signal_strength = "보통"
-
-        # 패턴 4: 웹 하락 + YouTube 상승 → 학습 채널 이동
-        elif web_growth < -5 and yt_growth > 10:
-            signal_pattern = "채널 이동 신호"
-            signal_interpretation = "웹 검색 감소, YouTube 검색 증가. 학습 채널이 영상으로 이동 중일 수 있음."
-            signal_strength = "보통"
-
-        # 패턴 5: 둘 다 하락 → 관심 감소
-        elif web_growth < -5 and yt_growth < -5:
-            signal_pattern = "관심 감소 신호"
-            signal_interpretation = "웹과 YouTube 모두 하락세. 전반적인 관심 감소 추세."
-            signal_strength = "낮음"
-
-        # 패턴 6: 둘 다 정체 → 안정적 수요
-        elif abs(web_growth) < 10 and abs(yt_growth) < 10:
-            signal_pattern = "안정 유지"
-            signal_interpretation = "웹과 YouTube 모두 큰 변동 없음. 기존 관심도 유지 중."
-            signal_strength = "보통"
+def get_mock_youtube_data(keywords, index=None, seed=MOCK_SEED + 1):
+    """
+    YouTube 트렌드 데모용 Mock Data 생성.
+    웹 검색과 다른 패턴을 시뮬레이션합니다.
+    index를 넘기면 그 날짜 인덱스에 맞춰 생성합니다.
+    """
+    # YouTube는 웹과 다른 패턴 (영상 콘텐츠 특성 반영): 기준값이 낮고 급등/급락이 더 빈번한 경향
+    return generate_panel(keywords, days=90, index=index, archetypes=('trend',), seed=seed,
+                          base_range=(5, 40), noise=8, slopes=(-0.2, 0, 0.3, 0.8))
+
+
+# 교차 신호 패턴 (우선순위 순서): (신호_패턴, 신호_해석, 신호_강도)
+_CROSS_SIGNAL_PATTERNS = [
+    # 패턴 1: 웹 안정 + YouTube 급상승 → 영상 학습 수요 증가 신호
+    ("영상 전환 신호", "웹 검색은 안정적이나 YouTube 검색 급상승. 영상/강의 형태 수요 증가 가능성.", "높음"),
+    # 패턴 2: 웹 + YouTube 모두 상승 → 강한 학습 수요 신호
+    ("복합 상승 신호", "웹과 YouTube 모두 상승세. 다양한 형태의 학습 탐색이 활발함.", "높음"),
+    # 패턴 3: 웹 상승 + YouTube 정체/하락 → 정보 탐색 단계
+    ("정보 탐색 단계", "웹 검색 증가 중이나 영상 탐색은 미미. 아직 학습 단계 진입 전일 수 있음.", "보통"),
+    # 패턴 4: 웹 하락 + YouTube 상승 → 학습 채널 이동
+    ("채널 이동 신호", "웹 검색 감소, YouTube 검색 증가. 학습 채널이 영상으로 이동 중일 수 있음.", "보통"),
+    # 패턴 5: 둘 다 하락 → 관심 감소
+    ("관심 감소 신호", "웹과 YouTube 모두 하락세. 전반적인 관심 감소 추세.", "낮음"),
+    # 패턴 6: 둘 다 정체 → 안정적 수요
+    ("안정 유지", "웹과 YouTube 모두 큰 변동 없음. 기존 관심도 유지 중.", "보통"),
+    ("혼합 신호", "명확한 패턴 없음. 추가 관찰 필요.", "낮음"),
+]
+
+def _keyword_metrics(web_metrics, keywords):
+    """
+    메트릭스를 키워드 인덱스로 바꾸고 keywords 순서대로 (메트릭스에 있는 키워드만) 행을 꺼냅니다.
+    같은 키워드가 여러 행이면 첫 번째 행을 사용합니다.
+    """
+    if '키워드' not in web_metrics.columns:
+        # 빈 메트릭스 (calculate_growth_metrics에 빈 데이터를 넘긴 경우)
+        return pd.DataFrame(columns=['성장률(%)', '최근 관심도', '변동성'], index=pd.Index([], name='키워드'))
+    indexed = web_metrics.drop_duplicates('키워드').set_index('키워드')
+    kws = pd.Index(keywords)
+    return indexed.loc[kws[kws.isin(indexed.index)]]
+
+def _keyword_features(features, kws):
+    """특성 테이블에서 kws 순서대로 행을 꺼냄 (중복 키워드는 첫 번째 행, 없는 키워드는 YouTube 데이터 없음)"""
+    rows = features[~features.index.duplicated()].reindex(kws)
+    for name in ('has_youtube', 'youtube_low_base'):
+        rows[name] = rows[name].fillna(False).astype(bool)
+    return rows
+
+def analyze_cross_signals(web_metrics, youtube_df, keywords, features=None):
+    """
+    웹 검색과 YouTube 검색 신호를 교차 분석하여
+    '학습 의도 신호 강도'를 판단합니다.
+    키워드 인덱스로 메트릭스를 찾고, 특성 테이블의 YouTube 성장률로 여섯 가지 신호 패턴을 키워드 전체에 대해 한 번에 계산합니다.
 
-        else:
-            signal_pattern = "혼합 신호"
-            signal_interpretation = "명확한 패턴 없음. 추가 관찰 필요."
-            signal_strength = "낮음"
+    목적: 정확한 예측이 아닌, 판단 보완을 위한 신호 교차 확인
 
-        results.append({
-            '키워드': kw,
-            '웹_성장률': round(web_growth, 1),
-            'YouTube_성장률': round(yt_growth, 1),
-            '웹_관심도': round(web_recent, 1),
-            '신호_패턴': signal_pattern,
-            '신호_해석': signal_interpretation,
-            '신호_강도': signal_strength,
-            '웹_변동성': web_volatility
-        })
+    Args:
+        features: build_features 결과 (없으면 youtube_df에서 YouTube 특성만 계산)
 
-    return pd.DataFrame(results)
+    Returns: DataFrame with cross-signal analysis
+    """
+    if youtube_df.empty:
+        youtube_df = get_mock_youtube_data(keywords)
+        features = None
+
+    rows = _keyword_metrics(web_metrics, keywords)
+    if rows.empty:
+        return pd.DataFrame()
+
+    kws = rows.index
+    web_growth = rows['성장률(%)'].to_numpy(dtype=float)
+    web_recent = rows['최근 관심도'].to_numpy(dtype=float)
+
+    # YouTube 성장률 (10일 이상 데이터가 있는 키워드)
+    youtube = _keyword_features(features if features is not None else youtube_features(youtube_df, kws), kws)
+    has_youtube = youtube['has_youtube'].to_numpy(dtype=bool)
+    yt_growth = youtube['youtube_growth'].to_numpy(dtype=float, copy=True)
+    # Mock 또는 데이터 없음: 웹 성장률 기반 추정치
+    n_missing = int((~has_youtube).sum())
+    yt_growth[~has_youtube] = web_growth[~has_youtube] * np.random.uniform(0.5, 1.5, size=n_missing)
+
+    # === 교차 신호 해석 (조건 순서가 우선순위) ===
+    pattern = np.select(
+        [
+            (np.abs(web_growth) < 15) & (yt_growth > 30),
+            (web_growth > 10) & (yt_growth > 10),
+            (web_growth > 15) & (yt_growth < 5),
+            (web_growth < -5) & (yt_growth > 10),
+            (web_growth < -5) & (yt_growth < -5),
+            (np.abs(web_growth) < 10) & (np.abs(yt_growth) < 10),
+        ],
+        range(len(_CROSS_SIGNAL_PATTERNS) - 1),
+        default=len(_CROSS_SIGNAL_PATTERNS) - 1,
+    )
+
+    return pd.DataFrame({
+        '키워드': list(kws),
+        '웹_성장률': [round(v, 1) for v in web_growth.tolist()],
+        'YouTube_성장률': [round(v, 1) for v in yt_growth.tolist()],
+        '웹_관심도': [round(v, 1) for v in web_recent.tolist()],
+        '신호_패턴': _labels(_CROSS_SIGNAL_PATTERNS, pattern, 0),
+        '신호_해석': _labels(_CROSS_SIGNAL_PATTERNS, pattern, 1),
+        '신호_강도': _labels(_CROSS_SIGNAL_PATTERNS, pattern, 2),
+        '웹_변동성': rows['변동성'].to_numpy(),
+    })
 
 
 # =============================================================================
@@ -524,6 +793,7 @@ def analyze_cross_signals(web_metrics, youtube_df, keywords):
 def apply_moving_average(df, window=7):
     """
     시계열 데이터에 이동 평균(Moving Average)을 적용합니다.
+    모든 키워드를 누적합 한 번으로 계산합니다 (smoothing.moving_average).
 
     Args:
         df: pandas DataFrame (날짜 인덱스, 키워드 컬럼)
@@ -532,51 +802,69 @@ def apply_moving_average(df, window=7):
     Returns:
         DataFrame: 이동 평균이 적용된 새로운 DataFrame
     """
-    if df.empty:
-        return df
-
-    # 모든 컬럼에 이동 평균 적용
-    ma_df = df.rolling(window=window, min_periods=1).mean()
-    return ma_df
+    return moving_average(df, window=window)
 
 
 def normalize_data(df, method='minmax'):
     """
     데이터를 정규화합니다 (Min-Max Scaling: 0-100 범위).
+    패널 전체를 한 번에 정규화합니다 (smoothing.normalize_panel).
 
     Args:
         df: pandas DataFrame (날짜 인덱스, 키워드 컬럼)
         method: 정규화 방법 ('minmax' 지원)
 
     Returns:
-        DataFrame: 정규화된 새로운 DataFrame
+        DataFrame: 정규화된 새로운 DataFrame (모든 값이 같은 키워드는 50)
     """
-    if df.empty:
-        return df
+    return normalize_panel(df, method=method)
 
-    normalized_df = pd.DataFrame(index=df.index)
 
-    for col in df.columns:
-        series = df[col]
-        if isinstance(series, pd.DataFrame):
-            series = series.iloc[:, 0]
+def correlation_vector(web_df, youtube_df, keywords=None):
+    """
+    웹·YouTube 패널을 한 번 정렬한 뒤 키워드별 Pearson 상관 계수를 NumPy 연산 한 번으로 계산합니다.
+    한쪽이라도 NaN인 날짜는 해당 키워드 계산에서 제외하고 (Series.corr와 동일),
+    분산이 0이거나 유효한 날짜가 부족한 시계열은 NaN입니다.
 
-        min_val = series.min()
-        max_val = series.max()
+    Args:
+        web_df: 웹 트렌드 DataFrame
+        youtube_df: YouTube 트렌드 DataFrame
+        keywords: 계산할 키워드 (기본값: 웹 데이터의 모든 컬럼)
 
-        # min == max인 경우 (모든 값이 동일)
-        if max_val == min_val:
-            normalized_df[col] = 50.0  # 중간값으로 설정
-        else:
-            # Min-Max Scaling: (x - min) / (max - min) * 100
-            normalized_df[col] = ((series - min_val) / (max_val - min_val)) * 100
+    Returns:
+        Series: 두 데이터에 모두 있는 키워드의 상관 계수 (키워드 인덱스, 반올림 전)
+    """
+    if keywords is None:
+        keywords = web_df.columns
+
+    # 중복 컬럼은 첫 번째 컬럼 사용
+    web_df = web_df.loc[:, ~web_df.columns.duplicated()]
+    youtube_df = youtube_df.loc[:, ~youtube_df.columns.duplicated()]
+    kws = pd.Index(keywords)
+    kws = kws[kws.isin(web_df.columns) & kws.isin(youtube_df.columns)].unique()
+
+    # 인덱스 정렬 (날짜 기준, 최소 5개 데이터 포인트 필요)
+    common_idx = web_df.index.intersection(youtube_df.index)
+    if len(common_idx) < 5 or len(kws) == 0:
+        return pd.Series(np.nan, index=kws, dtype=float)
+
+    web = web_df.loc[common_idx, kws].to_numpy(dtype=float)
+    youtube = youtube_df.loc[common_idx, kws].to_numpy(dtype=float)
+
+    valid = ~(np.isnan(web) | np.isnan(youtube))
+    n_valid = valid.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        web_dev = np.where(valid, web - np.where(valid, web, 0.0).sum(axis=0) / n_valid, 0.0)
+        yt_dev = np.where(valid, youtube - np.where(valid, youtube, 0.0).sum(axis=0) / n_valid, 0.0)
+        corr = (web_dev * yt_dev).sum(axis=0) / np.sqrt((web_dev ** 2).sum(axis=0) * (yt_dev ** 2).sum(axis=0))
 
-    return normalized_df
+    return pd.Series(np.clip(corr, -1.0, 1.0), index=kws)
 
 
 def calculate_correlation(web_df, youtube_df, keywords):
     """
     웹 검색과 YouTube 검색 간의 Pearson 상관 계수를 계산합니다.
+    모든 키워드를 correlation_vector로 한 번에 계산합니다.
 
     Args:
         web_df: 웹 트렌드 DataFrame
@@ -584,126 +872,276 @@ def calculate_correlation(web_df, youtube_df, keywords):
         keywords: 분석할 키워드 리스트
 
     Returns:
-        dict: 키워드별 상관 계수 {'키워드': correlation_value}
+        dict: 키워드별 상관 계수 {'키워드': correlation_value} (계산할 수 없으면 None)
     """
-    correlations = {}
-
     if web_df.empty or youtube_df.empty:
-        return correlations
-
-    for kw in keywords:
-        if kw in web_df.columns and kw in youtube_df.columns:
-            web_series = web_df[kw]
-            yt_series = youtube_df[kw]
-
-            # DataFrame인 경우 Series로 변환
-            if isinstance(web_series, pd.DataFrame):
-                web_series = web_series.iloc[:, 0]
-            if isinstance(yt_series, pd.DataFrame):
-                yt_series = yt_series.iloc[:, 0]
-
-            # 인덱스 정렬 (날짜 기준)
-            common_idx = web_series.index.intersection(yt_series.index)
-            if len(common_idx) < 5:  # 최소 5개 데이터 포인트 필요
-                correlations[kw] = None
-                continue
+        return {}
 
-            web_aligned = web_series.loc[common_idx]
-            yt_aligned = yt_series.loc[common_idx]
+    corr = correlation_vector(web_df, youtube_df, keywords)
+    return {kw: None if pd.isna(value) else round(value, 3) for kw, value in corr.items()}
 
-            # Pearson 상관 계수 계산
-            try:
-                corr = web_aligned.corr(yt_aligned)
-                correlations[kw] = round(corr, 3) if not pd.isna(corr) else None
-            except Exception:
-                correlations[kw] = None
 
-    return correlations
+def _index_step_days(index):
+    """날짜 인덱스의 간격(일). 일별 데이터면 1, 주별 데이터면 7"""
+    if len(index) < 2:
+        return 1
+    step = pd.Series(index).diff().median()
+    return max(int(round(step / pd.Timedelta(days=1))), 1)
 
 
-def get_trend_classification(df, keyword):
+def lagged_correlation(web_df, youtube_df, keywords=None, max_lag=MAX_LAG_DAYS, min_lag=None):
     """
-    트렌드를 분류합니다: 지속 성장 vs 일시적 급등
+    웹 ↔ YouTube 시차 상관(cross-correlation)을 모든 키워드 · 모든 시차에 대해 FFT로 한 번에 계산합니다.
+    시차 k의 값은 웹의 t일과 YouTube의 t+k일을 짝지은 Pearson 상관 계수이며 (k > 0: 웹이 k일 선행),
+    겹치는 구간의 합계를 FFT 상호상관으로 구하므로 키워드 수 · 시차 수와 관계없이 FFT 몇 번으로 끝납니다.
+    NaN 처리와 최소 데이터 수는 correlation_vector와 같습니다.
 
     Args:
-        df: 트렌드 DataFrame
-        keyword: 분석할 키워드
+        web_df: 웹 트렌드 DataFrame
+        youtube_df: YouTube 트렌드 DataFrame
+        keywords: 계산할 키워드 (기본값: 웹 데이터의 모든 컬럼)
+        max_lag: 최대 시차(일). 주별 데이터는 7일 단위로 내림
+        min_lag: 최소 시차(일) (기본값: -max_lag, YouTube가 선행하는 경우까지 확인)
 
     Returns:
-        dict: 분류 결과 (type, reason, confidence)
+        DataFrame: 시차(일) 인덱스, 키워드 컬럼의 상관 계수 (계산할 수 없으면 NaN)
     """
-    if df.empty or keyword not in df.columns:
-        return {'type': '판단 불가', 'reason': '데이터 부족', 'confidence': 0}
+    if min_lag is None:
+        min_lag = -max_lag
+    if min_lag > max_lag:
+        raise ValueError(f"min_lag ({min_lag}) must not exceed max_lag ({max_lag})")
+    if keywords is None:
+        keywords = web_df.columns
+
+    web_df = web_df.loc[:, ~web_df.columns.duplicated()]
+    youtube_df = youtube_df.loc[:, ~youtube_df.columns.duplicated()]
+    kws = pd.Index(keywords)
+    kws = kws[kws.isin(web_df.columns) & kws.isin(youtube_df.columns)].unique()
+
+    common_idx = web_df.index.intersection(youtube_df.index).sort_values()
+    n = len(common_idx)
+    step = _index_step_days(common_idx)
+    # 일 단위 시차를 행 단위로 변환 (겹치는 구간이 5개 이상인 시차만)
+    lags = np.arange(-(-min_lag // step), max_lag // step + 1)
+    lags = lags[np.abs(lags) <= n - 5]
+    result = pd.DataFrame(np.nan, index=pd.Index(lags * step, name='시차(일)'), columns=kws)
+    if len(lags) == 0 or len(kws) == 0:
+        return result
+
+    web = web_df.loc[common_idx, kws].to_numpy(dtype=float)
+    youtube = youtube_df.loc[common_idx, kws].to_numpy(dtype=float)
+    web_valid = ~np.isnan(web)
+    yt_valid = ~np.isnan(youtube)
+    # 열 평균을 빼서 합계의 자릿수 손실을 줄임 (NaN은 0 · 가중치 0)
+    with np.errstate(invalid='ignore'):
+        web = np.where(web_valid, web - np.nanmean(np.where(web_valid, web, np.nan), axis=0), 0.0)
+        youtube = np.where(yt_valid, youtube - np.nanmean(np.where(yt_valid, youtube, np.nan), axis=0), 0.0)
+    web_valid = web_valid.astype(float)
+    yt_valid = yt_valid.astype(float)
+
+    # S(k) = Σ_t a[t] · b[t+k] 를 rfft 한 번씩으로 계산 (원형 겹침이 없도록 0으로 채운 길이)
+    n_fft = 1 << int(np.ceil(np.log2(n + np.abs(lags).max())))
+    spectra = {}
+
+    def spectrum(name, values):
+        if name not in spectra:
+            spectra[name] = np.fft.rfft(values, n=n_fft, axis=0)
+        return spectra[name]
+
+    def xcorr(a, b):
+        full = np.fft.irfft(np.conj(spectrum(a[0], a[1])) * spectrum(b[0], b[1]), n=n_fft, axis=0)
+        return full[lags % n_fft]
+
+    count = np.rint(xcorr(('wv', web_valid), ('yv', yt_valid)))
+    sum_w = xcorr(('w', web), ('yv', yt_valid))
+    sum_y = xcorr(('wv', web_valid), ('y', youtube))
+    sum_ww = xcorr(('ww', web ** 2), ('yv', yt_valid))
+    sum_yy = xcorr(('wv', web_valid), ('yy', youtube ** 2))
+    sum_wy = xcorr(('w', web), ('y', youtube))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sum_wy - sum_w * sum_y / count
+        var_w = sum_ww - sum_w ** 2 / count
+        var_y = sum_yy - sum_y ** 2 / count
+        corr = cov / np.sqrt(var_w * var_y)
+
+    # 분산이 0인 구간은 FFT 반올림 오차만 남으므로 전체 제곱합 대비 상대 크기로 판단
+    tol = 1e-9
+    flat = (var_w <= tol * np.maximum((web ** 2).sum(axis=0), 1.0)) | \
+           (var_y <= tol * np.maximum((youtube ** 2).sum(axis=0), 1.0))
+    corr[(count < 5) | flat] = np.nan
+    result.iloc[:, :] = np.clip(corr, -1.0, 1.0)
+    return result
+
+
+def calculate_lead_lag(web_df, youtube_df, keywords, max_lag=MAX_LAG_DAYS, min_lag=None):
+    """
+    키워드별로 웹 ↔ YouTube 상관이 가장 높은 시차를 찾습니다 (lagged_correlation 결과의 열별 최댓값).
 
-    series = df[keyword]
-    if isinstance(series, pd.DataFrame):
-        series = series.iloc[:, 0]
+    Args:
+        web_df: 웹 트렌드 DataFrame
+        youtube_df: YouTube 트렌드 DataFrame
+        keywords: 분석할 키워드 리스트
+        max_lag: 최대 시차(일)
+        min_lag: 최소 시차(일) (기본값: -max_lag)
 
-    n = len(series)
-    if n < 14:
-        return {'type': '판단 불가', 'reason': '데이터 부족', 'confidence': 0}
+    Returns:
+        dict: {'키워드': {'lag': 시차(일, 양수면 웹이 선행), 'correlation': 그 시차의 상관 계수}}
+              (계산할 수 없으면 None)
+    """
+    if web_df.empty or youtube_df.empty:
+        return {}
+
+    matrix = lagged_correlation(web_df, youtube_df, keywords, max_lag=max_lag, min_lag=min_lag)
+    if matrix.empty:
+        return {kw: None for kw in matrix.columns}
+
+    # 열별 최댓값 위치 (같은 값이면 더 작은 시차)
+    values = matrix.to_numpy()
+    best = np.argmax(np.where(np.isnan(values), -np.inf, values), axis=0)
+    best_corr = values[best, np.arange(values.shape[1])]
+    best_lag = matrix.index.to_numpy()[best]
+    return {
+        kw: None if np.isnan(corr) else {'lag': int(lag), 'correlation': round(float(corr), 3)}
+        for kw, lag, corr in zip(matrix.columns, best_lag, best_corr)
+    }
 
-    # 이동 평균으로 노이즈 제거
-    ma_series = series.rolling(window=7, min_periods=1).mean()
 
-    # 변동 계수 (CV)
-    mean_val = ma_series.mean()
-    std_val = ma_series.std()
-    cv = std_val / mean_val if mean_val > 0 else 0
+# 트렌드 분류 (조건 순서가 우선순위, 마지막은 데이터 부족)
+_TREND_CLASSES = [
+    ('일시적 급등', '높은 변동성과 스파이크 패턴 감지'),
+    ('급등 후 하락', '최근 피크 후 하락 추세'),
+    ('지속 성장', '안정적인 상승 추세 유지'),
+    ('완만한 성장', '낮은 변동성의 완만한 상승'),
+    ('안정적 유지', '큰 변동 없이 관심도 유지'),
+    ('혼합 패턴', '명확한 추세 없음'),
+    ('판단 불가', '데이터 부족'),
+]
+_TREND_UNKNOWN = len(_TREND_CLASSES) - 1
 
-    # 최대값과 평균 비율
-    max_val = ma_series.max()
-    max_ratio = max_val / mean_val if mean_val > 0 else 1
+def classify_trends(df, keywords=None, features=None):
+    """
+    트렌드를 분류합니다: 지속 성장 vs 일시적 급등 (get_trend_classification의 패널 버전).
+    특성 테이블의 7일 이동평균 통계량(변동 계수 · 최대값/평균 비율 · 최근 4주 기울기 · 피크 위치)을
+    조건 마스크로 모든 키워드에 대해 한 번에 분류합니다.
 
-    # 최근 트렌드 기울기 (선형 회귀 단순 근사)
-    recent_n = min(28, n)  # 최근 4주
-    recent_series = ma_series.iloc[-recent_n:]
-    x = range(len(recent_series))
-    slope = ((recent_series.iloc[-1] - recent_series.iloc[0]) / len(recent_series)) if len(recent_series) > 1 else 0
+    Args:
+        df: 트렌드 DataFrame
+        keywords: 분류할 키워드 (기본값: df의 모든 컬럼, df에 없는 키워드는 '판단 불가')
+        features: 같은 df로 만든 특성 테이블 (없으면 분류할 키워드만 새로 계산)
 
-    # 스파이크 검출: 최근 급등 후 하락 패턴
-    peak_idx = ma_series.idxmax()
-    peak_position = list(ma_series.index).index(peak_idx) if peak_idx in ma_series.index else 0
-    is_recent_peak = peak_position > n * 0.7  # 최근 30% 구간에서 피크
+    Returns:
+        dict: 키워드별 분류 결과 {'키워드': {'type', 'reason', 'confidence'}}
+    """
+    kws = pd.Index(df.columns if keywords is None else keywords)
+    if features is None:
+        present = kws[kws.isin(df.columns)].unique()
+        features = build_features(df.loc[:, ~df.columns.duplicated()][present])
+    # 중복 컬럼은 첫 번째 컬럼 사용
+    rows = features[~features.index.duplicated()]
+
+    cv = rows['ma_cv'].to_numpy()
+    max_ratio = rows['ma_max_ratio'].to_numpy()
+    slope = rows['ma_slope'].to_numpy()
+    # 스파이크 검출: 피크가 최근 30% 구간에 있는지
+    is_recent_peak = rows['ma_peak_position'].to_numpy() > len(df) * 0.7
 
     # 분류 로직
-    if cv > 0.5 and max_ratio > 2.0:
-        return {
-            'type': '일시적 급등',
-            'reason': '높은 변동성과 스파이크 패턴 감지',
-            'confidence': min(90, int(cv * 100))
-        }
-    elif is_recent_peak and slope < 0:
-        return {
-            'type': '급등 후 하락',
-            'reason': '최근 피크 후 하락 추세',
-            'confidence': 70
-        }
-    elif slope > 0.3 and cv < 0.4:
-        return {
-            'type': '지속 성장',
-            'reason': '안정적인 상승 추세 유지',
-            'confidence': min(85, int((1 - cv) * 100))
-        }
-    elif slope > 0 and cv < 0.3:
-        return {
-            'type': '완만한 성장',
-            'reason': '낮은 변동성의 완만한 상승',
-            'confidence': 75
-        }
-    elif abs(slope) < 0.1 and cv < 0.3:
-        return {
-            'type': '안정적 유지',
-            'reason': '큰 변동 없이 관심도 유지',
-            'confidence': 80
-        }
-    else:
-        return {
-            'type': '혼합 패턴',
-            'reason': '명확한 추세 없음',
-            'confidence': 50
-        }
+    code = np.select(
+        [
+            (cv > 0.5) & (max_ratio > 2.0),
+            is_recent_peak & (slope < 0),
+            (slope > 0.3) & (cv < 0.4),
+            (slope > 0) & (cv < 0.3),
+            (np.abs(slope) < 0.1) & (cv < 0.3),
+        ],
+        range(_TREND_UNKNOWN - 1),
+        default=_TREND_UNKNOWN - 1,
+    )
+    with np.errstate(invalid='ignore'):
+        conf = np.select(
+            [code == 0, code == 1, code == 2, code == 3, code == 4],
+            [np.minimum(90, np.trunc(cv * 100)), 70, np.minimum(85, np.trunc((1 - cv) * 100)), 75, 80],
+            default=50,
+        )
+    # 14일 미만이거나 값이 하나도 없는 키워드는 데이터 부족
+    no_data = rows['ma_count'].to_numpy() == 0
+    codes = np.where(no_data, _TREND_UNKNOWN, code)
+    confidence = np.where(no_data, 0, conf).astype(int)
+
+    # df에 없는 키워드(위치 -1)는 마지막에 덧붙인 '판단 불가' 항목을 가리킴
+    positions = rows.index.get_indexer(kws)
+    codes = np.append(codes, _TREND_UNKNOWN)[positions].tolist()
+    confidence = np.append(confidence, 0)[positions].tolist()
+    result = {}
+    for kw, code, conf in zip(kws, codes, confidence):
+        trend_type, reason = _TREND_CLASSES[code]
+        result[kw] = {'type': trend_type, 'reason': reason, 'confidence': conf}
+    return result
+
 
+def get_trend_classification(df, keyword):
+    """
+    트렌드를 분류합니다: 지속 성장 vs 일시적 급등
+    여러 키워드를 분류할 때는 classify_trends로 한 번에 계산하세요.
+
+    Args:
+        df: 트렌드 DataFrame
+        keyword: 분석할 키워드
+
+    Returns:
+        dict: 분류 결과 (type, reason, confidence)
+    """
+    return classify_trends(df, [keyword])[keyword]
+
+
+# 시장 단계 (우선순위 순서)
+_MARKET_STAGES = [
+    {
+        'stage': '🌱 도입기',
+        'description': '새롭게 떠오르는 키워드. 초기 진입 기회.',
+        'recommendation': '선점 기회가 있으나 수요 검증 필요'
+    },
+    {
+        'stage': '📈 성장기',
+        'description': '빠르게 성장 중인 키워드. 적극적 기획 검토.',
+        'recommendation': '차별화된 콘텐츠로 시장 진입 적극 권장'
+    },
+    {
+        'stage': '🏔️ 성숙기',
+        'description': '안정적 수요가 있는 키워드. 경쟁 심화.',
+        'recommendation': '기존 콘텐츠 리뉴얼 또는 니치 타겟팅'
+    },
+    {
+        'stage': '📉 쇠퇴기',
+        'description': '관심도 하락 중인 키워드.',
+        'recommendation': '신규 진입 비권장. 기존 콘텐츠 유지만 권장'
+    },
+    {
+        'stage': '🔄 전환기',
+        'description': '트렌드 방향이 불명확한 시기.',
+        'recommendation': '추가 관찰 후 판단 권장'
+    },
+]
+
+def _market_stage_codes(web_growth, youtube_growth, web_recent):
+    """get_market_stage의 배열 버전. 키워드별 _MARKET_STAGES 인덱스 배열을 반환"""
+    web_growth = np.asarray(web_growth, dtype=float)
+    youtube_growth = np.asarray(youtube_growth, dtype=float)
+    web_recent = np.asarray(web_recent, dtype=float)
+
+    # 성장률 기준
+    avg_growth = (web_growth + youtube_growth) / 2
+    return np.select(
+        [
+            (avg_growth > 50) & (web_recent < 30),
+            (avg_growth > 20) & (web_recent >= 30),
+            (np.abs(avg_growth) < 15) & (web_recent >= 50),
+            avg_growth < -10,
+        ],
+        range(len(_MARKET_STAGES) - 1),
+        default=len(_MARKET_STAGES) - 1,
+    )
 
 def get_market_stage(web_growth, youtube_growth, web_recent, correlation):
     """
@@ -713,58 +1151,30 @@ def get_market_stage(web_growth, youtube_growth, web_recent, correlation):
         web_growth: 웹 검색 성장률
         youtube_growth: YouTube 검색 성장률
         web_recent: 최근 웹 관심도
-        correlation: 웹-YouTube 상관 계수
+        correlation: 웹-YouTube 상관 계수 (현재 단계 판단에는 사용하지 않음)
 
     Returns:
         dict: 시장 단계 정보 (stage, description, recommendation)
     """
-    # 상관 계수가 None인 경우 처리
-    corr_val = correlation if correlation is not None else 0
+    code = _market_stage_codes([web_growth], [youtube_growth], [web_recent])[0]
+    return dict(_MARKET_STAGES[code])
 
-    # 성장률 기준
-    avg_growth = (web_growth + youtube_growth) / 2
 
-    if avg_growth > 50 and web_recent < 30:
-        return {
-            'stage': '🌱 도입기',
-            'description': '새롭게 떠오르는 키워드. 초기 진입 기회.',
-            'recommendation': '선점 기회가 있으나 수요 검증 필요'
-        }
-    elif avg_growth > 20 and web_recent >= 30:
-        return {
-            'stage': '📈 성장기',
-            'description': '빠르게 성장 중인 키워드. 적극적 기획 검토.',
-            'recommendation': '차별화된 콘텐츠로 시장 진입 적극 권장'
-        }
-    elif abs(avg_growth) < 15 and web_recent >= 50:
-        return {
-            'stage': '🏔️ 성숙기',
-            'description': '안정적 수요가 있는 키워드. 경쟁 심화.',
-            'recommendation': '기존 콘텐츠 리뉴얼 또는 니치 타겟팅'
-        }
-    elif avg_growth < -10:
-        return {
-            'stage': '📉 쇠퇴기',
-            'description': '관심도 하락 중인 키워드.',
-            'recommendation': '신규 진입 비권장. 기존 콘텐츠 유지만 권장'
-        }
-    else:
-        return {
-            'stage': '🔄 전환기',
-            'description': '트렌드 방향이 불명확한 시기.',
-            'recommendation': '추가 관찰 후 판단 권장'
-        }
-
-
-def generate_strategic_insights(web_df, youtube_df, web_metrics, keywords):
+def generate_strategic_insights(web_df, youtube_df, web_metrics, keywords, correlations=None, lead_lags=None,
+                                features=None):
     """
     전략적 인사이트 리포트를 생성합니다.
+    키워드 인덱스로 메트릭스를 찾고, 특성 테이블의 YouTube 성장률 · 트렌드 통계량으로
+    시장 단계 · 트렌드 분류를 키워드 전체에 대해 한 번에 계산합니다.
 
     Args:
         web_df: 웹 트렌드 DataFrame
         youtube_df: YouTube 트렌드 DataFrame
         web_metrics: 웹 메트릭스 DataFrame
         keywords: 키워드 리스트
+        correlations: 미리 계산한 calculate_correlation 결과 (없으면 새로 계산)
+        lead_lags: 미리 계산한 calculate_lead_lag 결과 (없으면 새로 계산)
+        features: 같은 web_df · youtube_df로 만든 build_features 결과 (없으면 새로 계산)
 
     Returns:
         dict: 전략적 인사이트 데이터
@@ -774,46 +1184,46 @@ def generate_strategic_insights(web_df, youtube_df, web_metrics, keywords):
         'market_stages': {},
         'trend_classifications': {},
         'correlations': {},
+        'lead_lags': {},
         'summary': {}
     }
 
     # 상관 계수 계산
-    correlations = calculate_correlation(web_df, youtube_df, keywords)
+    if correlations is None:
+        correlations = calculate_correlation(web_df, youtube_df, keywords)
     insights['correlations'] = correlations
 
-    # 키워드별 분석
-    for kw in keywords:
-        # 메트릭스 가져오기
-        row = web_metrics[web_metrics['키워드'] == kw]
-        if row.empty:
-            continue
+    # 선행 시차 (웹 관심이 YouTube 관심보다 며칠 앞서는지)
+    if lead_lags is None:
+        lead_lags = calculate_lead_lag(web_df, youtube_df, keywords)
+    insights['lead_lags'] = lead_lags
 
-        web_growth = row.iloc[0]['성장률(%)']
-        web_recent = row.iloc[0]['최근 관심도']
-
-        # YouTube 성장률 계산
-        if kw in youtube_df.columns and len(youtube_df) >= 10:
-            yt_series = youtube_df[kw]
-            if isinstance(yt_series, pd.DataFrame):
-                yt_series = yt_series.iloc[:, 0]
-            n_rows = len(yt_series)
-            split_idx = int(n_rows * 0.3)
-            yt_early = float(yt_series.iloc[:split_idx].mean())
-            yt_recent = float(yt_series.iloc[-split_idx:].mean())
-            if pd.isna(yt_early) or yt_early < 1.0:
-                youtube_growth = 0.0
-            else:
-                youtube_growth = ((yt_recent - yt_early) / yt_early) * 100
-        else:
-            youtube_growth = web_growth
+    if features is None:
+        features = build_features(web_df, youtube_df)
+
+    # 메트릭스 가져오기 (키워드 인덱스)
+    rows = _keyword_metrics(web_metrics, keywords)
+    kws = rows.index
+    web_growth = rows['성장률(%)'].to_numpy(dtype=float)
+    web_recent = rows['최근 관심도'].to_numpy(dtype=float)
+
+    # YouTube 성장률 (Low base effect는 0, 데이터가 없는 키워드는 웹 성장률로 대체)
+    youtube = _keyword_features(features, kws)
+    youtube_growth = np.where(youtube['youtube_low_base'].to_numpy(dtype=bool), 0.0,
+                              youtube['youtube_growth'].to_numpy(dtype=float))
+    youtube_growth = np.where(youtube['has_youtube'].to_numpy(dtype=bool), youtube_growth, web_growth)
+
+    # 시장 단계
+    stages = _market_stage_codes(web_growth, youtube_growth, web_recent)
+
+    # 트렌드 분류
+    trend_classes = classify_trends(web_df, kws, features=features)
 
-        # 트렌드 분류
-        trend_class = get_trend_classification(web_df, kw)
+    for kw, kw_web_growth, kw_youtube_growth, stage in zip(kws, web_growth, youtube_growth, stages):
+        trend_class = trend_classes[kw]
         insights['trend_classifications'][kw] = trend_class
 
-        # 시장 단계
-        corr = correlations.get(kw)
-        market_stage = get_market_stage(web_growth, youtube_growth, web_recent, corr)
+        market_stage = dict(_MARKET_STAGES[stage])
         insights['market_stages'][kw] = market_stage
 
         # 우선순위 키워드 선정 (성장기 + 지속 성장)
@@ -821,8 +1231,8 @@ def generate_strategic_insights(web_df, youtube_df, web_metrics, keywords):
             insights['priority_keywords'].append({
                 'keyword': kw,
                 'reason': f"{market_stage['stage']} + {trend_class['type']}",
-                'web_growth': web_growth,
-                'youtube_growth': youtube_growth,
+                'web_growth': kw_web_growth,
+                'youtube_growth': kw_youtube_growth,
                 'confidence': trend_class['confidence']
             })
 